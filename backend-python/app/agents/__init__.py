@@ -5,6 +5,7 @@ Provides specialized AI agents for simulation platform
 
 from app.agents.base_agent import BaseAgent
 from app.agents.agent_manager import agent_manager, AgentManager
+from app.agents.provider_router import provider_router, ProviderRouter
 from app.agents.simulation_client_agent import SimulationClientAgent
 from app.agents.profile_generation_agent import ProfileGenerationAgent
 from app.agents.evaluation_agent import EvaluationAgent
@@ -14,6 +15,8 @@ __all__ = [
     "BaseAgent",
     "AgentManager",
     "agent_manager",
+    "ProviderRouter",
+    "provider_router",
     "SimulationClientAgent",
     "ProfileGenerationAgent",
     "EvaluationAgent",
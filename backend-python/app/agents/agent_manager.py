@@ -3,10 +3,15 @@ Agent Manager
 Singleton manager for agent lifecycle and coordination
 """
 
+import asyncio
 import logging
-from typing import TYPE_CHECKING
+import time
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any
 
 from app.config import get_settings, is_azure_configured
+from app.database import DatabasePool
+from app.agents.provider_router import AZURE_AGENT, CIRCUIT_OPEN, provider_router
 
 if TYPE_CHECKING:
     from app.agents.base_agent import BaseAgent
@@ -17,6 +22,9 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# An agent that failed to initialize is retried on use, at most this often
+AGENT_INIT_RETRY_SECONDS = 30
+
 
 class AgentManager:
     """
@@ -37,8 +45,16 @@ class AgentManager:
             return
 
         self._agents: dict[str, "BaseAgent"] = {}
-        self._azure_available = False
         self._initialization_errors: dict[str, str] = {}
+        self._client: Any = None
+        self._credential: Any = None
+        self._remote_agents: dict[str, Any] = {}
+        self._init_tasks: dict[str, asyncio.Task] = {}
+        self._init_attempted_at: dict[str, float] = {}
+        self._sweep_task: asyncio.Task | None = None
+        self._release_tasks: set[asyncio.Task] = set()
+        self._threads_released = 0
+        self._threads_expired = 0
         self._initialized = True
         self.settings = get_settings()
 
@@ -49,21 +65,34 @@ class AgentManager:
 
     @property
     def is_azure_available(self) -> bool:
-        """Check if Azure AI agents are available."""
-        return self._azure_available
+        """
+        Check if Azure AI agents can be used.
+
+        True once the Azure AI client exists, even if no agent is initialized
+        yet: callers get the agent from ``get_agent``, which retries a failed
+        initialization, and fall back while ``agent.is_initialized`` is False.
+        """
+        return self._client is not None
 
     def get_agent(self, name: str) -> "BaseAgent | None":
         """
-        Get an initialized agent by name.
+        Get an agent by name.
+
+        An agent that isn't initialized yet, because startup stopped waiting
+        for it or it failed, starts initializing in the background and is
+        returned as is; callers fall back until it is ready.
 
         Args:
             name: Agent name (without prefix)
 
         Returns:
-            Agent instance or None if not found/initialized
+            Agent instance or None if not found
         """
         full_name = f"{self.settings.azure_ai_agent_name_prefix}{name}"
-        return self._agents.get(full_name)
+        agent = self._agents.get(full_name)
+        if agent and not agent.is_initialized:
+            self._initialize_lazily(agent)
+        return agent
 
     def get_simulation_client_agent(self) -> "SimulationClientAgent | None":
         """Get the simulation client agent."""
@@ -120,30 +149,37 @@ class AgentManager:
         for cls in agent_classes:
             logger.info(f"[AgentManager]   - {cls.__name__}")
 
-        results: dict[str, bool] = {}
-        successful = 0
-
         for agent_class in agent_classes:
             agent = agent_class()
-            logger.info(f"[AgentManager] Initializing {agent.name}...")
-            try:
-                success = await agent.initialize()
-                self._agents[agent.name] = agent
-                results[agent.name] = success
+            self._agents[agent.name] = agent
 
-                if success:
-                    successful += 1
-                    logger.info(f"[AgentManager] ✓ {agent.name} initialized (ID: {agent.agent_id})")
-                else:
-                    self._initialization_errors[agent.name] = "Initialization returned False"
-                    logger.warning(f"[AgentManager] ✗ {agent.name} failed to initialize")
+        # One client, credential and agent listing shared by every agent
+        from app.agents.base_agent import create_agents_client
 
-            except Exception as e:
-                results[agent.name] = False
-                self._initialization_errors[agent.name] = str(e)
-                logger.error(f"[AgentManager] ✗ Error initializing {agent.name}: {e}")
+        try:
+            self._client, self._credential = create_agents_client(self.settings)
+        except Exception as e:
+            logger.error(f"[AgentManager] Failed to create Azure AI client: {e}")
+            for name in self._agents:
+                self._initialization_errors[name] = str(e)
+            logger.info("=" * 60)
+            return {name: False for name in self._agents}
+
+        await self._list_remote_agents()
 
-        self._azure_available = successful > 0
+        # Initialize concurrently; startup only waits so long, the rest
+        # finish in the background
+        tasks = [self._start_initialization(agent) for agent in self._agents.values()]
+        timeout = self.settings.azure_ai_agent_init_timeout_seconds
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+        if pending:
+            logger.warning(
+                f"[AgentManager] {len(pending)} agents still initializing after {timeout}s, "
+                "continuing in the background"
+            )
+
+        results = {name: agent.is_initialized for name, agent in self._agents.items()}
+        successful = sum(results.values())
 
         logger.info("=" * 60)
         logger.info(f"[AgentManager] Initialization complete: {successful}/{len(agent_classes)} agents")
@@ -166,8 +202,159 @@ class AgentManager:
 
         return results
 
+    async def _list_remote_agents(self) -> None:
+        """List the remote agents once, stopping as soon as every local agent is found."""
+        wanted = set(self._agents)
+        self._remote_agents = {}
+        try:
+            async for remote in self._client.list_agents():
+                if remote.name in wanted:
+                    self._remote_agents[remote.name] = remote
+                    if len(self._remote_agents) == len(wanted):
+                        break
+        except Exception as e:
+            logger.warning(f"[AgentManager] Error listing agents, new ones will be created: {e}")
+        logger.info(f"[AgentManager] Found {len(self._remote_agents)}/{len(wanted)} existing agents")
+
+    def _start_initialization(self, agent: "BaseAgent") -> asyncio.Task:
+        """Start initializing an agent in the background, unless it already is."""
+        task = self._init_tasks.get(agent.name)
+        if task:
+            return task
+        self._init_attempted_at[agent.name] = time.monotonic()
+        task = asyncio.create_task(self._initialize_agent(agent))
+        self._init_tasks[agent.name] = task
+        task.add_done_callback(lambda _: self._init_tasks.pop(agent.name, None))
+        return task
+
+    def _initialize_lazily(self, agent: "BaseAgent") -> None:
+        """Retry initializing an agent on use, if the client exists and it isn't too soon."""
+        if not self._client or agent.name in self._init_tasks:
+            return
+        if time.monotonic() - self._init_attempted_at.get(agent.name, 0.0) < AGENT_INIT_RETRY_SECONDS:
+            return
+        try:
+            self._start_initialization(agent)
+        except RuntimeError:
+            # No running event loop
+            pass
+
+    async def _initialize_agent(self, agent: "BaseAgent") -> bool:
+        """Initialize one agent with the shared client and agent listing."""
+        logger.info(f"[AgentManager] Initializing {agent.name}...")
+        try:
+            success = await agent.initialize(self._client, self._remote_agents)
+        except Exception as e:
+            self._initialization_errors[agent.name] = str(e)
+            logger.error(f"[AgentManager] ✗ Error initializing {agent.name}: {e}")
+            return False
+
+        if not success:
+            self._initialization_errors[agent.name] = "Initialization returned False"
+            logger.warning(f"[AgentManager] ✗ {agent.name} failed to initialize")
+            return False
+
+        self._initialization_errors.pop(agent.name, None)
+        logger.info(f"[AgentManager] ✓ {agent.name} initialized (ID: {agent.agent_id})")
+        return True
+
+    async def release_session_threads(self, session_id: str) -> int:
+        """
+        Delete every agent's thread for a session, e.g. when its simulation ends.
+
+        Args:
+            session_id: Session (simulation) identifier
+
+        Returns:
+            Number of threads deleted from Azure
+        """
+        released = 0
+        for agent in list(self._agents.values()):
+            try:
+                if await agent.release_thread(session_id):
+                    released += 1
+            except Exception as e:
+                logger.warning(f"[AgentManager] Error releasing {agent.name} thread for {session_id}: {e}")
+
+        self._threads_released += released
+        if released:
+            logger.info(f"[AgentManager] Released {released} threads for session {session_id}")
+        return released
+
+    def release_session_threads_later(self, session_id: str) -> None:
+        """Release a session's threads in the background, without delaying the caller."""
+        task = asyncio.create_task(self.release_session_threads(session_id))
+        self._release_tasks.add(task)
+        task.add_done_callback(self._release_tasks.discard)
+
+    def start_thread_sweeper(self) -> None:
+        """Start deleting threads of sessions idle for ``agent_thread_ttl_seconds``."""
+        if self._sweep_task:
+            return
+        self._sweep_task = asyncio.create_task(self._sweep_loop())
+        logger.info("[AgentManager] Thread sweeper started")
+
+    async def stop_thread_sweeper(self) -> None:
+        """Stop the thread sweeper and wait for pending thread releases."""
+        if self._sweep_task:
+            self._sweep_task.cancel()
+            try:
+                await self._sweep_task
+            except asyncio.CancelledError:
+                pass
+            self._sweep_task = None
+
+        if self._release_tasks:
+            await asyncio.gather(*self._release_tasks, return_exceptions=True)
+
+    async def sweep_expired_threads(self) -> int:
+        """
+        Delete threads not used within ``agent_thread_ttl_seconds``.
+
+        Rows are removed from the registry table first, so when several
+        workers sweep at once each thread is deleted by only one of them.
+
+        Returns:
+            Number of threads deleted from Azure
+        """
+        if not DatabasePool.is_initialized():
+            return 0
+
+        from app.repositories.agent_thread_repository import agent_thread_repository
+
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.settings.agent_thread_ttl_seconds)
+        expired = await agent_thread_repository.delete_unused_since(cutoff)
+
+        deleted = 0
+        for session_id, agent_name, thread_id in expired:
+            agent = self._agents.get(agent_name)
+            if not agent:
+                continue
+            agent.forget_thread(session_id)
+            if await agent.delete_remote_thread(thread_id):
+                deleted += 1
+
+        self._threads_expired += deleted
+        if expired:
+            logger.info(f"[AgentManager] Swept {len(expired)} expired threads ({deleted} deleted)")
+        return deleted
+
+    async def _sweep_loop(self) -> None:
+        """Sweep expired threads every ``agent_thread_sweep_interval_seconds``."""
+        while True:
+            await asyncio.sleep(self.settings.agent_thread_sweep_interval_seconds)
+            try:
+                await self.sweep_expired_threads()
+            except Exception as e:
+                logger.error(f"[AgentManager] Thread sweep failed: {e}")
+
     async def cleanup_all(self) -> None:
         """Clean up all agents."""
+        for task in list(self._init_tasks.values()):
+            task.cancel()
+        if self._init_tasks:
+            await asyncio.gather(*self._init_tasks.values(), return_exceptions=True)
+
         for name, agent in list(self._agents.items()):
             try:
                 await agent.cleanup()
@@ -176,8 +363,20 @@ class AgentManager:
                 logger.error(f"[AgentManager] Error cleaning up {name}: {e}")
 
         self._agents.clear()
-        self._azure_available = False
         self._initialization_errors.clear()
+        self._remote_agents = {}
+        self._init_attempted_at.clear()
+
+        # Close the shared client and credential
+        try:
+            if self._client and hasattr(self._client, "close"):
+                await self._client.close()
+            if self._credential:
+                await self._credential.close()
+        except Exception as e:
+            logger.error(f"[AgentManager] Error closing Azure AI client: {e}")
+        self._client = None
+        self._credential = None
 
     def get_status(self) -> dict:
         """
@@ -188,14 +387,23 @@ class AgentManager:
         """
         return {
             "azure_configured": self.is_azure_configured,
-            "azure_available": self._azure_available,
+            "azure_available": self.is_azure_available,
             "agents": {
                 name: {
                     "initialized": agent.is_initialized,
+                    "initializing": name in self._init_tasks,
                     "agent_id": agent.agent_id,
+                    "threads": agent.get_thread_stats(),
+                    "pool": agent.get_pool_stats(),
+                    "tools": agent.get_tool_stats(),
                 }
                 for name, agent in self._agents.items()
             },
+            "threads": {
+                "sweeper_running": bool(self._sweep_task and not self._sweep_task.done()),
+                "released": self._threads_released,
+                "expired": self._threads_expired,
+            },
             "errors": self._initialization_errors,
         }
 
@@ -215,6 +423,8 @@ class AgentManager:
             status = "unavailable"
         elif initialized_count < agent_count:
             status = "degraded"
+        elif provider_router.get_circuit_states().get(AZURE_AGENT) == CIRCUIT_OPEN:
+            status = "degraded"
         else:
             status = "healthy"
 
@@ -224,6 +434,8 @@ class AgentManager:
             "agents_total": agent_count,
             "agents_initialized": initialized_count,
             "fallback_available": bool(self.settings.openai_api_key),
+            "circuits": provider_router.get_circuit_states(),
+            "providers": provider_router.get_stats(),
         }
 
 
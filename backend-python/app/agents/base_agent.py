@@ -3,15 +3,21 @@ Base Agent Class
 Abstract base class for all Azure AI Agents
 """
 
+import asyncio
 import json
 import logging
+import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass
 from typing import Any, AsyncIterator
 
 from azure.ai.agents.aio import AgentsClient
 from azure.ai.agents.models import (
     Agent,
-    AgentThread,
+    AgentStreamEvent,
+    MessageDeltaChunk,
     ThreadMessage,
     ThreadRun,
     MessageRole,
@@ -19,16 +25,90 @@ from azure.ai.agents.models import (
     FunctionTool,
     FunctionToolDefinition,
     FunctionDefinition,
+    ListSortOrder,
     ToolDefinition,
+    TruncationObject,
     RequiredFunctionToolCall,
     SubmitToolOutputsAction,
 )
 from azure.identity.aio import DefaultAzureCredential
 
-from app.config import get_settings
+from app.config import Settings, get_settings
+from app.agents.provider_router import AZURE_AGENT
+from app.agents.run_pool import AgentRunPool
+from app.agents.thread_registry import ThreadRegistry
+from app.utils.agent_run_timings import (
+    IN_PROGRESS,
+    MESSAGE_CREATE,
+    MESSAGE_FETCH,
+    QUEUED,
+    RUN_CREATE,
+    SLOT_WAIT,
+    TOOL_CALLS,
+    RunTimeline,
+    agent_run_timings,
+)
+from app.utils.llm_metrics import LLMCallRecord, llm_metrics
+from app.utils.llm_scheduler import llm_scheduler
+from app.utils.tokens import count_tokens
 
 logger = logging.getLogger(__name__)
 
+# Growth of the delay between polls of a run that isn't streamed
+RUN_POLL_BACKOFF = 1.5
+
+# Final replies kept per agent, by run ID
+RUN_REPLY_CACHE_SIZE = 256
+
+# Timeline phase of each run status
+RUN_STATUS_PHASES = {
+    RunStatus.QUEUED: QUEUED,
+    RunStatus.IN_PROGRESS: IN_PROGRESS,
+    RunStatus.REQUIRES_ACTION: TOOL_CALLS,
+}
+
+# Tool context of the run whose tool calls are being handled. Agents are shared
+# by every request, so this is set per run rather than stored on the instance.
+_tool_context: ContextVar[dict[str, Any] | None] = ContextVar("agent_tool_context", default=None)
+
+
+@dataclass
+class ToolCallStats:
+    """Latency and failures of one tool's calls."""
+    calls: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "avg_ms": round(self.total_ms / self.calls, 1) if self.calls else 0.0,
+            "max_ms": round(self.max_ms, 1),
+        }
+
+
+def create_agents_client(settings: Settings) -> tuple[AgentsClient, DefaultAzureCredential | None]:
+    """
+    Create an Azure AI agents client, or the fake one when load testing.
+
+    Returns:
+        The client and the credential it uses, if any; both must be closed by the caller
+    """
+    if settings.fake_agents_enabled:
+        # Load testing: answer from memory instead of Azure
+        from app.agents.fake_agents_client import FakeAgentsClient
+
+        logger.warning("[AGENTS] Using the fake agents client")
+        return FakeAgentsClient(), None
+
+    credential = DefaultAzureCredential()
+    client = AgentsClient(endpoint=settings.azure_ai_project_endpoint, credential=credential)
+    return client, credential
+
 
 class BaseAgent(ABC):
     """
@@ -53,10 +133,19 @@ class BaseAgent(ABC):
 
         self._client: AgentsClient | None = None
         self._credential: DefaultAzureCredential | None = None
+        self._owns_client = False
         self._agent: Agent | None = None
-        self._threads: dict[str, AgentThread] = {}
+        self._threads = ThreadRegistry(self.name)
+        self._run_pool = AgentRunPool(self.settings.azure_ai_agent_pool_size)
+        self._run_replies: OrderedDict[str, str] = OrderedDict()
+        self._tool_stats: dict[str, ToolCallStats] = {}
         self._initialized = False
 
+    @property
+    def _scheduler_model(self) -> str:
+        """Rate limit key for this agent's model deployment in the LLM scheduler."""
+        return f"azure-agent:{self.model}"
+
     @property
     def agent_id(self) -> str | None:
         """Get the agent ID if initialized."""
@@ -67,6 +156,11 @@ class BaseAgent(ABC):
         """Check if agent is initialized."""
         return self._initialized and self._agent is not None
 
+    @property
+    def tool_context(self) -> dict[str, Any]:
+        """Context passed to ``send_message`` for the run whose tool call is being handled."""
+        return _tool_context.get() or {}
+
     @abstractmethod
     def get_tools(self) -> list[ToolDefinition]:
         """
@@ -79,7 +173,8 @@ class BaseAgent(ABC):
     async def handle_tool_call(self, tool_name: str, arguments: dict[str, Any]) -> str:
         """
         Handle a tool call from the agent.
-        Must be implemented by subclasses.
+        Must be implemented by subclasses. The run's context is available
+        as ``self.tool_context``.
 
         Args:
             tool_name: Name of the tool being called
@@ -90,43 +185,50 @@ class BaseAgent(ABC):
         """
         pass
 
-    async def initialize(self) -> bool:
+    async def initialize(
+        self,
+        client: AgentsClient | None = None,
+        existing_agents: dict[str, Agent] | None = None,
+    ) -> bool:
         """
         Initialize the agent with Azure AI.
         First searches for existing agent by name, creates new one if not found.
 
+        Args:
+            client: Shared client to use; one is created for this agent if omitted
+            existing_agents: Remote agents by name, already listed by the caller;
+                the agent lists them itself if omitted
+
         Returns:
             True if initialization was successful
         """
         try:
-            if not self.settings.azure_ai_project_endpoint:
-                logger.warning(f"[{self.name}] Azure AI endpoint not configured")
-                return False
-
             logger.info(f"[{self.name}] Initializing agent...")
-            logger.info(f"[{self.name}] Using Azure AI endpoint: {self.settings.azure_ai_project_endpoint[:50]}...")
 
-            # Create credential and client
-            self._credential = DefaultAzureCredential()
-            self._client = AgentsClient(
-                endpoint=self.settings.azure_ai_project_endpoint,
-                credential=self._credential,
-            )
-            logger.info(f"[{self.name}] Azure client created successfully")
+            if client:
+                self._client = client
+            else:
+                if not self.settings.azure_ai_project_endpoint and not self.settings.fake_agents_enabled:
+                    logger.warning(f"[{self.name}] Azure AI endpoint not configured")
+                    return False
+
+                self._client, self._credential = create_agents_client(self.settings)
+                self._owns_client = True
+                logger.info(f"[{self.name}] Azure client created successfully")
 
             # Search for existing agent by name
-            logger.info(f"[{self.name}] Searching for existing agent with name: {self.name}")
             existing_agent = None
-
-            try:
-                agents_list = self._client.list_agents()
-                async for agent in agents_list:
-                    if agent.name == self.name:
-                        existing_agent = agent
-                        logger.info(f"[{self.name}] Found existing agent: {agent.id}")
-                        break
-            except Exception as list_error:
-                logger.warning(f"[{self.name}] Error listing agents: {list_error}")
+            if existing_agents is not None:
+                existing_agent = existing_agents.get(self.name)
+            else:
+                logger.info(f"[{self.name}] Searching for existing agent with name: {self.name}")
+                try:
+                    async for agent in self._client.list_agents():
+                        if agent.name == self.name:
+                            existing_agent = agent
+                            break
+                except Exception as list_error:
+                    logger.warning(f"[{self.name}] Error listing agents: {list_error}")
 
             if existing_agent:
                 # Reuse existing agent
@@ -174,11 +276,15 @@ class BaseAgent(ABC):
 
         thread = await self._client.threads.create()
         thread_id = thread.id
+        logger.debug(f"[{self.name}] Created thread: {thread_id}")
 
         if session_id:
-            self._threads[session_id] = thread
+            registered = await self._threads.put(session_id, thread_id)
+            if registered != thread_id:
+                # Another request or worker created the session's thread first
+                await self.delete_remote_thread(thread_id)
+                thread_id = registered
 
-        logger.debug(f"[{self.name}] Created thread: {thread_id}")
         return thread_id
 
     async def get_or_create_thread(self, session_id: str) -> str:
@@ -191,15 +297,85 @@ class BaseAgent(ABC):
         Returns:
             Thread ID
         """
-        if session_id in self._threads:
-            return self._threads[session_id].id
+        thread_id = await self._threads.get(session_id)
+        if thread_id:
+            return thread_id
         return await self.create_thread(session_id)
 
+    async def send_message_on_new_thread(self, content: str, context: dict[str, Any] | None = None) -> str:
+        """
+        Send a one-off message on a thread of its own, deleted afterwards.
+
+        Args:
+            content: Message content
+            context: Optional context data for tool calls
+
+        Returns:
+            Agent response text
+        """
+        thread_id = await self.create_thread()
+        try:
+            return await self.send_message(thread_id, content, context)
+        finally:
+            await asyncio.shield(self.delete_remote_thread(thread_id))
+
+    async def release_thread(self, session_id: str) -> bool:
+        """
+        Unregister a session's thread and delete it from Azure.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            True if the session had a thread and it was deleted
+        """
+        thread_id = await self._threads.remove(session_id)
+        if not thread_id:
+            return False
+        return await self.delete_remote_thread(thread_id)
+
+    def forget_thread(self, session_id: str) -> None:
+        """Drop a session's thread from memory after it was unregistered elsewhere."""
+        self._threads.forget(session_id)
+
+    def get_thread_stats(self) -> dict[str, Any]:
+        """Get thread registry statistics."""
+        return self._threads.get_stats()
+
+    def get_pool_stats(self) -> dict[str, Any]:
+        """Get run pool depth, queue length and wait times."""
+        return self._run_pool.get_stats()
+
+    def get_tool_stats(self) -> dict[str, Any]:
+        """Get call counts, failures and latency per tool."""
+        return {name: stats.to_dict() for name, stats in self._tool_stats.items()}
+
+    async def delete_remote_thread(self, thread_id: str) -> bool:
+        """
+        Delete a thread from Azure.
+
+        Args:
+            thread_id: Thread ID
+
+        Returns:
+            True if the thread was deleted
+        """
+        if not self._client:
+            return False
+        try:
+            await self._client.threads.delete(thread_id)
+            logger.debug(f"[{self.name}] Deleted thread: {thread_id}")
+            return True
+        except Exception as e:
+            logger.warning(f"[{self.name}] Failed to delete thread {thread_id}: {e}")
+            return False
+
     async def send_message(
         self,
         thread_id: str,
         content: str,
         context: dict[str, Any] | None = None,
+        truncation_strategy: TruncationObject | None = None,
     ) -> str:
         """
         Send a message to the agent and get a response.
@@ -208,6 +384,7 @@ class BaseAgent(ABC):
             thread_id: Thread ID to send message to
             content: Message content
             context: Optional context data for tool calls
+            truncation_strategy: Optional limit on the thread history the run reads
 
         Returns:
             Agent response text
@@ -215,34 +392,92 @@ class BaseAgent(ABC):
         if not self._client or not self._agent:
             raise RuntimeError(f"[{self.name}] Agent not initialized")
 
-        # Store context for tool calls
-        self._current_context = context or {}
+        with agent_run_timings.track(self.name) as timeline:
+            # Wait for the thread's previous run and the LLM scheduler before
+            # touching the thread, so a shed request doesn't leave an unanswered
+            # message behind
+            timeline.mark(SLOT_WAIT)
+            async with (
+                self._run_pool.run(thread_id),
+                llm_scheduler.slot(model=self._scheduler_model, estimated_tokens=count_tokens(content)),
+            ):
+                # Create message
+                timeline.mark(MESSAGE_CREATE)
+                await self._client.messages.create(
+                    thread_id=thread_id,
+                    role=MessageRole.USER,
+                    content=content,
+                )
 
-        # Create message
-        await self._client.messages.create(
-            thread_id=thread_id,
-            role=MessageRole.USER,
-            content=content,
-        )
+                async with llm_metrics.track(self.model, AZURE_AGENT) as record:
+                    response = await self._run_to_completion(
+                        thread_id,
+                        record,
+                        context or {},
+                        timeline,
+                        truncation_strategy,
+                    )
+
+        return response
+
+    async def _run_to_completion(
+        self,
+        thread_id: str,
+        record: LLMCallRecord,
+        context: dict[str, Any],
+        timeline: RunTimeline,
+        truncation_strategy: TruncationObject | None = None,
+    ) -> str:
+        """
+        Run the agent on a thread and return its reply.
+
+        The run is streamed so its completion arrives as an event, with tool
+        calls answered inside the stream. If streaming is disabled or the
+        stream can't be opened, the run is polled instead.
+        """
+        timeline.mark(RUN_CREATE)
+        if self.settings.azure_ai_run_streaming_enabled:
+            try:
+                stream = await self._client.runs.stream(
+                    thread_id=thread_id,
+                    agent_id=self._agent.id,
+                    truncation_strategy=truncation_strategy,
+                )
+            except Exception as e:
+                logger.warning(f"[{self.name}] Could not stream run, polling instead: {e}")
+            else:
+                return "".join([
+                    chunk async for chunk in self._stream_events(stream, thread_id, record, context, timeline)
+                ])
 
-        # Run agent and process tool calls
         run = await self._client.runs.create(
             thread_id=thread_id,
             agent_id=self._agent.id,
+            truncation_strategy=truncation_strategy,
         )
+        return await self._process_run(thread_id, run, record, context, timeline)
 
-        # Process run until completion
-        response = await self._process_run(thread_id, run)
-
-        return response
-
-    async def _process_run(self, thread_id: str, run: ThreadRun) -> str:
+    async def _process_run(
+        self,
+        thread_id: str,
+        run: ThreadRun,
+        record: LLMCallRecord | None = None,
+        context: dict[str, Any] | None = None,
+        timeline: RunTimeline | None = None,
+    ) -> str:
         """
-        Process a run until completion, handling any tool calls.
+        Poll a run until completion, handling any tool calls.
+
+        Polling starts after ``azure_ai_run_poll_initial_ms`` and backs off to
+        ``azure_ai_run_poll_max_ms``, restarting after each tool call since
+        the run usually finishes soon after.
 
         Args:
             thread_id: Thread ID
             run: Initial run object
+            record: Metrics record to fill with the run's token usage
+            context: Context data for the run's tool calls
+            timeline: Timeline to mark the run's phases on
 
         Returns:
             Final agent response text
@@ -250,29 +485,21 @@ class BaseAgent(ABC):
         if not self._client:
             raise RuntimeError(f"[{self.name}] Agent not initialized")
 
+        timeline = timeline or RunTimeline(agent=self.name, simulation_id=None)
+
+        initial_delay = self.settings.azure_ai_run_poll_initial_ms / 1000
+        max_delay = self.settings.azure_ai_run_poll_max_ms / 1000
+        delay = initial_delay
+
         while run.status in [RunStatus.QUEUED, RunStatus.IN_PROGRESS, RunStatus.REQUIRES_ACTION]:
+            timeline.mark(RUN_STATUS_PHASES[run.status])
             if run.status == RunStatus.REQUIRES_ACTION:
                 # Handle tool calls
                 if isinstance(run.required_action, SubmitToolOutputsAction):
-                    tool_outputs = []
-                    for tool_call in run.required_action.submit_tool_outputs.tool_calls:
-                        if isinstance(tool_call, RequiredFunctionToolCall):
-                            try:
-                                arguments = json.loads(tool_call.function.arguments)
-                                output = await self.handle_tool_call(
-                                    tool_call.function.name,
-                                    arguments,
-                                )
-                                tool_outputs.append({
-                                    "tool_call_id": tool_call.id,
-                                    "output": output,
-                                })
-                            except Exception as e:
-                                logger.error(f"[{self.name}] Tool call error: {e}")
-                                tool_outputs.append({
-                                    "tool_call_id": tool_call.id,
-                                    "output": json.dumps({"error": str(e)}),
-                                })
+                    tool_outputs = await self._execute_tool_calls(
+                        run.required_action.submit_tool_outputs.tool_calls,
+                        context or {},
+                    )
 
                     # Submit tool outputs
                     run = await self._client.runs.submit_tool_outputs(
@@ -280,10 +507,11 @@ class BaseAgent(ABC):
                         run_id=run.id,
                         tool_outputs=tool_outputs,
                     )
+                    delay = initial_delay
             else:
-                # Wait and poll for status update
-                import asyncio
-                await asyncio.sleep(0.5)
+                # Wait and poll for status update, backing off while the run is busy
+                await asyncio.sleep(delay)
+                delay = min(delay * RUN_POLL_BACKOFF, max_delay)
                 run = await self._client.runs.get(thread_id=thread_id, run_id=run.id)
 
         if run.status == RunStatus.FAILED:
@@ -291,17 +519,105 @@ class BaseAgent(ABC):
             logger.error(f"[{self.name}] Run failed: {error_msg}")
             raise RuntimeError(f"Agent run failed: {error_msg}")
 
-        # Get the latest assistant message
-        messages = await self._client.messages.list(thread_id=thread_id)
-        for msg in messages.data:
-            if msg.role == MessageRole.ASSISTANT:
-                # Return first text content
-                for content in msg.content:
-                    if hasattr(content, "text") and content.text:
-                        return content.text.value
+        if record:
+            record.set_usage_from(run.usage)
+
+        timeline.mark(MESSAGE_FETCH)
+        return await self.get_run_reply(thread_id, run.id)
+
+    async def get_run_reply(self, thread_id: str, run_id: str) -> str:
+        """
+        Get the final text of a completed run.
+
+        Only the run's newest message is fetched, and the text is cached so
+        later reads don't call the API.
+
+        Args:
+            thread_id: Thread ID
+            run_id: Run ID
+
+        Returns:
+            Text of the run's reply, or an empty string if it has none
+        """
+        if run_id in self._run_replies:
+            self._run_replies.move_to_end(run_id)
+            return self._run_replies[run_id]
+
+        reply = ""
+        async for msg in self._client.messages.list(
+            thread_id=thread_id,
+            run_id=run_id,
+            limit=1,
+            order=ListSortOrder.DESCENDING,
+        ):
+            if msg.role == MessageRole.AGENT:
+                # First text content; stop here, as the pager would otherwise
+                # keep fetching older pages (limit is only the page size)
+                reply = next((c.text.value for c in msg.content if getattr(c, "text", None)), "")
                 break
 
-        return ""
+        self._cache_run_reply(run_id, reply)
+        return reply
+
+    def _cache_run_reply(self, run_id: str, reply: str) -> None:
+        self._run_replies[run_id] = reply
+        self._run_replies.move_to_end(run_id)
+        while len(self._run_replies) > RUN_REPLY_CACHE_SIZE:
+            self._run_replies.popitem(last=False)
+
+    async def _execute_tool_calls(self, tool_calls: list[Any], context: dict[str, Any]) -> list[dict[str, str]]:
+        """
+        Execute the function tool calls requested by a run.
+
+        Args:
+            tool_calls: Tool calls from the run's required action
+            context: Context data of the run, exposed to handlers as ``tool_context``
+
+        Returns:
+            Tool outputs ready to submit back to the run
+        """
+        token = _tool_context.set(context)
+        try:
+            return await self._call_tools(tool_calls)
+        finally:
+            _tool_context.reset(token)
+
+    async def _call_tools(self, tool_calls: list[Any]) -> list[dict[str, str]]:
+        """Call ``handle_tool_call`` for all function tool calls concurrently, collecting outputs and errors."""
+        return list(await asyncio.gather(*(
+            self._call_tool(tool_call)
+            for tool_call in tool_calls
+            if isinstance(tool_call, RequiredFunctionToolCall)
+        )))
+
+    async def _call_tool(self, tool_call: RequiredFunctionToolCall) -> dict[str, str]:
+        """Call one tool within ``azure_ai_tool_timeout_seconds``, recording its latency and outcome."""
+        tool_name = tool_call.function.name
+        stats = self._tool_stats.setdefault(tool_name, ToolCallStats())
+        started = time.monotonic()
+        try:
+            arguments = json.loads(tool_call.function.arguments)
+            output = await asyncio.wait_for(
+                self.handle_tool_call(tool_name, arguments),
+                timeout=self.settings.azure_ai_tool_timeout_seconds,
+            )
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            logger.error(f"[{self.name}] Tool call {tool_name} timed out")
+            output = json.dumps({"error": f"Tool {tool_name} timed out"})
+        except Exception as e:
+            stats.errors += 1
+            logger.error(f"[{self.name}] Tool call error: {e}")
+            output = json.dumps({"error": str(e)})
+
+        elapsed_ms = (time.monotonic() - started) * 1000
+        stats.calls += 1
+        stats.total_ms += elapsed_ms
+        stats.max_ms = max(stats.max_ms, elapsed_ms)
+        return {
+            "tool_call_id": tool_call.id,
+            "output": output,
+        }
 
     async def send_message_streaming(
         self,
@@ -323,28 +639,89 @@ class BaseAgent(ABC):
         if not self._client or not self._agent:
             raise RuntimeError(f"[{self.name}] Agent not initialized")
 
-        # Store context for tool calls
-        self._current_context = context or {}
+        with agent_run_timings.track(self.name) as timeline:
+            timeline.mark(SLOT_WAIT)
+            async with (
+                self._run_pool.run(thread_id),
+                llm_scheduler.slot(model=self._scheduler_model, estimated_tokens=count_tokens(content)),
+            ):
+                # Create message
+                timeline.mark(MESSAGE_CREATE)
+                await self._client.messages.create(
+                    thread_id=thread_id,
+                    role=MessageRole.USER,
+                    content=content,
+                )
 
-        # Create message
-        await self._client.messages.create(
-            thread_id=thread_id,
-            role=MessageRole.USER,
-            content=content,
-        )
+                async with llm_metrics.track(self.model, AZURE_AGENT) as record:
+                    async for chunk in self._stream_run(thread_id, record, context or {}, timeline):
+                        yield chunk
 
-        # Create and stream run
-        async with await self._client.runs.stream(
+    async def _stream_run(
+        self,
+        thread_id: str,
+        record: LLMCallRecord,
+        context: dict[str, Any],
+        timeline: RunTimeline,
+    ) -> AsyncIterator[str]:
+        """Create a streaming run on a thread and yield its text deltas."""
+        timeline.mark(RUN_CREATE)
+        stream = await self._client.runs.stream(
             thread_id=thread_id,
             agent_id=self._agent.id,
-        ) as stream:
-            async for event in stream:
-                if hasattr(event, "data") and hasattr(event.data, "delta"):
-                    delta = event.data.delta
-                    if hasattr(delta, "content"):
-                        for content_block in delta.content:
-                            if hasattr(content_block, "text") and content_block.text:
-                                yield content_block.text.value
+        )
+        async for chunk in self._stream_events(stream, thread_id, record, context, timeline):
+            yield chunk
+
+    async def _stream_events(
+        self,
+        stream: Any,
+        thread_id: str,
+        record: LLMCallRecord,
+        context: dict[str, Any],
+        timeline: RunTimeline,
+    ) -> AsyncIterator[str]:
+        """Consume a run stream, answering tool calls, and yield its text deltas."""
+        # The stream is only a context manager; the event handler it returns
+        # is what yields events. Tool calls are answered inside the stream:
+        # submitting outputs chains the continuation onto the same handler.
+        chunks: list[str] = []
+        async with stream as handler:
+            async for event_type, event_data, _ in handler:
+                if isinstance(event_data, MessageDeltaChunk):
+                    if event_data.text:
+                        record.first_byte()
+                        chunks.append(event_data.text)
+                        yield event_data.text
+
+                elif isinstance(event_data, ThreadRun):
+                    if event_data.status in RUN_STATUS_PHASES:
+                        timeline.mark(RUN_STATUS_PHASES[event_data.status])
+                    if (
+                        event_data.status == RunStatus.REQUIRES_ACTION
+                        and isinstance(event_data.required_action, SubmitToolOutputsAction)
+                    ):
+                        tool_outputs = await self._execute_tool_calls(
+                            event_data.required_action.submit_tool_outputs.tool_calls,
+                            context,
+                        )
+                        await self._client.runs.submit_tool_outputs_stream(
+                            thread_id=thread_id,
+                            run_id=event_data.id,
+                            tool_outputs=tool_outputs,
+                            event_handler=handler,
+                        )
+                    elif event_data.status == RunStatus.COMPLETED:
+                        record.set_usage_from(event_data.usage)
+                        self._cache_run_reply(event_data.id, "".join(chunks))
+                    elif event_data.status == RunStatus.FAILED:
+                        error_msg = event_data.last_error.message if event_data.last_error else "Unknown error"
+                        logger.error(f"[{self.name}] Streaming run failed: {error_msg}")
+                        raise RuntimeError(f"Agent run failed: {error_msg}")
+
+                elif event_type == AgentStreamEvent.ERROR:
+                    logger.error(f"[{self.name}] Streaming error: {event_data}")
+                    raise RuntimeError(f"Agent stream error: {event_data}")
 
     async def cleanup(self) -> None:
         """Clean up agent resources."""
@@ -353,20 +730,20 @@ class BaseAgent(ABC):
                 await self._client.delete_agent(self._agent.id)
                 logger.info(f"[{self.name}] Agent deleted: {self._agent.id}")
 
-            # Clear threads
+            # Clear threads (the registry table keeps them for the next start)
             self._threads.clear()
             self._agent = None
             self._initialized = False
 
-            # Close credential
-            if self._credential:
-                await self._credential.close()
-                self._credential = None
-
-            # Close client (if it has close method)
-            if self._client and hasattr(self._client, "close"):
-                await self._client.close()
+            # Close the client and credential, unless they are shared
+            if self._owns_client:
+                if self._credential:
+                    await self._credential.close()
+                if self._client and hasattr(self._client, "close"):
+                    await self._client.close()
+            self._credential = None
             self._client = None
+            self._owns_client = False
 
         except Exception as e:
             logger.error(f"[{self.name}] Error during cleanup: {e}")
@@ -3,16 +3,28 @@ Evaluation Agent
 Evaluates advisor performance and tracks objectives
 """
 
+import asyncio
 import json
 import logging
 from typing import Any
 
-from azure.ai.agents.models import ToolDefinition, FunctionTool, FunctionToolDefinition, FunctionDefinition
+from azure.ai.agents.models import (
+    ToolDefinition,
+    FunctionTool,
+    FunctionToolDefinition,
+    FunctionDefinition,
+    TruncationObject,
+    TruncationStrategy,
+)
 
 from app.agents.base_agent import BaseAgent
 
 logger = logging.getLogger(__name__)
 
+# Objective prompts carry everything the evaluation needs, so runs on a
+# simulation's reused thread read only the newest message
+OBJECTIVE_TRUNCATION = TruncationObject(type=TruncationStrategy.LAST_MESSAGES, last_messages=1)
+
 
 EVALUATION_INSTRUCTIONS = """You are an expert evaluator for financial advisor training simulations. Your role is to analyze conversations between advisors and clients, providing fair and constructive assessments.
 
@@ -49,8 +61,6 @@ class EvaluationAgent(BaseAgent):
             instructions=EVALUATION_INSTRUCTIONS,
             model=None,
         )
-        self._competencies: list[dict[str, Any]] = []
-        self._rubrics: list[dict[str, Any]] = []
 
     def get_tools(self) -> list[ToolDefinition]:
         """Get tool definitions for the evaluation agent."""
@@ -137,10 +147,10 @@ class EvaluationAgent(BaseAgent):
 
     async def handle_tool_call(self, tool_name: str, arguments: dict[str, Any]) -> str:
         """Handle tool calls from the agent."""
-        context = getattr(self, "_current_context", {})
+        context = self.tool_context
 
         if tool_name == "get_competencies":
-            competencies = context.get("competencies", self._competencies)
+            competencies = context.get("competencies", [])
             if not competencies:
                 competencies = [
                     {"name": "Building Rapport", "description": "Establishing connection and trust with clients"},
@@ -151,7 +161,7 @@ class EvaluationAgent(BaseAgent):
             return json.dumps(competencies)
 
         elif tool_name == "get_rubrics":
-            rubrics = context.get("rubrics", self._rubrics)
+            rubrics = context.get("rubrics", [])
             if not rubrics:
                 rubrics = [
                     {"criteria": "Active listening and empathy", "weight": 25},
@@ -205,8 +215,6 @@ class EvaluationAgent(BaseAgent):
         if not self.is_initialized:
             raise RuntimeError("EvaluationAgent not initialized")
 
-        self._competencies = competencies or []
-
         context = {
             "competencies": competencies or [],
             "difficulty": difficulty,
@@ -244,8 +252,7 @@ Return your evaluation as a JSON object:
   "summary": "Overall performance summary..."
 }}"""
 
-        thread_id = await self.create_thread()
-        response_text = await self.send_message(thread_id, prompt, context)
+        response_text = await self.send_message_on_new_thread(prompt, context)
 
         # Parse JSON response
         try:
@@ -273,12 +280,21 @@ Return your evaluation as a JSON object:
     async def evaluate_objectives(
         self,
         messages: list[dict[str, Any]],
+        state_summary: str | None = None,
+        session_id: str | None = None,
     ) -> dict[str, Any] | None:
         """
         Evaluate objective progress based on conversation.
 
+        Evaluations of a simulation share one thread, so each appends only
+        its new turns instead of creating a thread per chat turn.
+
         Args:
-            messages: Conversation history
+            messages: Conversation history, or only the new turns when
+                ``state_summary`` is given
+            state_summary: Compact summary of the previous assessment to update
+            session_id: Simulation whose evaluation thread to reuse; a
+                throwaway thread is used if omitted
 
         Returns:
             Objective progress dictionary or None
@@ -288,28 +304,43 @@ Return your evaluation as a JSON object:
 
         conversation_text = self._format_conversation(messages)
 
-        prompt = f"""Evaluate the advisor's performance in this conversation and assess progress on these objectives:
-
-1. Building Rapport: Establishing connection with the client (0-100%)
-2. Needs Assessment: Discovering client's financial situation and goals (0-100%)
-3. Handling Objections: Addressing concerns professionally (0-100%)
-4. Providing Recommendations: Suggesting appropriate options (0-100%)
+        if state_summary:
+            scope = f"""{state_summary}
 
 IMPORTANT SCORING INSTRUCTIONS:
+- Start from the previous scores and adjust them for what happens in the new turns below
+- Scores should generally not decrease unless there's a significant mistake
+- Even brief exchanges showing warmth/professionalism contribute to rapport (10-30%)
+- Questions about client's situation contribute to needs assessment (15-40%)
+
+New turns since the previous assessment:
+{conversation_text}"""
+        else:
+            scope = f"""IMPORTANT SCORING INSTRUCTIONS:
 - Base your evaluation on the ENTIRE conversation, not just the last message
 - Scores should generally not decrease unless there's a significant mistake
 - Even brief exchanges showing warmth/professionalism contribute to rapport (10-30%)
 - Questions about client's situation contribute to needs assessment (15-40%)
 
 Conversation:
-{conversation_text}
+{conversation_text}"""
 
-Use the track_objective_progress tool to report your assessment."""
+        prompt = f"""Evaluate the advisor's performance in this conversation and assess progress on these objectives:
 
-        thread_id = await self.create_thread()
+1. Building Rapport: Establishing connection with the client (0-100%)
+2. Needs Assessment: Discovering client's financial situation and goals (0-100%)
+3. Handling Objections: Addressing concerns professionally (0-100%)
+4. Providing Recommendations: Suggesting appropriate options (0-100%)
+
+{scope}
+
+Use the track_objective_progress tool to report your assessment."""
 
         try:
-            response_text = await self.send_message(thread_id, prompt, {})
+            if session_id:
+                response_text = await self._send_on_session_thread(session_id, prompt)
+            else:
+                response_text = await self.send_message_on_new_thread(prompt, {})
 
             # Try to extract progress from response
             try:
@@ -337,6 +368,17 @@ Use the track_objective_progress tool to report your assessment."""
             logger.error(f"[EvaluationAgent] Error evaluating objectives: {e}")
             return None
 
+    async def _send_on_session_thread(self, session_id: str, prompt: str) -> str:
+        """Send an objective prompt on the simulation's evaluation thread."""
+        thread_id = await self.get_or_create_thread(session_id)
+        try:
+            return await self.send_message(thread_id, prompt, {}, truncation_strategy=OBJECTIVE_TRUNCATION)
+        except BaseException:
+            # A failed or superseded run may still be active on the thread and
+            # would block the next evaluation, so start the next one afresh
+            await asyncio.shield(self.release_thread(session_id))
+            raise
+
     def _format_conversation(self, messages: list[dict[str, Any]]) -> str:
         """Format conversation for evaluation."""
         formatted = []
@@ -48,8 +48,6 @@ class ExpertGuidanceAgent(BaseAgent):
             instructions=EXPERT_GUIDANCE_INSTRUCTIONS,
             model=None,
         )
-        self._objectives: list[dict[str, Any]] = []
-        self._simulation_context: dict[str, Any] = {}
 
     def get_tools(self) -> list[ToolDefinition]:
         """Get tool definitions for the expert guidance agent."""
@@ -80,10 +78,10 @@ class ExpertGuidanceAgent(BaseAgent):
 
     async def handle_tool_call(self, tool_name: str, arguments: dict[str, Any]) -> str:
         """Handle tool calls from the agent."""
-        context = getattr(self, "_current_context", {})
+        context = self.tool_context
 
         if tool_name == "get_objectives":
-            objectives = context.get("objectives", self._objectives)
+            objectives = context.get("objectives", [])
             if not objectives:
                 objectives = [
                     {"name": "Building Rapport", "progress": 0},
@@ -97,7 +95,7 @@ class ExpertGuidanceAgent(BaseAgent):
             })
 
         elif tool_name == "get_simulation_context":
-            sim_context = context.get("simulation_settings", self._simulation_context)
+            sim_context = context.get("simulation_settings", {})
             client_profile = context.get("client_profile", {})
             return json.dumps({
                 "industry": sim_context.get("industry", "Unknown"),
@@ -138,9 +136,6 @@ class ExpertGuidanceAgent(BaseAgent):
         if not self.is_initialized:
             raise RuntimeError("ExpertGuidanceAgent not initialized")
 
-        self._objectives = objectives or []
-        self._simulation_context = simulation_settings or {}
-
         context = {
             "client_profile": client_profile,
             "simulation_settings": simulation_settings or {},
@@ -0,0 +1,384 @@
+"""
+Fake Agents Client
+In-process stand-in for the Azure AI AgentsClient, used for load testing
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from typing import Any, AsyncIterator
+
+from azure.ai.agents.models import (
+    Agent,
+    AgentStreamEvent,
+    AgentThread,
+    MessageDeltaChunk,
+    MessageRole,
+    RunStatus,
+    ThreadMessage,
+    ThreadRun,
+)
+
+from app.utils.fake_llm import FakeCall, FakeLLM
+
+logger = logging.getLogger(__name__)
+
+
+def _new_id(prefix: str) -> str:
+    return f"{prefix}_{uuid.uuid4().hex[:24]}"
+
+
+def _as_dict(model: Any) -> dict[str, Any]:
+    """Plain dict of an SDK model or a dict."""
+    return model.as_dict() if hasattr(model, "as_dict") else dict(model)
+
+
+class _FakeRun:
+    """
+    A run's planned outcome, advanced by the clock.
+
+    The run optionally asks for one tool call before answering. Each phase
+    takes the latency drawn for the call, so polling sees the same timeline
+    as streaming.
+    """
+
+    def __init__(self, client: "FakeAgentsClient", thread_id: str, agent: dict[str, Any]):
+        self.client = client
+        self.id = _new_id("run")
+        self.thread_id = thread_id
+        self.agent = agent
+        self.created_at = int(time.time())
+
+        prompt = "\n".join([agent.get("instructions") or "", *client._thread_text(thread_id)])
+        self.call: FakeCall = client._fake.call({"agent": agent["name"], "thread": client._thread_text(thread_id)})
+        self.reply = client._fake.reply(prompt, self.call.rng)
+        self.usage = client._fake.usage(prompt, self.reply)
+
+        self.tool_calls: list[dict[str, Any]] = []
+        functions = [t["function"] for t in agent.get("tools") or [] if t.get("type") == "function"]
+        if functions and not self.call.failed and client._fake.wants_tool_call(self.call.rng):
+            function = self.call.rng.choice(functions)
+            self.tool_calls.append({
+                "id": _new_id("call"),
+                "type": "function",
+                "function": {
+                    "name": function["name"],
+                    "arguments": json.dumps(client._fake.tool_arguments(function.get("parameters") or {}, self.call.rng)),
+                },
+            })
+
+        self.status = RunStatus.QUEUED
+        self.phase_started = time.monotonic()
+        self.completed_message: ThreadMessage | None = None
+
+    @property
+    def awaiting_tools(self) -> bool:
+        return bool(self.tool_calls)
+
+    def phase_seconds(self) -> float:
+        """Length of the current phase: the first token, plus the reply if it is the last phase."""
+        if self.call.failed or self.awaiting_tools:
+            return self.call.ttfb_seconds
+        return self.call.duration(self.usage["completion_tokens"])
+
+    def advance(self) -> None:
+        """Move the run on according to how long its current phase has taken."""
+        if self.status not in (RunStatus.QUEUED, RunStatus.IN_PROGRESS):
+            return
+        if time.monotonic() - self.phase_started < self.phase_seconds():
+            self.status = RunStatus.IN_PROGRESS
+        else:
+            self.finish_phase()
+
+    def finish_phase(self) -> None:
+        """End the current phase: fail, ask for tools or complete."""
+        if self.call.failed:
+            self.status = RunStatus.FAILED
+        elif self.awaiting_tools:
+            self.status = RunStatus.REQUIRES_ACTION
+        else:
+            self.status = RunStatus.COMPLETED
+            self.completed_message = self.client._add_message(
+                self.thread_id, MessageRole.AGENT, self.reply, run_id=self.id, agent_id=self.agent["id"]
+            )
+
+    def submit_tool_outputs(self, tool_outputs: list[Any]) -> None:
+        """Accept tool outputs and start the answering phase."""
+        if self.status != RunStatus.REQUIRES_ACTION:
+            raise ValueError(f"Run {self.id} is not waiting for tool outputs")
+        submitted = {_as_dict(output).get("tool_call_id") for output in tool_outputs}
+        missing = [call["id"] for call in self.tool_calls if call["id"] not in submitted]
+        if missing:
+            raise ValueError(f"Missing tool outputs for {missing}")
+        self.tool_calls = []
+        self.status = RunStatus.IN_PROGRESS
+        self.phase_started = time.monotonic()
+
+    def to_model(self) -> ThreadRun:
+        data: dict[str, Any] = {
+            "id": self.id,
+            "object": "thread.run",
+            "thread_id": self.thread_id,
+            "agent_id": self.agent["id"],
+            "status": self.status.value,
+            "model": self.agent["model"],
+            "instructions": self.agent.get("instructions") or "",
+            "tools": self.agent.get("tools") or [],
+            "created_at": self.created_at,
+        }
+        if self.status == RunStatus.REQUIRES_ACTION:
+            data["required_action"] = {
+                "type": "submit_tool_outputs",
+                "submit_tool_outputs": {"tool_calls": self.tool_calls},
+            }
+        if self.status == RunStatus.FAILED:
+            code = "rate_limit_exceeded" if self.call.status_code == 429 else "server_error"
+            data["last_error"] = {"code": code, "message": f"Fake {code.replace('_', ' ')}"}
+        if self.status == RunStatus.COMPLETED:
+            data["usage"] = self.usage
+        return ThreadRun(data)
+
+
+class _FakeRunStream:
+    """
+    Async context manager of a streamed run, like ``AsyncAgentRunStream``.
+
+    The stream itself can't be iterated: entering it returns the event
+    handler that yields the events, as in the SDK.
+    """
+
+    def __init__(self, run: _FakeRun):
+        self._handler = _FakeEventHandler(run)
+
+    async def __aenter__(self) -> "_FakeEventHandler":
+        return self._handler
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        return None
+
+
+class _FakeEventHandler:
+    """Async iterator of (event type, event data, None) run events, like ``AsyncAgentEventHandler``."""
+
+    def __init__(self, run: _FakeRun):
+        self._run = run
+        self._events: AsyncIterator[tuple[str, Any, None]] | None = self._phase_events()
+
+    def __aiter__(self) -> "_FakeEventHandler":
+        return self
+
+    async def __anext__(self) -> tuple[str, Any, None]:
+        while self._events is not None:
+            events = self._events
+            try:
+                return await events.__anext__()
+            except StopAsyncIteration:
+                # Tool output submission may have chained a new phase onto the stream
+                if self._events is events:
+                    self._events = None
+        raise StopAsyncIteration
+
+    def continue_run(self) -> None:
+        """Stream the next phase after tool outputs were submitted."""
+        self._events = self._phase_events()
+
+    async def _phase_events(self) -> AsyncIterator[tuple[str, Any, None]]:
+        run = self._run
+        yield AgentStreamEvent.THREAD_RUN_IN_PROGRESS, self._running(), None
+        await asyncio.sleep(run.call.ttfb_seconds)
+
+        if run.call.failed or run.awaiting_tools:
+            run.finish_phase()
+            event = AgentStreamEvent.THREAD_RUN_FAILED if run.call.failed else AgentStreamEvent.THREAD_RUN_REQUIRES_ACTION
+            yield event, run.to_model(), None
+            return
+
+        message_id = _new_id("msg")
+        for index, token in enumerate(run.client._fake.split_tokens(run.reply)):
+            if index:
+                await asyncio.sleep(run.call.seconds_per_token)
+            yield AgentStreamEvent.THREAD_MESSAGE_DELTA, MessageDeltaChunk({
+                "id": message_id,
+                "object": "thread.message.delta",
+                "delta": {"role": "assistant", "content": [{"index": 0, "type": "text", "text": {"value": token}}]},
+            }), None
+
+        run.finish_phase()
+        yield AgentStreamEvent.THREAD_MESSAGE_COMPLETED, run.completed_message, None
+        yield AgentStreamEvent.THREAD_RUN_COMPLETED, run.to_model(), None
+        yield AgentStreamEvent.DONE, "[DONE]", None
+
+    def _running(self) -> ThreadRun:
+        self._run.status = RunStatus.IN_PROGRESS
+        return self._run.to_model()
+
+
+class _FakeThreads:
+    def __init__(self, client: "FakeAgentsClient"):
+        self._client = client
+
+    async def create(self, **kwargs: Any) -> AgentThread:
+        thread_id = _new_id("thread")
+        self._client._messages[thread_id] = []
+        return AgentThread({"id": thread_id, "object": "thread", "created_at": int(time.time())})
+
+    async def delete(self, thread_id: str, **kwargs: Any) -> None:
+        self._client._require_thread(thread_id)
+        del self._client._messages[thread_id]
+
+
+class _FakeMessages:
+    def __init__(self, client: "FakeAgentsClient"):
+        self._client = client
+
+    async def create(self, thread_id: str, role: str, content: str, **kwargs: Any) -> ThreadMessage:
+        return self._client._add_message(thread_id, role, content)
+
+    async def list(
+        self,
+        thread_id: str,
+        *,
+        run_id: str | None = None,
+        limit: int | None = None,
+        order: str | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ThreadMessage]:
+        # Newest first, like the service
+        messages = list(self._client._require_thread(thread_id))
+        if order in (None, "desc"):
+            messages.reverse()
+        if run_id:
+            messages = [m for m in messages if m.run_id == run_id]
+        for message in messages[:limit] if limit else messages:
+            yield message
+
+
+class _FakeRuns:
+    def __init__(self, client: "FakeAgentsClient"):
+        self._client = client
+
+    async def create(self, thread_id: str, *, agent_id: str, **kwargs: Any) -> ThreadRun:
+        return self._client._start_run(thread_id, agent_id).to_model()
+
+    async def get(self, thread_id: str, run_id: str, **kwargs: Any) -> ThreadRun:
+        run = self._client._require_run(thread_id, run_id)
+        run.advance()
+        return run.to_model()
+
+    async def submit_tool_outputs(self, thread_id: str, run_id: str, *, tool_outputs: list[Any], **kwargs: Any) -> ThreadRun:
+        run = self._client._require_run(thread_id, run_id)
+        run.submit_tool_outputs(tool_outputs)
+        return run.to_model()
+
+    async def stream(self, thread_id: str, *, agent_id: str, **kwargs: Any) -> _FakeRunStream:
+        return _FakeRunStream(self._client._start_run(thread_id, agent_id))
+
+    async def submit_tool_outputs_stream(
+        self,
+        thread_id: str,
+        run_id: str,
+        *,
+        tool_outputs: list[Any],
+        event_handler: _FakeEventHandler,
+        **kwargs: Any,
+    ) -> None:
+        self._client._require_run(thread_id, run_id).submit_tool_outputs(tool_outputs)
+        event_handler.continue_run()
+
+
+class FakeAgentsClient:
+    """
+    Stand-in for ``azure.ai.agents.aio.AgentsClient`` covering what the
+    agents use: agents, threads, messages and polled or streamed runs with
+    tool calls.
+
+    Replies, latencies and failures come from ``FakeLLM``, so they follow the
+    ``fake_llm_*`` settings shared with the fake OpenAI server. State lives in
+    memory for the lifetime of the client.
+    """
+
+    def __init__(self, fake: FakeLLM | None = None):
+        self._fake = fake or FakeLLM()
+        self._agents: dict[str, dict[str, Any]] = {}
+        self._messages: dict[str, list[ThreadMessage]] = {}
+        self._runs: dict[str, _FakeRun] = {}
+        self.threads = _FakeThreads(self)
+        self.messages = _FakeMessages(self)
+        self.runs = _FakeRuns(self)
+
+    async def list_agents(self, **kwargs: Any) -> AsyncIterator[Agent]:
+        for agent in self._agents.values():
+            yield Agent(agent)
+
+    async def create_agent(
+        self,
+        model: str,
+        name: str | None = None,
+        instructions: str | None = None,
+        tools: list[Any] | None = None,
+        **kwargs: Any,
+    ) -> Agent:
+        agent = {
+            "id": _new_id("asst"),
+            "object": "assistant",
+            "created_at": int(time.time()),
+            "name": name,
+            "model": model,
+            "instructions": instructions,
+            "tools": [_as_dict(tool) for tool in tools or []],
+            "tool_resources": {},
+            "metadata": {},
+        }
+        self._agents[agent["id"]] = agent
+        logger.info(f"[FAKE AGENTS] Created agent {name}: {agent['id']}")
+        return Agent(agent)
+
+    async def delete_agent(self, agent_id: str, **kwargs: Any) -> None:
+        self._agents.pop(agent_id, None)
+
+    async def close(self) -> None:
+        self._runs.clear()
+        self._messages.clear()
+
+    def _start_run(self, thread_id: str, agent_id: str) -> _FakeRun:
+        self._require_thread(thread_id)
+        agent = self._agents.get(agent_id)
+        if agent is None:
+            raise ValueError(f"No agent found with id {agent_id}")
+        run = _FakeRun(self, thread_id, agent)
+        self._runs[run.id] = run
+        return run
+
+    def _add_message(self, thread_id: str, role: Any, content: str, **fields: Any) -> ThreadMessage:
+        messages = self._require_thread(thread_id)
+        message = ThreadMessage({
+            "id": _new_id("msg"),
+            "object": "thread.message",
+            "created_at": int(time.time()),
+            "thread_id": thread_id,
+            "status": "completed",
+            "role": str(getattr(role, "value", role)),
+            "content": [{"type": "text", "text": {"value": content, "annotations": []}}],
+            "attachments": [],
+            "metadata": {},
+            **fields,
+        })
+        messages.append(message)
+        return message
+
+    def _thread_text(self, thread_id: str) -> list[str]:
+        return [m.content[0].text.value for m in self._require_thread(thread_id) if m.content]
+
+    def _require_thread(self, thread_id: str) -> list[ThreadMessage]:
+        messages = self._messages.get(thread_id)
+        if messages is None:
+            raise ValueError(f"No thread found with id {thread_id}")
+        return messages
+
+    def _require_run(self, thread_id: str, run_id: str) -> _FakeRun:
+        run = self._runs.get(run_id)
+        if run is None or run.thread_id != thread_id:
+            raise ValueError(f"No run found with id {run_id}")
+        return run
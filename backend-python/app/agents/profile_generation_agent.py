@@ -50,6 +50,28 @@ PROFILE_SCHEMA = {
 }
 
 
+def validate_profile(profile: dict[str, Any]) -> dict[str, Any]:
+    """
+    Validate profile structure.
+
+    Args:
+        profile: Generated client profile
+
+    Returns:
+        Validation result with ``valid`` and the missing required fields
+    """
+    required_fields = ["name", "age", "occupation", "goals"]
+    missing = [f for f in required_fields if f not in profile or not profile[f]]
+
+    return {
+        "valid": len(missing) == 0,
+        "missing_fields": missing,
+        "has_all_recommended": all(
+            f in profile for f in ["income", "family", "concerns", "background"]
+        ),
+    }
+
+
 class ProfileGenerationAgent(BaseAgent):
     """
     Agent that generates realistic client profiles for simulations.
@@ -62,8 +84,6 @@ class ProfileGenerationAgent(BaseAgent):
             instructions=PROFILE_GENERATION_INSTRUCTIONS,
             model=None,
         )
-        self._industry_settings: dict[str, Any] = {}
-        self._difficulty_settings: dict[str, Any] = {}
 
     def get_tools(self) -> list[ToolDefinition]:
         """Get tool definitions for the profile generation agent."""
@@ -120,7 +140,7 @@ class ProfileGenerationAgent(BaseAgent):
 
     async def handle_tool_call(self, tool_name: str, arguments: dict[str, Any]) -> str:
         """Handle tool calls from the agent."""
-        context = getattr(self, "_current_context", {})
+        context = self.tool_context
 
         if tool_name == "get_industry_settings":
             industry = arguments.get("industry", "").lower()
@@ -228,16 +248,7 @@ class ProfileGenerationAgent(BaseAgent):
 
     def _validate_profile(self, profile: dict[str, Any]) -> dict[str, Any]:
         """Validate profile structure."""
-        required_fields = ["name", "age", "occupation", "goals"]
-        missing = [f for f in required_fields if f not in profile or not profile[f]]
-
-        return {
-            "valid": len(missing) == 0,
-            "missing_fields": missing,
-            "has_all_recommended": all(
-                f in profile for f in ["income", "family", "concerns", "background"]
-            ),
-        }
+        return validate_profile(profile)
 
     async def generate_profile(
         self,
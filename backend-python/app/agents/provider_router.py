@@ -0,0 +1,325 @@
+"""
+Provider Router
+Latency-aware routing between AI backends with circuit breakers and hedging
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, TypeVar
+
+from app.config import get_settings
+from app.utils.llm_metrics import llm_call_context
+from app.utils.llm_scheduler import LoadShedError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+AZURE_AGENT = "azure-agent"
+OPENAI = "openai"
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+@dataclass
+class _ProviderState:
+    """Rolling outcomes and circuit state for one backend."""
+    latencies: deque = field(default_factory=deque)
+    outcomes: deque = field(default_factory=deque)
+    circuit: str = CIRCUIT_CLOSED
+    consecutive_failures: int = 0
+    opened_at: float = 0.0
+    trial_in_flight: bool = False
+    calls: int = 0
+    failures: int = 0
+    short_circuited: int = 0
+
+
+class ProviderRouter:
+    """
+    Routes AI calls across backends in preference order.
+
+    Each backend keeps a rolling window of the last ``provider_stats_window``
+    outcomes. After ``provider_circuit_failure_threshold`` consecutive failures
+    its circuit opens and calls skip it for ``provider_circuit_reset_seconds``;
+    a single trial call is then let through to decide whether to close it.
+
+    Hedged calls start the next backend if the first has not answered within
+    its p95 latency and return whichever succeeds first. The slower call is
+    left to finish so its latency is still recorded and an Azure thread is
+    never left with a cancelled run.
+    """
+
+    def __init__(self):
+        self.settings = get_settings()
+        self._providers: dict[str, _ProviderState] = {}
+        self._background: set[asyncio.Task] = set()
+        self._hedged = 0
+        self._hedge_wins = 0
+
+    async def call(
+        self,
+        operation: str,
+        providers: list[tuple[str, Callable[[], Awaitable[T]]]],
+        hedge: bool = False,
+    ) -> tuple[T, str]:
+        """
+        Call backends in order until one succeeds.
+
+        Args:
+            operation: Name of the call, used for logging
+            providers: (backend name, coroutine factory) pairs in preference order
+            hedge: Start the second backend if the first is slower than its p95
+
+        Returns:
+            The result and the name of the backend that produced it
+        """
+        # Label the LLM calls made by every backend with this operation
+        with llm_call_context(endpoint=operation):
+            return await self._call(operation, providers, hedge)
+
+    async def _call(
+        self,
+        operation: str,
+        providers: list[tuple[str, Callable[[], Awaitable[T]]]],
+        hedge: bool,
+    ) -> tuple[T, str]:
+        """Call backends in order, hedging the first if requested."""
+        if not providers:
+            raise ValueError(f"No AI backend available for {operation}")
+
+        if hedge and self.settings.provider_hedging_enabled and len(providers) > 1:
+            first_name, first_factory = providers[0]
+            if self._allow(first_name):
+                return await self._call_hedged(operation, providers[0], providers[1], providers[2:])
+            providers = providers[1:]
+
+        last_error: Exception | None = None
+        attempted = False
+        for index, (name, factory) in enumerate(providers):
+            # Fail open on the last backend rather than rejecting the call outright
+            if not self._allow(name) and (attempted or index < len(providers) - 1):
+                logger.debug(f"[PROVIDER] Circuit open for {name}, skipping {operation}")
+                continue
+            attempted = True
+            try:
+                return await self._timed(name, factory), name
+            except LoadShedError:
+                # Every backend shares the same queue, so don't try the next one
+                raise
+            except Exception as e:
+                last_error = e
+                if index < len(providers) - 1:
+                    logger.warning(f"[PROVIDER] {name} failed for {operation}, trying next backend: {e}")
+
+        raise last_error or RuntimeError(f"No AI backend available for {operation}")
+
+    def is_available(self, name: str) -> bool:
+        """Check whether a backend's circuit lets calls through, without claiming a trial call."""
+        state = self._providers.get(name)
+        if not state or state.circuit == CIRCUIT_CLOSED:
+            return True
+        if state.circuit == CIRCUIT_OPEN:
+            return time.monotonic() - state.opened_at >= self.settings.provider_circuit_reset_seconds
+        return not state.trial_in_flight
+
+    def record_success(self, name: str, latency_seconds: float) -> None:
+        """Record a successful call made outside ``call``, e.g. a stream."""
+        state = self._state(name)
+        state.calls += 1
+        self._push(state, latency_seconds, True)
+        state.consecutive_failures = 0
+        state.trial_in_flight = False
+        if state.circuit != CIRCUIT_CLOSED:
+            state.circuit = CIRCUIT_CLOSED
+            logger.info(f"[PROVIDER] Circuit closed for {name}")
+
+    def record_failure(self, name: str, latency_seconds: float) -> None:
+        """Record a failed call made outside ``call``, e.g. a stream."""
+        state = self._state(name)
+        state.calls += 1
+        state.failures += 1
+        self._push(state, latency_seconds, False)
+        state.consecutive_failures += 1
+        state.trial_in_flight = False
+        if state.circuit == CIRCUIT_HALF_OPEN or (
+            state.circuit == CIRCUIT_CLOSED
+            and state.consecutive_failures >= self.settings.provider_circuit_failure_threshold
+        ):
+            state.circuit = CIRCUIT_OPEN
+            state.opened_at = time.monotonic()
+            logger.warning(
+                f"[PROVIDER] Circuit opened for {name} after {state.consecutive_failures} consecutive failures"
+            )
+
+    def get_circuit_states(self) -> dict[str, str]:
+        """Get the circuit state of every backend seen so far."""
+        return {name: self._circuit(name) for name in self._providers}
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get rolling latency, error rate and circuit state per backend."""
+        return {
+            "hedging_enabled": self.settings.provider_hedging_enabled,
+            "hedged_calls": self._hedged,
+            "hedge_wins": self._hedge_wins,
+            "providers": {
+                name: {
+                    "circuit": self._circuit(name),
+                    "consecutive_failures": state.consecutive_failures,
+                    "calls": state.calls,
+                    "failures": state.failures,
+                    "short_circuited": state.short_circuited,
+                    "error_rate": round(state.outcomes.count(False) / len(state.outcomes), 4) if state.outcomes else 0.0,
+                    "p50_ms": self._percentile_ms(state, 0.5),
+                    "p95_ms": self._percentile_ms(state, 0.95),
+                    "samples": len(state.latencies),
+                }
+                for name, state in self._providers.items()
+            },
+        }
+
+    async def _call_hedged(
+        self,
+        operation: str,
+        primary: tuple[str, Callable[[], Awaitable[T]]],
+        secondary: tuple[str, Callable[[], Awaitable[T]]],
+        rest: list[tuple[str, Callable[[], Awaitable[T]]]],
+    ) -> tuple[T, str]:
+        """Run the primary, starting the secondary if it runs past its hedge delay."""
+        primary_name, primary_factory = primary
+        secondary_name, secondary_factory = secondary
+        delay = self._hedge_delay(primary_name)
+
+        tasks = {asyncio.create_task(self._timed(primary_name, primary_factory)): primary_name}
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+
+        if done:
+            task = next(iter(done))
+            if not task.exception():
+                return task.result(), primary_name
+            if isinstance(task.exception(), LoadShedError):
+                raise task.exception()
+            logger.warning(f"[PROVIDER] {primary_name} failed for {operation}, trying next backend: {task.exception()}")
+            return await self.call(operation, [secondary, *rest])
+
+        if not self._allow(secondary_name):
+            return await next(iter(tasks)), primary_name
+
+        self._hedged += 1
+        logger.info(f"[PROVIDER] {primary_name} slower than {delay * 1000:.0f}ms for {operation}, hedging with {secondary_name}")
+        tasks[asyncio.create_task(self._timed(secondary_name, secondary_factory))] = secondary_name
+
+        last_error: BaseException | None = None
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception():
+                        last_error = task.exception()
+                        continue
+                    if tasks[task] == secondary_name:
+                        self._hedge_wins += 1
+                    self._detach(pending)
+                    return task.result(), tasks[task]
+        except asyncio.CancelledError:
+            for task in pending:
+                task.cancel()
+            raise
+
+        if rest:
+            return await self.call(operation, rest)
+        raise last_error
+
+    async def _timed(self, name: str, factory: Callable[[], Awaitable[T]]) -> T:
+        """Await a backend call and record its latency and outcome."""
+        started = time.monotonic()
+        try:
+            result = await factory()
+        except (asyncio.CancelledError, LoadShedError):
+            # Not the backend's fault; just release a claimed trial call
+            self._state(name).trial_in_flight = False
+            raise
+        except Exception:
+            self.record_failure(name, time.monotonic() - started)
+            raise
+        self.record_success(name, time.monotonic() - started)
+        return result
+
+    def _allow(self, name: str) -> bool:
+        """Check whether a call may go to a backend, claiming the trial call of a half-open circuit."""
+        state = self._state(name)
+        if state.circuit == CIRCUIT_OPEN and time.monotonic() - state.opened_at >= self.settings.provider_circuit_reset_seconds:
+            state.circuit = CIRCUIT_HALF_OPEN
+            logger.info(f"[PROVIDER] Circuit half-open for {name}, allowing a trial call")
+
+        if state.circuit == CIRCUIT_CLOSED:
+            return True
+        if state.circuit == CIRCUIT_HALF_OPEN and not state.trial_in_flight:
+            state.trial_in_flight = True
+            return True
+
+        state.short_circuited += 1
+        return False
+
+    def _hedge_delay(self, name: str) -> float:
+        """Seconds to wait for a backend before hedging, from its p95 latency."""
+        state = self._state(name)
+        min_delay = self.settings.provider_hedge_min_delay_ms / 1000
+        max_delay = self.settings.provider_hedge_max_delay_ms / 1000
+        if len(state.latencies) < self.settings.provider_hedge_min_samples:
+            return max_delay
+        return min(max(self._percentile_ms(state, 0.95) / 1000, min_delay), max_delay)
+
+    def _detach(self, tasks: set[asyncio.Task]) -> None:
+        """Let losing hedged calls finish in the background."""
+        for task in tasks:
+            self._background.add(task)
+            task.add_done_callback(self._discard_background)
+
+    def _discard_background(self, task: asyncio.Task) -> None:
+        """Drop a finished background call, marking its exception retrieved."""
+        self._background.discard(task)
+        if not task.cancelled():
+            task.exception()
+
+    def _state(self, name: str) -> _ProviderState:
+        """Get or create the state for a backend."""
+        state = self._providers.get(name)
+        if state is None:
+            window = self.settings.provider_stats_window
+            state = _ProviderState(latencies=deque(maxlen=window), outcomes=deque(maxlen=window))
+            self._providers[name] = state
+        return state
+
+    def _circuit(self, name: str) -> str:
+        """Circuit state as seen by a caller right now."""
+        state = self._providers[name]
+        if state.circuit == CIRCUIT_OPEN and self.is_available(name):
+            return CIRCUIT_HALF_OPEN
+        return state.circuit
+
+    @staticmethod
+    def _push(state: _ProviderState, latency_seconds: float, success: bool) -> None:
+        """Add an outcome to the rolling window; only successes count toward latency."""
+        state.outcomes.append(success)
+        if success:
+            state.latencies.append(latency_seconds)
+
+    @staticmethod
+    def _percentile_ms(state: _ProviderState, quantile: float) -> float:
+        """Latency percentile of recent successful calls, in milliseconds."""
+        if not state.latencies:
+            return 0.0
+        ordered = sorted(state.latencies)
+        index = min(len(ordered) - 1, int(quantile * len(ordered)))
+        return round(ordered[index] * 1000, 1)
+
+
+# Singleton instance
+provider_router = ProviderRouter()
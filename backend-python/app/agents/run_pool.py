@@ -0,0 +1,84 @@
+"""
+Agent Run Pool
+Concurrent run slots for one agent role, with runs on the same thread queued in order
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+# Run waits kept for the percentiles in get_stats
+WAIT_SAMPLE_SIZE = 500
+
+
+class AgentRunPool:
+    """
+    Limits an agent role to ``size`` concurrent runs.
+
+    An Azure thread allows one active run at a time, so a run on a thread
+    that is already busy waits for the previous one to finish before it
+    takes a slot, instead of failing. Runs on other threads go ahead.
+    """
+
+    def __init__(self, size: int):
+        self.size = max(1, size)
+        self._slots = asyncio.Semaphore(self.size)
+        self._thread_locks: dict[str, asyncio.Lock] = {}
+        self._thread_users: dict[str, int] = {}
+        self._active = 0
+        self._queued = 0
+        self._runs = 0
+        self._waits_ms: deque[float] = deque(maxlen=WAIT_SAMPLE_SIZE)
+        self._max_wait_ms = 0.0
+
+    @asynccontextmanager
+    async def run(self, thread_id: str) -> AsyncIterator[None]:
+        """Hold a run slot and the thread's run lock for the duration of a run."""
+        started = time.monotonic()
+        lock = self._thread_locks.setdefault(thread_id, asyncio.Lock())
+        self._thread_users[thread_id] = self._thread_users.get(thread_id, 0) + 1
+        self._queued += 1
+        waiting = True
+        try:
+            async with lock, self._slots:
+                self._queued -= 1
+                waiting = False
+                self._record_wait((time.monotonic() - started) * 1000)
+                self._active += 1
+                try:
+                    yield
+                finally:
+                    self._active -= 1
+        finally:
+            if waiting:
+                self._queued -= 1
+            self._thread_users[thread_id] -= 1
+            if not self._thread_users[thread_id]:
+                del self._thread_users[thread_id]
+                del self._thread_locks[thread_id]
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get pool depth, queue length and run wait times."""
+        ordered = sorted(self._waits_ms)
+        return {
+            "size": self.size,
+            "active": self._active,
+            "queued": self._queued,
+            "runs": self._runs,
+            "wait_ms": {
+                **{
+                    f"p{round(quantile * 100)}": (
+                        round(ordered[min(len(ordered) - 1, int(quantile * len(ordered)))], 1) if ordered else 0.0
+                    )
+                    for quantile in (0.5, 0.95, 0.99)
+                },
+                "max": round(self._max_wait_ms, 1),
+            },
+        }
+
+    def _record_wait(self, wait_ms: float) -> None:
+        self._runs += 1
+        self._waits_ms.append(wait_ms)
+        self._max_wait_ms = max(self._max_wait_ms, wait_ms)
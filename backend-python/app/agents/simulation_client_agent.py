@@ -3,13 +3,17 @@ Simulation Client Agent
 Simulates client personas in training conversations
 """
 
+import hashlib
 import json
 import logging
-from typing import Any
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator
 
 from azure.ai.agents.models import ToolDefinition, FunctionTool, FunctionToolDefinition, FunctionDefinition
 
 from app.agents.base_agent import BaseAgent
+from app.utils.context_window import context_window
+from app.utils.tokens import count_tokens
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +50,36 @@ def get_difficulty_guidelines(difficulty: str) -> str:
     return "Be friendly and cooperative, with a balanced approach."
 
 
+def conversation_digest(messages: list[dict[str, Any]]) -> str:
+    """Hash of a conversation's roles and contents."""
+    turns = [(msg.get("role"), (msg.get("content") or "").strip()) for msg in messages]
+    return hashlib.sha256(json.dumps(turns).encode()).hexdigest()
+
+
+@dataclass
+class _ThreadSync:
+    """How much of the conversation a client thread already holds, kept in the thread registry."""
+    synced: int
+    digest: str
+    tokens: int
+
+    def matches(self, conversation: list[dict[str, Any]]) -> bool:
+        """Whether the conversation extends what the thread holds."""
+        return len(conversation) > self.synced and conversation_digest(conversation[:self.synced]) == self.digest
+
+
+@dataclass
+class _ClientTurn:
+    """A client turn ready to send."""
+    session_id: str | None
+    thread_id: str
+    prompt: str
+    context: dict[str, Any]
+    conversation: list[dict[str, Any]]
+    tokens: int
+    ephemeral: bool = False
+
+
 class SimulationClientAgent(BaseAgent):
     """
     Agent that simulates client personas in training conversations.
@@ -58,9 +92,9 @@ class SimulationClientAgent(BaseAgent):
             instructions=SIMULATION_CLIENT_INSTRUCTIONS,
             model=None,  # Use default model from settings
         )
-        self._client_profile: dict[str, Any] = {}
-        self._personality_settings: dict[str, Any] = {}
-        self._simulation_settings: dict[str, Any] = {}
+        self._incremental_turns = 0
+        self._full_turns = 0
+        self._rebuilds = 0
 
     def get_tools(self) -> list[ToolDefinition]:
         """Get tool definitions for the simulation client agent."""
@@ -115,10 +149,10 @@ class SimulationClientAgent(BaseAgent):
 
     async def handle_tool_call(self, tool_name: str, arguments: dict[str, Any]) -> str:
         """Handle tool calls from the agent."""
-        context = getattr(self, "_current_context", {})
+        context = self.tool_context
 
         if tool_name == "get_client_profile":
-            profile = context.get("client_profile", self._client_profile)
+            profile = context.get("client_profile", {})
             return json.dumps({
                 "name": profile.get("name", "Unknown Client"),
                 "age": profile.get("age", "Unknown"),
@@ -131,8 +165,8 @@ class SimulationClientAgent(BaseAgent):
             })
 
         elif tool_name == "get_emotional_state":
-            personality = context.get("personality_settings", self._personality_settings)
-            simulation = context.get("simulation_settings", self._simulation_settings)
+            personality = context.get("personality_settings", {})
+            simulation = context.get("simulation_settings", {})
             return json.dumps({
                 "mood": personality.get("mood", "neutral"),
                 "archetype": personality.get("archetype", "Standard Client"),
@@ -173,21 +207,173 @@ class SimulationClientAgent(BaseAgent):
         Returns:
             Response dictionary with message and metadata
         """
+        turn = await self._prepare_turn(
+            messages,
+            client_profile,
+            personality_settings,
+            simulation_settings,
+            session_id,
+        )
+
+        # Send message and get response
+        response_text = None
+        try:
+            response_text = await self.send_message(turn.thread_id, turn.prompt, turn.context)
+        finally:
+            await self._end_turn(turn, response_text)
+
+        return {
+            "message": response_text,
+            "source": "azure-agent",
+            "agent_id": self.agent_id,
+        }
+
+    async def generate_response_stream(
+        self,
+        messages: list[dict[str, Any]],
+        client_profile: dict[str, Any],
+        personality_settings: dict[str, Any] | None = None,
+        simulation_settings: dict[str, Any] | None = None,
+        session_id: str | None = None,
+    ) -> AsyncIterator[str]:
+        """
+        Generate a client response, yielding text chunks as the agent produces them.
+
+        Args:
+            messages: Conversation history
+            client_profile: Client profile data
+            personality_settings: Optional personality settings
+            simulation_settings: Optional simulation settings
+            session_id: Optional session ID for thread management
+
+        Yields:
+            Response text chunks
+        """
+        turn = await self._prepare_turn(
+            messages,
+            client_profile,
+            personality_settings,
+            simulation_settings,
+            session_id,
+        )
+
+        chunks: list[str] = []
+        completed = False
+        try:
+            async for chunk in self.send_message_streaming(turn.thread_id, turn.prompt, turn.context):
+                chunks.append(chunk)
+                yield chunk
+            completed = True
+        finally:
+            await self._end_turn(turn, "".join(chunks) if completed else None)
+
+    def get_thread_stats(self) -> dict[str, Any]:
+        """Get thread registry statistics and how client turns were sent."""
+        return {
+            **super().get_thread_stats(),
+            "incremental_turns": self._incremental_turns,
+            "full_turns": self._full_turns,
+            "rebuilds": self._rebuilds,
+        }
+
+    async def _prepare_turn(
+        self,
+        messages: list[dict[str, Any]],
+        client_profile: dict[str, Any],
+        personality_settings: dict[str, Any] | None,
+        simulation_settings: dict[str, Any] | None,
+        session_id: str | None,
+    ) -> _ClientTurn:
+        """
+        Resolve the thread, prompt and tool context for a client turn.
+
+        A session's thread holds the conversation so far, so only the turns
+        added since the last reply are sent. The profile context and the
+        conversation are sent in full when the thread is new, when it no
+        longer matches the conversation or would grow past
+        ``context_token_budget`` (it is then rebuilt, with older turns
+        summarized), and on a throwaway thread when there is no session or
+        the session's thread is busy with another turn.
+        """
         if not self.is_initialized:
             raise RuntimeError("SimulationClientAgent not initialized")
 
-        # Store context for tool calls
-        self._client_profile = client_profile
-        self._personality_settings = personality_settings or {}
-        self._simulation_settings = simulation_settings or {}
-
-        # Build context for tools
+        # Build context for tools, passed along with this run only
         context = {
             "client_profile": client_profile,
             "personality_settings": personality_settings or {},
             "simulation_settings": simulation_settings or {},
         }
+        conversation = [msg for msg in messages if msg.get("role") in ("user", "assistant")]
+
+        thread_id = await self._threads.get(session_id) if session_id else None
+        held, state = bool(session_id), None
+        if thread_id:
+            held, state = await self._threads.begin_turn(session_id, thread_id)
+        if held:
+            sync = _ThreadSync(**state) if state else None
+            if sync and sync.matches(conversation):
+                new_turns = self._format_conversation(conversation[sync.synced:])
+                prompt = f"{new_turns}\n\nRespond as the client:"
+                tokens = sync.tokens + count_tokens(prompt)
+                if tokens <= self.settings.context_token_budget:
+                    self._incremental_turns += 1
+                    return _ClientTurn(session_id, thread_id, prompt, context, conversation, tokens)
+
+            if thread_id:
+                # The thread doesn't hold this conversation (an edited or
+                # fallback-answered turn, an interrupted run, or a restart),
+                # or holds too much of it to stay within the token budget
+                logger.info(f"[{self.name}] Rebuilding thread for session {session_id}")
+                self._rebuilds += 1
+                await self.release_thread(session_id)
+
+            thread_id = await self.create_thread(session_id)
+            # Another request may have registered and taken the session's thread first
+            held, _ = await self._threads.begin_turn(session_id, thread_id)
+
+        ephemeral = not held
+        if ephemeral:
+            thread_id = await self.create_thread()
+
+        self._full_turns += 1
+        prompt = await self._full_prompt(
+            messages,
+            client_profile,
+            personality_settings,
+            simulation_settings,
+            session_id,
+        )
+        return _ClientTurn(
+            session_id, thread_id, prompt, context, conversation, count_tokens(prompt), ephemeral=ephemeral
+        )
 
+    async def _end_turn(self, turn: _ClientTurn, reply: str | None) -> None:
+        """Record what the thread now holds, or delete a throwaway thread."""
+        if turn.ephemeral:
+            await self.delete_remote_thread(turn.thread_id)
+            return
+
+        # Unknown state after a failed or cancelled run: rebuild next turn
+        state = None
+        if reply is not None:
+            held = turn.conversation + [{"role": "assistant", "content": reply}]
+            state = asdict(_ThreadSync(
+                synced=len(held),
+                digest=conversation_digest(held),
+                tokens=turn.tokens + count_tokens(reply),
+            ))
+        await self._threads.end_turn(turn.session_id, turn.thread_id, state)
+
+    async def _full_prompt(
+        self,
+        messages: list[dict[str, Any]],
+        client_profile: dict[str, Any],
+        personality_settings: dict[str, Any] | None,
+        simulation_settings: dict[str, Any] | None,
+        session_id: str | None,
+    ) -> str:
+        """Build a prompt with the profile context and the conversation so far."""
         # Build enhanced prompt with profile context
         profile_context = self._build_profile_context(
             client_profile,
@@ -195,21 +381,16 @@ class SimulationClientAgent(BaseAgent):
             simulation_settings or {},
         )
 
-        # Get or create thread
-        thread_id = await self.get_or_create_thread(session_id or "default")
-
-        # Format conversation for agent
-        conversation_text = self._format_conversation(messages)
-        prompt = f"{profile_context}\n\nConversation so far:\n{conversation_text}\n\nRespond as the client:"
-
-        # Send message and get response
-        response_text = await self.send_message(thread_id, prompt, context)
-
-        return {
-            "message": response_text,
-            "source": "azure-agent",
-            "agent_id": self.agent_id,
-        }
+        # Format conversation for agent, collapsing older turns beyond the token budget
+        window = context_window.fit(
+            messages,
+            reserved_tokens=count_tokens(profile_context),
+            session_key=f"client:{session_id}" if session_id else None,
+        )
+        conversation_text = self._format_conversation(window.messages)
+        if window.summary:
+            conversation_text = f"(Summary of earlier turns)\n{window.summary}\n\n(Most recent turns)\n{conversation_text}"
+        return f"{profile_context}\n\nConversation so far:\n{conversation_text}\n\nRespond as the client:"
 
     def _build_profile_context(
         self,
@@ -0,0 +1,210 @@
+"""
+Thread Registry
+Bounded map of sessions to an agent's threads, persisted so every worker shares it
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable
+
+from app.config import get_settings
+from app.database import DatabasePool
+
+logger = logging.getLogger(__name__)
+
+# Marking a thread as used in the database is skipped if it was marked this recently
+TOUCH_INTERVAL_SECONDS = 60
+
+
+@dataclass
+class _Entry:
+    thread_id: str
+    last_used: float
+    touched: float
+    state: dict[str, Any] | None = None
+    busy: bool = False
+
+
+class ThreadRegistry:
+    """
+    Session to thread map for one agent.
+
+    At most ``agent_thread_cache_size`` sessions are kept in memory, evicting
+    the least recently used, and entries idle for ``agent_thread_ttl_seconds``
+    are dropped. Every thread is also recorded in the ``agent_threads`` table
+    when the database is available, so a session finds its thread again after
+    eviction, a restart, or on another worker.
+
+    A turn holds its session's thread from ``begin_turn`` to ``end_turn``,
+    which also record what the thread holds. With the database these live
+    in the thread's row, so any worker can continue a thread where another
+    left off; a hold lapses after ``agent_thread_turn_lease_seconds`` in case
+    its worker died mid-turn.
+    """
+
+    def __init__(self, agent_name: str):
+        self.agent_name = agent_name
+        self.settings = get_settings()
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._memory_hits = 0
+        self._database_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    async def get(self, session_id: str) -> str | None:
+        """
+        Get the thread ID registered for a session.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            Thread ID, or None if the session has no thread yet
+        """
+        now = time.monotonic()
+        entry = self._entries.get(session_id)
+        if entry and now - entry.last_used > self.settings.agent_thread_ttl_seconds:
+            del self._entries[session_id]
+            entry = None
+
+        if entry:
+            self._entries.move_to_end(session_id)
+            entry.last_used = now
+            if now - entry.touched >= TOUCH_INTERVAL_SECONDS:
+                entry.touched = now
+                await self._persist(self._repository().touch, session_id, self.agent_name)
+            self._memory_hits += 1
+            return entry.thread_id
+
+        thread_id = await self._persist(self._repository().get, session_id, self.agent_name)
+        if not thread_id:
+            self._misses += 1
+            return None
+
+        await self._persist(self._repository().touch, session_id, self.agent_name)
+        self._remember(session_id, thread_id)
+        self._database_hits += 1
+        return thread_id
+
+    async def put(self, session_id: str, thread_id: str) -> str:
+        """
+        Register a new thread for a session.
+
+        If another request or worker registered a thread for the session
+        first, that one is kept and the caller should delete its own.
+
+        Returns:
+            The thread ID registered for the session
+        """
+        registered = await self._persist(self._repository().claim, session_id, self.agent_name, thread_id)
+        if not registered:
+            # No database: the memory entry is the only record
+            entry = self._entries.get(session_id)
+            registered = entry.thread_id if entry else thread_id
+
+        self._remember(session_id, registered)
+        return registered
+
+    async def remove(self, session_id: str) -> str | None:
+        """
+        Unregister a session's thread.
+
+        Returns:
+            The thread ID that was registered, if any
+        """
+        entry = self._entries.pop(session_id, None)
+        thread_id = await self._persist(self._repository().delete, session_id, self.agent_name)
+        return thread_id or (entry.thread_id if entry else None)
+
+    async def begin_turn(self, session_id: str, thread_id: str) -> tuple[bool, dict[str, Any] | None]:
+        """
+        Hold a session's thread for one turn.
+
+        Args:
+            session_id: Session identifier
+            thread_id: Thread registered for the session
+
+        Returns:
+            Whether the thread is now held, which fails if another turn has
+            it, and the state the previous turn left (None if unknown)
+        """
+        if DatabasePool.is_initialized():
+            cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.settings.agent_thread_turn_lease_seconds)
+            row = await self._persist(self._repository().begin_turn, session_id, self.agent_name, thread_id, cutoff)
+            if not row:
+                return False, None
+            return True, row["sync_state"]
+
+        # No database: this worker is the only one using the thread
+        entry = self._entries.get(session_id)
+        if not entry or entry.thread_id != thread_id:
+            self._remember(session_id, thread_id)
+            entry = self._entries[session_id]
+        if entry.busy:
+            return False, None
+        entry.busy = True
+        return True, entry.state
+
+    async def end_turn(self, session_id: str, thread_id: str, state: dict[str, Any] | None) -> None:
+        """
+        Release a session's thread after a turn.
+
+        Args:
+            session_id: Session identifier
+            thread_id: Thread the turn held
+            state: What the thread now holds, or None if unknown
+        """
+        if DatabasePool.is_initialized():
+            await self._persist(self._repository().end_turn, session_id, self.agent_name, thread_id, state)
+            return
+
+        entry = self._entries.get(session_id)
+        if entry and entry.thread_id == thread_id:
+            entry.busy = False
+            entry.state = state
+
+    def forget(self, session_id: str) -> None:
+        """Drop a session from memory only, after its row was removed elsewhere."""
+        self._entries.pop(session_id, None)
+
+    def clear(self) -> None:
+        """Drop every session from memory."""
+        self._entries.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get registry size and lookup counts."""
+        return {
+            "cached": len(self._entries),
+            "capacity": self.settings.agent_thread_cache_size,
+            "memory_hits": self._memory_hits,
+            "database_hits": self._database_hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+        }
+
+    def _remember(self, session_id: str, thread_id: str) -> None:
+        now = time.monotonic()
+        self._entries[session_id] = _Entry(thread_id=thread_id, last_used=now, touched=now)
+        self._entries.move_to_end(session_id)
+        while len(self._entries) > self.settings.agent_thread_cache_size:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    @staticmethod
+    def _repository():
+        from app.repositories.agent_thread_repository import agent_thread_repository
+
+        return agent_thread_repository
+
+    async def _persist(self, operation: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        """Run a repository operation if the database is up, logging failures."""
+        if not DatabasePool.is_initialized():
+            return None
+        try:
+            return await operation(*args)
+        except Exception as e:
+            logger.warning(f"[{self.agent_name}] Thread registry database error: {e}")
+            return None
@@ -30,6 +30,7 @@ class Settings(BaseSettings):
 
     # OpenAI
     openai_api_key: str = Field(default="", description="OpenAI API key")
+    openai_base_url: str = Field(default="https://api.openai.com/v1", description="OpenAI API base URL")
     openai_default_model: str = Field(default="gpt-4", description="Default OpenAI model")
     openai_default_temperature: float = Field(default=0.7, description="Default temperature")
     openai_max_tokens: int = Field(default=500, description="Max tokens for completion")
@@ -40,6 +41,16 @@ class Settings(BaseSettings):
     azure_ai_model_deployment_name: str = Field(default="gpt-4o", description="Azure model deployment name")
     azure_ai_agent_name_prefix: str = Field(default="rplaypyth-", description="Agent name prefix")
     azure_ai_api_key: str = Field(default="", description="Azure AI API key (not currently supported)")
+    azure_ai_run_streaming_enabled: bool = Field(default=True, description="Wait for agent runs on the streaming API instead of polling")
+    azure_ai_run_poll_initial_ms: int = Field(default=50, description="First poll delay when waiting for an agent run without streaming")
+    azure_ai_run_poll_max_ms: int = Field(default=1000, description="Longest poll delay when waiting for an agent run without streaming")
+    azure_ai_agent_init_timeout_seconds: float = Field(default=15.0, description="Startup waits this long for agents; the rest finish initializing in the background")
+    azure_ai_tool_timeout_seconds: float = Field(default=10.0, description="Longest an agent tool call may take before an error is returned to the run")
+    azure_ai_agent_pool_size: int = Field(default=8, description="Concurrent runs per agent role; further runs queue")
+    agent_thread_cache_size: int = Field(default=1000, description="Sessions per agent whose thread ID is kept in memory")
+    agent_thread_ttl_seconds: int = Field(default=21600, description="Idle time after which a session's agent threads are deleted")
+    agent_thread_sweep_interval_seconds: int = Field(default=600, description="How often expired agent threads are swept")
+    agent_thread_turn_lease_seconds: int = Field(default=300, description="A turn's hold on its session's thread lapses after this long, in case its worker died")
 
     # Azure Service Principal (optional)
     azure_client_id: str = Field(default="", description="Azure client ID")
@@ -72,8 +83,105 @@ class Settings(BaseSettings):
 
     # Simulation defaults
     default_difficulty_level: int = Field(default=3, description="Default difficulty level")
-    max_conversation_length: int = Field(default=50, description="Max conversation messages")
+    max_conversation_length: int = Field(default=50, description="Max conversation messages sent verbatim per prompt")
     session_timeout_minutes: int = Field(default=60, description="Session timeout in minutes")
+    objective_result_ttl_seconds: int = Field(default=900, description="How long objective progress results are kept")
+    objective_full_evaluation_interval: int = Field(
+        default=8, description="Re-evaluate objectives from the full conversation every N evaluations (0 disables incremental)"
+    )
+
+    # Client profile warm pool
+    profile_pool_enabled: bool = Field(default=False, description="Keep a pool of pre-generated client profiles (spends LLM calls in the background)")
+    profile_pool_industries: list[str] = Field(
+        default=["wealth-management", "banking", "insurance", "financial-planning"],
+        description="Industries to keep pooled profiles for",
+    )
+    profile_pool_difficulties: list[str] = Field(
+        default=["beginner", "intermediate", "advanced"],
+        description="Difficulties to keep pooled profiles for",
+    )
+    profile_pool_target_size: int = Field(default=5, description="Pooled profiles to keep per industry and difficulty")
+    profile_pool_batch_size: int = Field(default=3, description="Profiles generated concurrently per refill batch")
+    profile_pool_refill_interval_seconds: int = Field(default=60, description="Seconds between pool refill checks")
+    profile_pool_backoff_seconds: float = Field(default=60.0, description="Pause before refilling a bucket whose last batch yielded no valid profile, doubled per consecutive failure")
+    profile_pool_backoff_max_seconds: float = Field(default=3600.0, description="Longest pause before refilling a failing bucket")
+
+    # Provider routing
+    provider_stats_window: int = Field(default=100, description="Recent calls per AI backend used for latency and error rates")
+    provider_circuit_failure_threshold: int = Field(default=5, description="Consecutive failures that open a backend's circuit")
+    provider_circuit_reset_seconds: int = Field(default=30, description="Seconds an open circuit waits before a trial call")
+    provider_hedging_enabled: bool = Field(default=True, description="Hedge latency-critical calls with the fallback backend")
+    provider_hedge_min_samples: int = Field(default=10, description="Successful calls needed before hedging uses the p95 latency")
+    provider_hedge_min_delay_ms: int = Field(default=500, description="Shortest wait before sending a hedged request")
+    provider_hedge_max_delay_ms: int = Field(default=15000, description="Longest wait before sending a hedged request")
+
+    # LLM scheduling
+    llm_max_concurrency: int = Field(default=16, description="LLM calls allowed in flight at once")
+    llm_max_queue_depth: int = Field(default=100, description="Queued LLM calls before new ones are shed with a 503")
+    llm_requests_per_minute: int = Field(default=500, description="Request rate limit per API key and model")
+    llm_tokens_per_minute: int = Field(default=200000, description="Token rate limit per API key and model")
+    llm_max_retries: int = Field(default=3, description="Retries for LLM calls failing with 429 or 5xx")
+    llm_retry_base_delay_ms: int = Field(default=500, description="Base backoff before retrying an LLM call")
+    llm_retry_max_delay_ms: int = Field(default=8000, description="Longest backoff before retrying an LLM call")
+
+    # LLM metrics
+    llm_metrics_window: int = Field(default=500, description="Recent calls per endpoint and model used for latency percentiles")
+    llm_metrics_persist_enabled: bool = Field(default=False, description="Write every LLM call record to the llm_call_metrics table")
+    llm_metrics_flush_interval_seconds: int = Field(default=10, description="Seconds between batched writes of LLM call records")
+
+    # Agent run timings
+    agent_run_trace_sample_rate: float = Field(default=0.05, description="Fraction of agent runs whose full timeline is logged and kept for /api/agents/timings")
+    agent_run_trace_buffer: int = Field(default=200, description="Sampled agent run timelines kept in memory")
+
+    # Parameter catalog
+    parameter_cache_ttl_seconds: int = Field(default=300, description="Max age of cached parameter snapshots")
+
+    # Context window
+    context_token_budget: int = Field(default=6000, description="Prompt token budget for the system prompt and conversation history")
+    context_summary_max_tokens: int = Field(default=500, description="Token cap for the summary of older turns")
+    context_min_recent_messages: int = Field(default=6, description="Recent messages always kept verbatim")
+    context_summary_cache_size: int = Field(default=1000, description="Conversations with a cached rolling summary")
+
+    # Response cache
+    response_cache_enabled: bool = Field(default=True, description="Cache responses of deterministic AI calls")
+    response_cache_ttl_seconds: int = Field(default=3600, description="Default response cache entry lifetime")
+    response_cache_max_entries: int = Field(default=1000, description="In-memory response cache size")
+    response_cache_dir: str = Field(default="", description="Directory for the on-disk response cache tier (disabled if empty)")
+    response_cache_disk_max_entries: int = Field(default=10000, description="On-disk response cache size")
+
+    # TTS audio cache
+    tts_cache_enabled: bool = Field(default=True, description="Cache generated speech audio by text, voice, speed, model and format")
+    tts_cache_memory_max_bytes: int = Field(default=64 * 1024 * 1024, description="In-memory TTS audio cache size in bytes")
+    tts_cache_dir: str = Field(default="", description="Directory for the on-disk TTS audio cache tier (disabled if empty)")
+    tts_cache_disk_max_bytes: int = Field(default=1024 * 1024 * 1024, description="On-disk TTS audio cache size in bytes")
+
+    # TTS streaming
+    tts_binary_audio_enabled: bool = Field(default=True, description="Send audio chunks as binary frames to clients that ask for them instead of base64 JSON")
+    tts_flow_control_enabled: bool = Field(default=True, description="Pace audio by the credits of clients that acknowledge chunks")
+    tts_stream_initial_credits: int = Field(default=8, description="Unacknowledged audio chunks allowed until the client grants a window")
+    tts_stream_max_credits: int = Field(default=32, description="Largest window of unacknowledged audio chunks a client can grant")
+    tts_stream_max_buffered_bytes: int = Field(default=256 * 1024, description="Unacknowledged audio bytes held back per connection")
+    tts_stream_min_chunk_bytes: int = Field(default=8192, description="Smallest audio chunk for slow clients")
+    tts_stream_max_chunk_bytes: int = Field(default=65536, description="Largest audio chunk for fast clients")
+    tts_stream_target_chunk_ms: float = Field(default=250.0, description="Delivery time each audio chunk is sized for at the measured client throughput")
+    tts_stream_ack_timeout_seconds: float = Field(default=10.0, description="Seconds without an acknowledgement before a stalled stream is aborted")
+    tts_stream_legacy_chunk_delay_ms: float = Field(default=5.0, description="Fixed delay between audio chunks for clients without flow control")
+
+    # Event loop monitor
+    event_loop_monitor_enabled: bool = Field(default=True, description="Sample event loop lag in the background")
+    event_loop_monitor_interval_ms: int = Field(default=100, description="Milliseconds between event loop lag samples")
+    event_loop_monitor_window: int = Field(default=600, description="Recent lag samples used for percentiles")
+    event_loop_monitor_warn_ms: int = Field(default=500, description="Lag that is logged as a blocked event loop")
+
+    # Fake LLM backend (load testing)
+    fake_agents_enabled: bool = Field(default=False, description="Use the in-process fake AgentsClient instead of Azure AI")
+    fake_llm_seed: int = Field(default=0, description="Seed for fake responses, latencies and failures")
+    fake_llm_latency_median_ms: float = Field(default=600.0, description="Median fake time to first token")
+    fake_llm_latency_p95_ms: float = Field(default=2000.0, description="95th percentile fake time to first token")
+    fake_llm_tokens_per_second: float = Field(default=60.0, description="Fake output speed after the first token")
+    fake_llm_error_rate: float = Field(default=0.0, description="Share of fake calls failing with a server error")
+    fake_llm_rate_limit_rate: float = Field(default=0.0, description="Share of fake calls failing with a 429")
+    fake_llm_tool_call_rate: float = Field(default=0.5, description="Share of fake calls with optional tools that call one")
 
 
 @lru_cache
@@ -98,7 +206,7 @@ def validate_config() -> dict[str, list[str]]:
 
     # Check if at least one AI provider is configured
     has_openai = bool(settings.openai_api_key)
-    has_azure = bool(settings.azure_ai_project_endpoint)
+    has_azure = bool(settings.azure_ai_project_endpoint) or settings.fake_agents_enabled
 
     if not has_openai and not has_azure:
         errors.append("At least one AI provider is required: OPENAI_API_KEY or AZURE_AI_PROJECT_ENDPOINT")
@@ -118,7 +226,8 @@ def validate_config() -> dict[str, list[str]]:
 
 def is_azure_configured() -> bool:
     """Check if Azure AI Agents is configured."""
-    return bool(get_settings().azure_ai_project_endpoint)
+    settings = get_settings()
+    return bool(settings.azure_ai_project_endpoint) or settings.fake_agents_enabled
 
 
 def is_openai_configured() -> bool:
@@ -126,6 +235,11 @@ def is_openai_configured() -> bool:
     return bool(get_settings().openai_api_key)
 
 
+def get_openai_url(path: str) -> str:
+    """Build an OpenAI API URL from the configured base URL."""
+    return f"{get_settings().openai_base_url.rstrip('/')}/{path.lstrip('/')}"
+
+
 def get_environment() -> str:
     """Get environment name."""
     return get_settings().environment
@@ -3,9 +3,10 @@ Database Connection Manager
 Handles PostgreSQL connection using asyncpg with connection pooling
 """
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
-from typing import Any, AsyncGenerator
+from typing import Any, AsyncGenerator, Callable
 
 import asyncpg
 
@@ -19,6 +20,9 @@ class DatabasePool:
 
     _pool: asyncpg.Pool | None = None
     _initialized: bool = False
+    _listen_conn: asyncpg.Connection | None = None
+    _listeners: dict[str, list[Callable[[str], Any]]] = {}
+    _reconnect_task: asyncio.Task | None = None
 
     @classmethod
     async def initialize(cls) -> None:
@@ -49,12 +53,91 @@ class DatabasePool:
     @classmethod
     async def close(cls) -> None:
         """Close the connection pool."""
+        if cls._reconnect_task:
+            cls._reconnect_task.cancel()
+            cls._reconnect_task = None
+        if cls._listen_conn:
+            conn, cls._listen_conn = cls._listen_conn, None
+            await conn.close()
+        cls._listeners = {}
+
         if cls._pool:
             await cls._pool.close()
             cls._pool = None
             cls._initialized = False
             logger.info("Database connection pool closed")
 
+    @classmethod
+    def is_initialized(cls) -> bool:
+        """Check if the connection pool is ready."""
+        return cls._initialized
+
+    @classmethod
+    async def listen(cls, channel: str, callback: Callable[[str], Any]) -> None:
+        """
+        Subscribe to a Postgres NOTIFY channel.
+
+        Notifications arrive on one dedicated connection outside the pool. If
+        that connection drops it is re-established and every callback is called
+        with an empty payload, since notifications sent meanwhile were lost.
+
+        Args:
+            channel: Channel name
+            callback: Called with the notification payload; may be a coroutine function
+        """
+        cls._listeners.setdefault(channel, []).append(callback)
+        if cls._listen_conn:
+            await cls._listen_conn.add_listener(channel, cls._dispatch)
+        else:
+            await cls._connect_listener()
+
+    @classmethod
+    async def _connect_listener(cls) -> None:
+        """Open the listener connection and subscribe to every channel."""
+        conn = await asyncpg.connect(dsn=get_settings().database_url, statement_cache_size=0)
+        for channel in cls._listeners:
+            await conn.add_listener(channel, cls._dispatch)
+        conn.add_termination_listener(cls._on_listener_terminated)
+        cls._listen_conn = conn
+        logger.info(f"Listening for notifications on: {', '.join(cls._listeners)}")
+
+    @classmethod
+    def _dispatch(cls, conn: asyncpg.Connection, pid: int, channel: str, payload: str) -> None:
+        """Forward a notification to the channel's callbacks."""
+        for callback in cls._listeners.get(channel, []):
+            try:
+                result = callback(payload)
+                if asyncio.iscoroutine(result):
+                    asyncio.create_task(result)
+            except Exception as e:
+                logger.error(f"Notification callback for {channel} failed: {e}")
+
+    @classmethod
+    def _on_listener_terminated(cls, conn: asyncpg.Connection) -> None:
+        """Reconnect after the listener connection is lost."""
+        if cls._listen_conn is not conn:
+            return
+        cls._listen_conn = None
+        logger.warning("Notification listener connection lost, reconnecting")
+        cls._reconnect_task = asyncio.create_task(cls._reconnect_listener())
+
+    @classmethod
+    async def _reconnect_listener(cls) -> None:
+        """Retry the listener connection with backoff, then flag missed notifications."""
+        delay = 1.0
+        while cls._listeners:
+            try:
+                await cls._connect_listener()
+                break
+            except Exception as e:
+                logger.warning(f"Notification listener reconnect failed, retrying in {delay:.0f}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+
+        for channel in list(cls._listeners):
+            cls._dispatch(cls._listen_conn, 0, channel, "")
+        cls._reconnect_task = None
+
     @classmethod
     def get_pool(cls) -> asyncpg.Pool:
         """Get the connection pool."""
@@ -101,6 +184,11 @@ async def fetchval(query: str, *args: Any) -> Any:
         return await conn.fetchval(query, *args)
 
 
+async def notify(channel: str, payload: str = "") -> None:
+    """Send a Postgres notification to every listening process."""
+    await execute("SELECT pg_notify($1, $2)", channel, payload)
+
+
 def record_to_dict(record: asyncpg.Record | None) -> dict[str, Any] | None:
     """Convert asyncpg Record to dictionary, converting UUID types to strings."""
     if record is None:
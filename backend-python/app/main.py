@@ -15,6 +15,12 @@ from app.config import get_settings
 from app.database import DatabasePool, fetch
 from app.middleware.error_handler import setup_exception_handlers
 from app.services.websocket_tts_service import init_tts_service, get_tts_service, get_socket_app
+from app.services.response_cache import response_cache
+from app.services.profile_pool_service import profile_pool_service
+from app.services.parameter_service import parameter_service
+from app.utils.event_loop_monitor import event_loop_monitor
+from app.utils.llm_metrics import llm_metrics
+from app.utils.llm_scheduler import llm_scheduler
 
 # Import routers
 from app.routers import (
@@ -64,6 +70,9 @@ async def lifespan(app: FastAPI):
     logger.info("Starting backend server...")
     logger.info(f"Environment: {settings.environment}")
 
+    # Watch for work that blocks the event loop
+    event_loop_monitor.start()
+
     # Initialize database connection pool
     try:
         await DatabasePool.initialize()
@@ -98,12 +107,32 @@ async def lifespan(app: FastAPI):
         logger.info("✓ AI Backend: OpenAI (fallback due to error)")
 
     logger.info("WebSocket TTS service initialized")
+
+    # Keep pre-generated client profiles ready for new simulations
+    if DatabasePool.is_initialized():
+        profile_pool_service.start()
+
+        # Drop cached parameter snapshots when another worker changes parameters
+        try:
+            await parameter_service.start_change_listener()
+        except Exception as e:
+            logger.error(f"Parameter change listener failed to start: {e}")
+
+        # Persist per-call LLM metrics for cost dashboards, if enabled
+        llm_metrics.start()
+
+        # Delete agent threads of sessions that were abandoned
+        agent_manager.start_thread_sweeper()
     logger.info("=" * 50)
 
     yield
 
     # Shutdown
     logger.info("Shutting down...")
+    await profile_pool_service.stop()
+    await llm_metrics.stop()
+    await agent_manager.stop_thread_sweeper()
+    await event_loop_monitor.stop()
     await DatabasePool.close()
 
     # Cleanup Azure AI Agents
@@ -197,6 +226,41 @@ async def get_tts_stats() -> dict[str, Any]:
     return {"activeConnections": 0, "connections": []}
 
 
+# Response cache stats endpoint
+@fastapi_app.get("/api/cache/stats")
+async def get_cache_stats() -> dict[str, Any]:
+    """Get response cache hit-rate metrics."""
+    return response_cache.get_stats()
+
+
+# Profile pool stats endpoint
+@fastapi_app.get("/api/profile-pool/stats")
+async def get_profile_pool_stats() -> dict[str, Any]:
+    """Get client profile warm pool statistics."""
+    return profile_pool_service.get_stats()
+
+
+# LLM scheduler stats endpoint
+@fastapi_app.get("/api/llm-scheduler/stats")
+async def get_llm_scheduler_stats() -> dict[str, Any]:
+    """Get LLM queue depth, admissions and load shedding counts."""
+    return llm_scheduler.get_stats()
+
+
+# LLM metrics endpoint
+@fastapi_app.get("/api/llm-metrics")
+async def get_llm_metrics() -> dict[str, Any]:
+    """Get LLM call counts, token usage and latency per endpoint and model."""
+    return llm_metrics.get_stats()
+
+
+# Event loop lag endpoint
+@fastapi_app.get("/api/event-loop/stats")
+async def get_event_loop_stats() -> dict[str, Any]:
+    """Get event loop lag percentiles and histogram."""
+    return event_loop_monitor.get_stats()
+
+
 # API info endpoint
 @fastapi_app.get("/api")
 async def api_info() -> dict[str, Any]:
@@ -218,6 +282,12 @@ async def api_info() -> dict[str, Any]:
             "chat": "/api/chat/*",
             "industrySettings": "/api/industry-settings/*",
             "tts": "/api/tts/stats",
+            "cache": "/api/cache/stats",
+            "profilePool": "/api/profile-pool/stats",
+            "llmScheduler": "/api/llm-scheduler/stats",
+            "llmMetrics": "/api/llm-metrics",
+            "eventLoop": "/api/event-loop/stats",
+            "agentTimings": "/api/agents/timings",
         },
     }
 
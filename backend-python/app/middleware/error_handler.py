@@ -42,6 +42,7 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException)
                 "message": str(exc.detail),
             },
         },
+        headers=getattr(exc, "headers", None),
     )
 
 
@@ -14,6 +14,9 @@ from app.repositories.engagement_repository import engagement_repository
 from app.repositories.file_competency_repository import file_competency_repository
 from app.repositories.file_industry_repository import file_industry_repository
 from app.repositories.file_rubric_repository import file_rubric_repository
+from app.repositories.profile_pool_repository import profile_pool_repository
+from app.repositories.llm_metrics_repository import llm_metrics_repository
+from app.repositories.agent_thread_repository import agent_thread_repository
 
 __all__ = [
     "user_repository",
@@ -27,4 +30,7 @@ __all__ = [
     "file_competency_repository",
     "file_industry_repository",
     "file_rubric_repository",
+    "profile_pool_repository",
+    "llm_metrics_repository",
+    "agent_thread_repository",
 ]
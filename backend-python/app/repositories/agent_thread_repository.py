@@ -0,0 +1,172 @@
+"""
+Agent Thread Repository
+Database operations for the Azure AI agent threads of each simulation
+"""
+
+import json
+import logging
+from datetime import datetime
+from typing import Any
+
+from app.database import execute, fetch, fetchone
+
+logger = logging.getLogger(__name__)
+
+
+class AgentThreadRepository:
+    """Repository for agent threads."""
+
+    async def get(self, session_id: str, agent_name: str) -> str | None:
+        """Get the thread ID an agent uses for a session."""
+        try:
+            query = """
+                SELECT thread_id FROM agent_threads
+                WHERE session_id = $1 AND agent_name = $2
+            """
+            record = await fetchone(query, session_id, agent_name)
+            return record["thread_id"] if record else None
+        except Exception as e:
+            logger.error(f"Error getting agent thread: {e}")
+            raise
+
+    async def claim(self, session_id: str, agent_name: str, thread_id: str) -> str:
+        """
+        Register a thread for a session, unless another worker already has.
+
+        Returns:
+            The thread ID registered for the session, which is the existing
+            one if another worker got there first
+        """
+        try:
+            query = """
+                INSERT INTO agent_threads (session_id, agent_name, thread_id)
+                VALUES ($1, $2, $3)
+                ON CONFLICT (session_id, agent_name)
+                DO UPDATE SET last_used_at = CURRENT_TIMESTAMP
+                RETURNING thread_id
+            """
+            record = await fetchone(query, session_id, agent_name, thread_id)
+            return record["thread_id"]
+        except Exception as e:
+            logger.error(f"Error claiming agent thread: {e}")
+            raise
+
+    async def touch(self, session_id: str, agent_name: str) -> None:
+        """Mark a session's thread as used now."""
+        try:
+            query = """
+                UPDATE agent_threads SET last_used_at = CURRENT_TIMESTAMP
+                WHERE session_id = $1 AND agent_name = $2
+            """
+            await execute(query, session_id, agent_name)
+        except Exception as e:
+            logger.error(f"Error touching agent thread: {e}")
+            raise
+
+    async def begin_turn(
+        self,
+        session_id: str,
+        agent_name: str,
+        thread_id: str,
+        lease_cutoff: datetime,
+    ) -> dict[str, Any] | None:
+        """
+        Hold a session's thread for one turn, unless a turn that started
+        after ``lease_cutoff`` still holds it.
+
+        Returns:
+            The thread's row with the sync state left by the previous turn,
+            or None if the thread is busy or no longer registered
+        """
+        try:
+            query = """
+                UPDATE agent_threads
+                SET claimed_at = CURRENT_TIMESTAMP, last_used_at = CURRENT_TIMESTAMP
+                WHERE session_id = $1 AND agent_name = $2 AND thread_id = $3
+                  AND (claimed_at IS NULL OR claimed_at < $4)
+                RETURNING thread_id, sync_state
+            """
+            record = await fetchone(query, session_id, agent_name, thread_id, lease_cutoff)
+            if not record:
+                return None
+            data = dict(record)
+            if data["sync_state"]:
+                data["sync_state"] = json.loads(data["sync_state"])
+            return data
+        except Exception as e:
+            logger.error(f"Error beginning agent thread turn: {e}")
+            raise
+
+    async def end_turn(
+        self,
+        session_id: str,
+        agent_name: str,
+        thread_id: str,
+        sync_state: dict[str, Any] | None,
+    ) -> None:
+        """Release a session's thread after a turn, recording what it now holds."""
+        try:
+            query = """
+                UPDATE agent_threads
+                SET sync_state = $4, claimed_at = NULL, last_used_at = CURRENT_TIMESTAMP
+                WHERE session_id = $1 AND agent_name = $2 AND thread_id = $3
+            """
+            state = json.dumps(sync_state) if sync_state is not None else None
+            await execute(query, session_id, agent_name, thread_id, state)
+        except Exception as e:
+            logger.error(f"Error ending agent thread turn: {e}")
+            raise
+
+    async def delete(self, session_id: str, agent_name: str) -> str | None:
+        """Remove an agent's thread for a session, returning its ID."""
+        try:
+            query = """
+                DELETE FROM agent_threads
+                WHERE session_id = $1 AND agent_name = $2
+                RETURNING thread_id
+            """
+            record = await fetchone(query, session_id, agent_name)
+            return record["thread_id"] if record else None
+        except Exception as e:
+            logger.error(f"Error deleting agent thread: {e}")
+            raise
+
+    async def delete_for_session(self, session_id: str) -> list[tuple[str, str]]:
+        """Remove every agent's thread for a session, returning (agent name, thread ID) pairs."""
+        try:
+            query = """
+                DELETE FROM agent_threads
+                WHERE session_id = $1
+                RETURNING agent_name, thread_id
+            """
+            records = await fetch(query, session_id)
+            return [(r["agent_name"], r["thread_id"]) for r in records]
+        except Exception as e:
+            logger.error(f"Error deleting agent threads for session: {e}")
+            raise
+
+    async def delete_unused_since(self, cutoff: datetime) -> list[tuple[str, str, str]]:
+        """
+        Remove threads not used since ``cutoff``.
+
+        Each row is returned to exactly one caller, so concurrent sweeps by
+        several workers never delete the same remote thread twice.
+
+        Returns:
+            (session ID, agent name, thread ID) of the removed threads
+        """
+        try:
+            query = """
+                DELETE FROM agent_threads
+                WHERE last_used_at < $1
+                RETURNING session_id, agent_name, thread_id
+            """
+            records = await fetch(query, cutoff)
+            return [(r["session_id"], r["agent_name"], r["thread_id"]) for r in records]
+        except Exception as e:
+            logger.error(f"Error deleting expired agent threads: {e}")
+            raise
+
+
+# Singleton instance
+agent_thread_repository = AgentThreadRepository()
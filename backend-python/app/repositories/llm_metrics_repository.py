@@ -0,0 +1,57 @@
+"""
+LLM Metrics Repository
+Database operations for per-call LLM latency and token records
+"""
+
+import logging
+from typing import TYPE_CHECKING
+
+from app.database import get_connection
+
+if TYPE_CHECKING:
+    from app.utils.llm_metrics import LLMCallRecord
+
+logger = logging.getLogger(__name__)
+
+
+class LLMMetricsRepository:
+    """Repository for LLM call metrics."""
+
+    async def add_many(self, records: list["LLMCallRecord"]) -> None:
+        """Insert call records."""
+        if not records:
+            return
+        try:
+            query = """
+                INSERT INTO llm_call_metrics (
+                    endpoint, provider, model, simulation_id, prompt_tokens,
+                    completion_tokens, ttfb_ms, latency_ms, success, created_at
+                )
+                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
+            """
+            async with get_connection() as conn:
+                await conn.executemany(
+                    query,
+                    [
+                        (
+                            r.endpoint,
+                            r.provider,
+                            r.model,
+                            r.simulation_id,
+                            r.prompt_tokens,
+                            r.completion_tokens,
+                            round(r.ttfb_ms) if r.ttfb_ms is not None else None,
+                            round(r.latency_ms),
+                            r.success,
+                            r.started_at,
+                        )
+                        for r in records
+                    ],
+                )
+        except Exception as e:
+            logger.error(f"Error adding LLM call metrics: {e}")
+            raise
+
+
+# Singleton instance
+llm_metrics_repository = LLMMetricsRepository()
@@ -181,11 +181,12 @@ class ParameterRepository:
             logger.error(f"Error updating parameter: {e}")
             raise
 
-    async def delete(self, param_id: str) -> None:
+    async def delete(self, param_id: str) -> bool:
         """Delete a parameter."""
         try:
             query = "DELETE FROM parameters WHERE id = $1"
-            await execute(query, param_id)
+            result = await execute(query, param_id)
+            return result == "DELETE 1"
         except Exception as e:
             logger.error(f"Error deleting parameter: {e}")
             raise
@@ -0,0 +1,110 @@
+"""
+Profile Pool Repository
+Database operations for pre-generated client profiles
+"""
+
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+from app.database import fetch, fetchone, get_connection
+
+logger = logging.getLogger(__name__)
+
+# Advisory lock held by the worker refilling the pool
+REFILL_LOCK_NAME = "client_profile_pool:refill"
+
+
+class ProfilePoolRepository:
+    """Repository for the client profile pool."""
+
+    async def count_by_bucket(self) -> dict[tuple[str, str], int]:
+        """Count pooled profiles per (industry, difficulty)."""
+        try:
+            query = """
+                SELECT industry, difficulty, COUNT(*) AS count
+                FROM client_profile_pool
+                GROUP BY industry, difficulty
+            """
+            records = await fetch(query)
+            return {(r["industry"], r["difficulty"]): r["count"] for r in records}
+        except Exception as e:
+            logger.error(f"Error counting pooled profiles: {e}")
+            raise
+
+    async def add_many(
+        self,
+        industry: str,
+        difficulty: str,
+        profiles: list[dict[str, Any]],
+        source: str | None = None,
+    ) -> None:
+        """Add profiles to a bucket."""
+        if not profiles:
+            return
+        try:
+            query = """
+                INSERT INTO client_profile_pool (industry, difficulty, profile, source)
+                VALUES ($1, $2, $3, $4)
+            """
+            async with get_connection() as conn:
+                await conn.executemany(
+                    query,
+                    [(industry, difficulty, json.dumps(profile), source) for profile in profiles],
+                )
+        except Exception as e:
+            logger.error(f"Error adding pooled profiles: {e}")
+            raise
+
+    @asynccontextmanager
+    async def refill_lock(self) -> AsyncIterator[bool]:
+        """
+        Try to take the pool's refill lock for the duration of the block.
+
+        The lock is a session-level advisory lock on a dedicated connection,
+        so only one worker refills at a time and a crashed worker's lock is
+        released with its connection.
+
+        Yields:
+            True if this worker holds the lock, False if another one does
+        """
+        async with get_connection() as conn:
+            locked = await conn.fetchval("SELECT pg_try_advisory_lock(hashtext($1))", REFILL_LOCK_NAME)
+            try:
+                yield locked
+            finally:
+                if locked:
+                    await conn.execute("SELECT pg_advisory_unlock(hashtext($1))", REFILL_LOCK_NAME)
+
+    async def pop(self, industry: str, difficulty: str) -> dict[str, Any] | None:
+        """
+        Remove and return the oldest profile in a bucket.
+
+        Rows locked by a concurrent pop are skipped, so simultaneous starts
+        never receive the same profile or wait on each other.
+        """
+        try:
+            query = """
+                DELETE FROM client_profile_pool
+                WHERE id = (
+                    SELECT id FROM client_profile_pool
+                    WHERE industry = $1 AND difficulty = $2
+                    ORDER BY created_at
+                    LIMIT 1
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING profile
+            """
+            record = await fetchone(query, industry, difficulty)
+            if not record:
+                return None
+            profile = record["profile"]
+            return json.loads(profile) if isinstance(profile, str) else profile
+        except Exception as e:
+            logger.error(f"Error popping pooled profile: {e}")
+            raise
+
+
+# Singleton instance
+profile_pool_repository = ProfilePoolRepository()
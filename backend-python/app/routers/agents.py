@@ -6,9 +6,11 @@ Health check and status endpoints for Azure AI Agents
 import logging
 from typing import Any
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Body, HTTPException, status
 
 from app.agents.agent_manager import agent_manager
+from app.services.simulation_service import simulation_service
+from app.utils.agent_run_timings import agent_run_timings
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +44,47 @@ async def agents_status() -> dict[str, Any]:
     }
 
 
+@router.get("/timings")
+async def agents_timings() -> dict[str, Any]:
+    """
+    Get where agent reply time goes.
+
+    Returns:
+        Phase duration histograms per agent and sampled run timelines
+    """
+    return {
+        "success": True,
+        "data": agent_run_timings.get_stats(),
+    }
+
+
+@router.post("/profile/generate")
+async def generate_profile(
+    industry: str = Body(...),
+    difficulty: str = Body("beginner"),
+    subcategory: str | None = Body(None),
+) -> dict[str, Any]:
+    """
+    Get a client profile for the simulation setup page.
+
+    Served from the warm profile pool when it has one, otherwise generated
+    by the profile generation agent or OpenAI.
+
+    Returns:
+        Success flag and the profile
+    """
+    if industry not in simulation_service.VALID_INDUSTRIES:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid industry")
+    if difficulty not in simulation_service.DIFFICULTY_MAP:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid difficulty")
+
+    profile = await simulation_service.get_client_profile(industry, difficulty)
+    return {
+        "success": bool(profile),
+        "profile": profile or None,
+    }
+
+
 @router.get("/info")
 async def agents_info() -> dict[str, Any]:
     """
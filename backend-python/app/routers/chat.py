@@ -3,17 +3,28 @@ Chat Router
 AI chat endpoints with Azure AI Agents support
 """
 
+import asyncio
+import hashlib
 import json
 import logging
-from typing import Any
+import time
+from typing import Any, AsyncIterator
 
 import httpx
 from fastapi import APIRouter, HTTPException, status, Body
+from fastapi.responses import StreamingResponse
 
-from app.config import get_settings
+from app.config import get_openai_url, get_settings
 from app.services.ai_service import ai_service
+from app.services.objective_service import objective_service
+from app.services.response_cache import response_cache
 from app.agents.agent_manager import agent_manager
+from app.agents.provider_router import AZURE_AGENT, OPENAI, provider_router
 from app.models.chat import ChatMessage
+from app.utils.context_window import context_window
+from app.utils.llm_metrics import llm_call_context, llm_metrics
+from app.utils.llm_scheduler import LLMPriority, llm_priority, llm_scheduler
+from app.utils.tokens import count_message_tokens
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +33,16 @@ router = APIRouter(prefix="/chat", tags=["Chat"])
 # In-memory API key storage (in production, use secure storage)
 stored_api_key = ""
 
+# Successful API key checks are reused for this long
+API_KEY_VALIDATION_TTL_SECONDS = 300
+
+DEFAULT_CLIENT_PERSONALITY = {
+    "mood": "neutral",
+    "archetype": "Standard Client",
+    "traits": {"openness": 50, "agreeableness": 50, "conscientiousness": 50, "neuroticism": 50, "extraversion": 50},
+    "influence": "balanced",
+}
+
 
 def get_difficulty_guidelines(difficulty: str) -> str:
     """Get difficulty-specific guidelines for the AI."""
@@ -99,6 +120,28 @@ Provide clear, practical, and supportive guidance to help the advisor succeed in
 Remember that you are NOT the client - you are a trainer helping the advisor."""
 
 
+def _context_key(role: str, simulation_id: str | None) -> str | None:
+    """Key for caching a simulation's rolling conversation summary."""
+    return f"{role}:{simulation_id}" if simulation_id else None
+
+
+def _objective_progress_snapshot(
+    simulation_id: str | None,
+    evaluation_task: asyncio.Task | None,
+) -> dict[str, Any]:
+    """
+    Objective progress fields for a reply that does not wait on evaluation.
+    Uses this turn's result if it already finished, otherwise the latest stored one.
+    """
+    progress = objective_service.completed_result(evaluation_task)
+    if progress is None and simulation_id:
+        progress = objective_service.get_result(simulation_id)
+    return {
+        "objectiveProgress": progress,
+        "objectiveProgressPending": bool(evaluation_task and not evaluation_task.done()),
+    }
+
+
 @router.post("/client-response")
 async def client_response(
     messages: list[dict[str, Any]] = Body(...),
@@ -115,109 +158,69 @@ async def client_response(
         effective_api_key = api_key or stored_api_key or settings.openai_api_key
 
         # Default personality settings
-        personality = personality_settings or {
-            "mood": "neutral",
-            "archetype": "Standard Client",
-            "traits": {"openness": 50, "agreeableness": 50, "conscientiousness": 50, "neuroticism": 50, "extraversion": 50},
-            "influence": "balanced",
-        }
+        personality = personality_settings or DEFAULT_CLIENT_PERSONALITY
 
-        logger.info(f"[CHAT] Generating client response for simulation {simulation_settings.get('simulationId')}")
-
-        # Try Azure agent first
-        if agent_manager.is_azure_available:
-            try:
-                agent = agent_manager.get_simulation_client_agent()
-                if agent and agent.is_initialized:
-                    result = await agent.generate_response(
-                        messages=messages,
-                        client_profile=client_profile,
-                        personality_settings=personality,
-                        simulation_settings=simulation_settings,
-                        session_id=simulation_settings.get("simulationId"),
-                    )
+        simulation_id = simulation_settings.get("simulationId")
+        logger.info(f"[CHAT] Generating client response for simulation {simulation_id}")
+
+        agent = agent_manager.get_simulation_client_agent() if agent_manager.is_azure_available else None
+        if agent and not agent.is_initialized:
+            agent = None
 
-                    # Evaluate objectives if we have enough messages
-                    objective_progress = None
-                    if len(messages) > 2:
-                        try:
-                            objective_progress = await ai_service.evaluate_objectives(messages, effective_api_key)
-                            if objective_progress:
-                                objective_progress = objective_progress.model_dump()
-                        except Exception as e:
-                            logger.error(f"[CHAT] Error evaluating objectives: {e}")
-
-                    logger.info(f"[CHAT] Successfully generated Azure agent response for simulation {simulation_settings.get('simulationId')}")
-
-                    return {
-                        "success": True,
-                        "message": result.get("message", ""),
-                        "objectiveProgress": objective_progress,
-                        "source": "azure-agent",
-                    }
-            except Exception as e:
-                logger.warning(f"[CHAT] Azure agent failed, falling back to OpenAI: {e}")
-
-        # Fallback to OpenAI
-        if not effective_api_key:
+        if not agent and not effective_api_key:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="OpenAI API key is missing. Please configure it in the API Settings page.",
             )
 
-        # Build system prompt
-        system_prompt = build_system_prompt(client_profile, personality, simulation_settings)
+        # Objectives score the advisor's turns, which are all present already, so
+        # evaluate them alongside the reply instead of after it. Results are pushed
+        # over Socket.io and can be fetched from /chat/objective-progress.
+        evaluation_task = objective_service.schedule_evaluation(simulation_id, messages, effective_api_key)
+
+        async def generate_azure() -> str:
+            result = await agent.generate_response(
+                messages=messages,
+                client_profile=client_profile,
+                personality_settings=personality,
+                simulation_settings=simulation_settings,
+                session_id=simulation_id,
+            )
+            return result.get("message", "")
 
-        # Format messages
-        formatted_messages = [
-            {"role": "system", "content": system_prompt},
-            *[m for m in messages if m.get("role") != "system"],
-        ]
+        async def generate_openai() -> str:
+            # Build system prompt
+            system_prompt = build_system_prompt(client_profile, personality, simulation_settings)
 
-        # Generate response using OpenAI
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {effective_api_key}",
-                },
-                json={
-                    "model": "gpt-4o",
-                    "messages": formatted_messages,
-                    "temperature": 0.7,
-                    "max_tokens": 1000,
-                },
-                timeout=60.0,
+            # Format messages, keeping long conversations within the token budget
+            formatted_messages = context_window.build_messages(
+                system_prompt, messages, _context_key("client", simulation_id)
             )
 
-            if response.status_code != 200:
-                logger.error(f"OpenAI API error: {response.text}")
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="I'm sorry, I'm having trouble responding right now.",
-                )
-
-            data = response.json()
-            client_response_text = data.get("choices", [{}])[0].get("message", {}).get("content", "")
+            return await _create_openai_completion(
+                effective_api_key,
+                formatted_messages,
+                "I'm sorry, I'm having trouble responding right now.",
+            )
 
-        # Evaluate objectives if we have enough messages
-        objective_progress = None
-        if len(messages) > 2:
-            try:
-                objective_progress = await ai_service.evaluate_objectives(messages, effective_api_key)
-                if objective_progress:
-                    objective_progress = objective_progress.model_dump()
-            except Exception as e:
-                logger.error(f"[CHAT] Error evaluating objectives: {e}")
+        # Azure agent first; OpenAI is hedged in if Azure is slower than usual. A
+        # simulation's turn writes to its Azure thread, and a losing run would keep
+        # writing after OpenAI answered, so only hedge turns without a thread.
+        providers = [(AZURE_AGENT, generate_azure)] if agent else []
+        if effective_api_key:
+            providers.append((OPENAI, generate_openai))
+        with llm_call_context(simulation_id=simulation_id):
+            client_response_text, source = await provider_router.call(
+                "client-response", providers, hedge=not simulation_id
+            )
 
-        logger.info(f"[CHAT] Successfully generated response for simulation {simulation_settings.get('simulationId')}")
+        logger.info(f"[CHAT] Successfully generated {source} response for simulation {simulation_id}")
 
         return {
             "success": True,
             "message": client_response_text,
-            "objectiveProgress": objective_progress,
-            "source": "openai",
+            **_objective_progress_snapshot(simulation_id, evaluation_task),
+            "source": source,
         }
     except HTTPException:
         raise
@@ -229,6 +232,226 @@ async def client_response(
         )
 
 
+async def _create_openai_completion(
+    api_key: str,
+    messages: list[dict[str, Any]],
+    error_detail: str,
+) -> str:
+    """Create a chat completion with OpenAI and return its content."""
+    async with httpx.AsyncClient() as client:
+        response = await llm_scheduler.run(
+            lambda: client.post(
+                get_openai_url("chat/completions"),
+                headers={
+                    "Content-Type": "application/json",
+                    "Authorization": f"Bearer {api_key}",
+                },
+                json={
+                    "model": "gpt-4o",
+                    "messages": messages,
+                    "temperature": 0.7,
+                    "max_tokens": 1000,
+                },
+                timeout=60.0,
+            ),
+            api_key=api_key,
+            model="gpt-4o",
+            estimated_tokens=count_message_tokens(messages) + 1000,
+        )
+
+        if response.status_code != 200:
+            logger.error(f"OpenAI API error: {response.text}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=error_detail,
+            )
+
+        data = response.json()
+        return data.get("choices", [{}])[0].get("message", {}).get("content", "")
+
+
+def _sse_event(event: str, data: Any) -> str:
+    """Format a single Server-Sent Events frame."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _stream_openai_completion(
+    api_key: str,
+    messages: list[dict[str, Any]],
+) -> AsyncIterator[str]:
+    """Stream chat completion content deltas from OpenAI."""
+    # A stream can't be retried once tokens have been sent, so it only takes a slot
+    async with (
+        llm_scheduler.slot(api_key, "gpt-4o", count_message_tokens(messages) + 1000),
+        llm_metrics.track("gpt-4o", OPENAI) as record,
+    ):
+        async with httpx.AsyncClient() as client:
+            async with client.stream(
+                "POST",
+                get_openai_url("chat/completions"),
+                headers={
+                    "Content-Type": "application/json",
+                    "Authorization": f"Bearer {api_key}",
+                },
+                json={
+                    "model": "gpt-4o",
+                    "messages": messages,
+                    "temperature": 0.7,
+                    "max_tokens": 1000,
+                    "stream": True,
+                    "stream_options": {"include_usage": True},
+                },
+                timeout=60.0,
+            ) as response:
+                if response.status_code != 200:
+                    error_body = await response.aread()
+                    logger.error(f"OpenAI API error: {error_body.decode('utf-8', errors='replace')}")
+                    raise RuntimeError(f"OpenAI API error: {response.status_code}")
+
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    payload = line[len("data:"):].strip()
+                    if payload == "[DONE]":
+                        break
+                    chunk = json.loads(payload)
+                    # The final chunk carries usage and no choices
+                    record.set_usage_from(chunk.get("usage"))
+                    choices = chunk.get("choices") or []
+                    if choices:
+                        content = choices[0].get("delta", {}).get("content")
+                        if content:
+                            record.first_byte()
+                            yield content
+
+
+@router.post("/client-response/stream")
+async def client_response_stream(
+    messages: list[dict[str, Any]] = Body(...),
+    client_profile: dict[str, Any] = Body(..., alias="clientProfile"),
+    personality_settings: dict[str, Any] | None = Body(None, alias="personalitySettings"),
+    simulation_settings: dict[str, Any] = Body(..., alias="simulationSettings"),
+    api_key: str | None = Body(None, alias="apiKey"),
+):
+    """
+    Generate AI client response as a Server-Sent Events stream.
+
+    Events: ``start`` (source), ``token`` (text delta), ``message`` (full reply),
+    then a trailing ``objective-progress``. Failures are reported as ``error``.
+    """
+    global stored_api_key
+
+    settings = get_settings()
+    effective_api_key = api_key or stored_api_key or settings.openai_api_key
+    personality = personality_settings or DEFAULT_CLIENT_PERSONALITY
+    simulation_id = simulation_settings.get("simulationId")
+
+    agent = agent_manager.get_simulation_client_agent() if agent_manager.is_azure_available else None
+    if agent and not agent.is_initialized:
+        agent = None
+
+    # Skip an agent whose circuit is open unless there is nothing to fall back to
+    if agent and effective_api_key and not provider_router.is_available(AZURE_AGENT):
+        logger.info(f"[CHAT] Azure agent circuit open, streaming from OpenAI for simulation {simulation_id}")
+        agent = None
+
+    # Errors after the first byte can only be reported in-stream, so reject up front
+    if not agent and not effective_api_key:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="OpenAI API key is missing. Please configure it in the API Settings page.",
+        )
+
+    logger.info(f"[CHAT] Streaming client response for simulation {simulation_id}")
+
+    async def event_stream() -> AsyncIterator[str]:
+        chunks: list[str] = []
+        source: str | None = None
+        evaluation_task = objective_service.schedule_evaluation(simulation_id, messages, effective_api_key)
+
+        try:
+            with llm_call_context(endpoint="client-response-stream", simulation_id=simulation_id):
+                # Try Azure agent first; fall back only if nothing was streamed yet
+                if agent:
+                    started = time.monotonic()
+                    try:
+                        async for chunk in agent.generate_response_stream(
+                            messages=messages,
+                            client_profile=client_profile,
+                            personality_settings=personality,
+                            simulation_settings=simulation_settings,
+                            session_id=simulation_id,
+                        ):
+                            if source is None:
+                                source = "azure-agent"
+                                yield _sse_event("start", {"source": source})
+                            chunks.append(chunk)
+                            yield _sse_event("token", {"text": chunk})
+                        provider_router.record_success(AZURE_AGENT, time.monotonic() - started)
+                    except Exception as e:
+                        provider_router.record_failure(AZURE_AGENT, time.monotonic() - started)
+                        if chunks:
+                            raise
+                        logger.warning(f"[CHAT] Azure agent stream failed, falling back to OpenAI: {e}")
+                        source = None
+
+                if source is None:
+                    if not effective_api_key:
+                        raise ValueError("OpenAI API key is missing")
+
+                    source = "openai"
+                    yield _sse_event("start", {"source": source})
+
+                    system_prompt = build_system_prompt(client_profile, personality, simulation_settings)
+                    formatted_messages = context_window.build_messages(
+                        system_prompt, messages, _context_key("client", simulation_id)
+                    )
+                    async for chunk in _stream_openai_completion(effective_api_key, formatted_messages):
+                        chunks.append(chunk)
+                        yield _sse_event("token", {"text": chunk})
+
+                yield _sse_event("message", {"success": True, "message": "".join(chunks), "source": source})
+
+                # Objective evaluation ran alongside the reply; it trails the reply
+                # so it never delays the first token
+                objective_progress = None
+                if evaluation_task:
+                    try:
+                        objective_progress = await evaluation_task
+                    except asyncio.CancelledError:
+                        # Superseded by a newer turn for the same simulation
+                        objective_progress = objective_service.get_result(simulation_id) if simulation_id else None
+
+                yield _sse_event("objective-progress", {"objectiveProgress": objective_progress})
+
+                logger.info(f"[CHAT] Successfully streamed {source} response for simulation {simulation_id}")
+        except Exception as e:
+            logger.error(f"[CHAT] Error streaming client response: {e}")
+            yield _sse_event("error", {
+                "success": False,
+                "message": "I'm sorry, I'm having trouble responding right now. Let's continue our conversation in a moment.",
+            })
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+@router.get("/objective-progress/{simulation_id}")
+async def get_objective_progress(simulation_id: str):
+    """Get the latest objective progress evaluated for a simulation."""
+    return {
+        "success": True,
+        "objectiveProgress": objective_service.get_result(simulation_id),
+        "pending": objective_service.is_pending(simulation_id),
+    }
+
+
 @router.post("/expert-response")
 async def expert_response(
     messages: list[dict[str, Any]] = Body(...),
@@ -253,75 +476,53 @@ async def expert_response(
             "influence": "balanced",
         }
 
-        # Try Azure agent first
-        if agent_manager.is_azure_available:
-            try:
-                agent = agent_manager.get_expert_guidance_agent()
-                if agent and agent.is_initialized:
-                    result = await agent.generate_guidance(
-                        messages=messages,
-                        client_profile=client_profile,
-                        simulation_settings=simulation_settings,
-                        objectives=objectives,
-                        session_id=simulation_settings.get("simulationId"),
-                    )
+        agent = agent_manager.get_expert_guidance_agent() if agent_manager.is_azure_available else None
+        if agent and not agent.is_initialized:
+            agent = None
 
-                    return {
-                        "success": True,
-                        "message": result.get("message", ""),
-                        "tier": result.get("tier", 3),
-                        "source": "azure-agent",
-                    }
-            except Exception as e:
-                logger.warning(f"[CHAT] Azure agent failed, falling back to OpenAI: {e}")
-
-        # Fallback to OpenAI
-        if not effective_api_key:
+        if not agent and not effective_api_key:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="OpenAI API key is missing. Please configure it in the API Settings page.",
             )
 
-        # Build expert prompt
-        expert_prompt = build_expert_prompt(client_profile, personality, simulation_settings, objectives)
+        async def generate_azure() -> dict[str, Any]:
+            result = await agent.generate_guidance(
+                messages=messages,
+                client_profile=client_profile,
+                simulation_settings=simulation_settings,
+                objectives=objectives,
+                session_id=simulation_settings.get("simulationId"),
+            )
+            return {"message": result.get("message", ""), "tier": result.get("tier", 3)}
 
-        # Format messages
-        formatted_messages = [
-            {"role": "system", "content": expert_prompt},
-            *[m for m in messages if m.get("role") != "system"],
-        ]
+        async def generate_openai() -> dict[str, Any]:
+            # Build expert prompt
+            expert_prompt = build_expert_prompt(client_profile, personality, simulation_settings, objectives)
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {effective_api_key}",
-                },
-                json={
-                    "model": "gpt-4o",
-                    "messages": formatted_messages,
-                    "temperature": 0.7,
-                    "max_tokens": 1000,
-                },
-                timeout=60.0,
+            # Format messages, keeping long conversations within the token budget
+            formatted_messages = context_window.build_messages(
+                expert_prompt, messages, _context_key("expert", simulation_settings.get("simulationId"))
             )
 
-            if response.status_code != 200:
-                logger.error(f"OpenAI API error: {response.text}")
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="I'm sorry, I'm having trouble providing guidance right now.",
-                )
+            expert_text = await _create_openai_completion(
+                effective_api_key,
+                formatted_messages,
+                "I'm sorry, I'm having trouble providing guidance right now.",
+            )
+            return {"message": expert_text, "tier": 3}
 
-            data = response.json()
-            expert_text = data.get("choices", [{}])[0].get("message", {}).get("content", "")
+        providers = [(AZURE_AGENT, generate_azure)] if agent else []
+        if effective_api_key:
+            providers.append((OPENAI, generate_openai))
+        with llm_priority(LLMPriority.EXPERT), llm_call_context(simulation_id=simulation_settings.get("simulationId")):
+            guidance, source = await provider_router.call("expert-response", providers)
 
         return {
             "success": True,
-            "message": expert_text,
-            "tier": 3,
-            "source": "openai",
+            "message": guidance["message"],
+            "tier": guidance["tier"],
+            "source": source,
         }
     except HTTPException:
         raise
@@ -349,33 +550,55 @@ async def set_api_key(api_key: str = Body(..., alias="apiKey")):
 
 
 @router.post("/test-api-key")
-async def test_api_key(api_key: str | None = Body(None, alias="apiKey")):
-    """Test API key."""
+async def test_api_key(
+    api_key: str | None = Body(None, alias="apiKey"),
+    bypass_cache: bool = Body(False, alias="bypassCache"),
+):
+    """
+    Test API key.
+
+    Successful validations are cached briefly under a hash of the key;
+    pass ``bypassCache`` to re-check with OpenAI.
+    """
     global stored_api_key
     try:
         test_key = api_key or stored_api_key
         if not test_key:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No API key provided")
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {test_key}",
-                },
-                json={
-                    "model": "gpt-4o",
-                    "messages": [{"role": "user", "content": "Hello, this is a test."}],
-                    "max_tokens": 10,
-                },
-                timeout=30.0,
-            )
+        key = response_cache.make_key("test-api-key", "gpt-4o", hashlib.sha256(test_key.encode()).hexdigest())
+        valid = await response_cache.get_or_compute(
+            "test-api-key",
+            key,
+            lambda: _validate_api_key(test_key),
+            ttl_seconds=API_KEY_VALIDATION_TTL_SECONDS,
+            bypass=bypass_cache,
+            should_cache=bool,
+        )
 
-            if response.status_code == 200:
-                return {"success": True, "message": "API key validated successfully"}
-            else:
-                return {"success": False, "message": "Failed to validate API key. Please check and try again."}
+        if valid:
+            return {"success": True, "message": "API key validated successfully"}
+        else:
+            return {"success": False, "message": "Failed to validate API key. Please check and try again."}
     except Exception as e:
         logger.error(f"[CHAT] API key test failed: {e}")
         return {"success": False, "message": "Failed to validate API key. Please check and try again."}
+
+
+async def _validate_api_key(api_key: str) -> bool:
+    """Check an API key with a minimal chat completion."""
+    async with httpx.AsyncClient() as client:
+        response = await client.post(
+            get_openai_url("chat/completions"),
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {api_key}",
+            },
+            json={
+                "model": "gpt-4o",
+                "messages": [{"role": "user", "content": "Hello, this is a test."}],
+                "max_tokens": 10,
+            },
+            timeout=30.0,
+        )
+        return response.status_code == 200
@@ -10,13 +10,17 @@ from typing import Annotated, Any
 import httpx
 from fastapi import APIRouter, HTTPException, status, Depends, Body
 
-from app.config import get_settings
+from app.config import get_openai_url, get_settings
 from app.services.simulation_service import simulation_service
 from app.repositories.simulation_repository import simulation_repository
 from app.middleware.auth import get_current_user, require_ownership_or_admin
 from app.models.user import UserData
 from app.utils.validation import validate_uuid
 from app.agents.agent_manager import agent_manager
+from app.agents.provider_router import AZURE_AGENT, OPENAI, provider_router
+from app.utils.llm_scheduler import LLMPriority, llm_priority, llm_scheduler
+from app.utils.tokens import count_message_tokens
+from app.services.response_cache import response_cache
 
 logger = logging.getLogger(__name__)
 
@@ -198,6 +202,9 @@ async def delete_simulation(
 
         await simulation_service.delete_simulation(simulation_id)
 
+        # The simulation's agent threads are no longer needed
+        agent_manager.release_session_threads_later(simulation_id)
+
         return {"success": True, "message": "Simulation deleted successfully"}
     except HTTPException:
         raise
@@ -234,6 +241,9 @@ async def complete_simulation(
         if duration_seconds:
             await simulation_repository.update(simulation_id, {"duration_seconds": duration_seconds})
 
+        # The simulation's agent threads are no longer needed
+        agent_manager.release_session_threads_later(simulation_id)
+
         return {"success": True, "simulation": completed.model_dump()}
     except HTTPException:
         raise
@@ -247,8 +257,14 @@ async def generate_review(
     messages: list[dict[str, Any]] = Body(...),
     competencies: list[dict[str, Any]] | None = Body(None),
     difficulty_level: str | None = Body(None, alias="difficultyLevel"),
+    bypass_cache: bool = Body(False, alias="bypassCache"),
 ):
-    """Generate performance review."""
+    """
+    Generate performance review.
+
+    Reviews of an identical transcript are served from the response cache;
+    pass ``bypassCache`` to force a fresh review.
+    """
     try:
         if not messages or not isinstance(messages, list):
             raise HTTPException(
@@ -256,40 +272,73 @@ async def generate_review(
                 detail="Missing required field: messages (must be an array)",
             )
 
-        settings = get_settings()
-
-        # Try Azure agent first
-        if agent_manager.is_azure_available:
-            try:
-                agent = agent_manager.get_evaluation_agent()
-                if agent and agent.is_initialized:
-                    result = await agent.generate_review(
-                        messages=messages,
-                        competencies=competencies,
-                        difficulty=difficulty_level,
-                    )
-
-                    # Ensure required fields
-                    result.setdefault("competencyScores", [])
-                    result.setdefault("generalStrengths", [])
-                    result.setdefault("generalImprovements", [])
-                    result.setdefault("overallScore", 5)
-                    result.setdefault("summary", "")
-
-                    return {"success": True, "data": result}
-            except Exception as e:
-                logger.warning(f"[SIMULATION] Azure agent failed, falling back to OpenAI: {e}")
-
-        # Fallback to OpenAI
-        api_key = settings.openai_api_key
-        if not api_key:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="OpenAI API key not configured",
-            )
+        key = response_cache.make_key(
+            "generate-review",
+            f"azure-agent:{get_settings().azure_ai_model_deployment_name}" if agent_manager.is_azure_available else "gpt-4o",
+            messages,
+            {"competencies": competencies, "difficulty": difficulty_level},
+        )
+        review = await response_cache.get_or_compute(
+            "generate-review",
+            key,
+            lambda: _generate_review_data(messages, competencies, difficulty_level),
+            bypass=bypass_cache,
+            should_cache=lambda data: not data.get("parse_error"),
+        )
+        return {"success": True, "data": review}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Generate review error: {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
-        # Create prompt for generating the review
-        system_prompt = f"""You are an expert evaluator for financial advisor training simulations.
+
+async def _generate_review_data(
+    messages: list[dict[str, Any]],
+    competencies: list[dict[str, Any]] | None,
+    difficulty_level: str | None,
+) -> dict[str, Any]:
+    """Generate review data with the Azure evaluation agent, falling back to OpenAI."""
+    agent = agent_manager.get_evaluation_agent() if agent_manager.is_azure_available else None
+
+    async def generate_azure() -> dict[str, Any]:
+        result = await agent.generate_review(
+            messages=messages,
+            competencies=competencies,
+            difficulty=difficulty_level,
+        )
+
+        # Ensure required fields
+        result.setdefault("competencyScores", [])
+        result.setdefault("generalStrengths", [])
+        result.setdefault("generalImprovements", [])
+        result.setdefault("overallScore", 5)
+        result.setdefault("summary", "")
+
+        return result
+
+    providers = [(AZURE_AGENT, generate_azure)] if agent and agent.is_initialized else []
+    providers.append((OPENAI, lambda: _generate_review_openai(messages, competencies, difficulty_level)))
+    with llm_priority(LLMPriority.REVIEW):
+        review, _ = await provider_router.call("generate-review", providers)
+    return review
+
+
+async def _generate_review_openai(
+    messages: list[dict[str, Any]],
+    competencies: list[dict[str, Any]] | None,
+    difficulty_level: str | None,
+) -> dict[str, Any]:
+    """Generate review data with OpenAI."""
+    api_key = get_settings().openai_api_key
+    if not api_key:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="OpenAI API key not configured",
+        )
+
+    # Create prompt for generating the review
+    system_prompt = f"""You are an expert evaluator for financial advisor training simulations.
 Analyze the conversation between the advisor (user) and the client (assistant) to generate a detailed performance review.
 
 Difficulty Level: {difficulty_level or 'Not specified'}
@@ -304,14 +353,14 @@ Provide a comprehensive assessment of the advisor's performance with:
 
 Be specific, constructive, and reference actual moments from the conversation."""
 
-        competency_scores_template = ""
-        if competencies:
-            competency_scores_template = ",".join([
-                f'{{"name": "{c.get("name", "")}", "score": <number 1-10>, "strengths": ["strength 1"], "improvements": ["improvement 1"], "expectation": "description"}}'
-                for c in competencies
-            ])
+    competency_scores_template = ""
+    if competencies:
+        competency_scores_template = ",".join([
+            f'{{"name": "{c.get("name", "")}", "score": <number 1-10>, "strengths": ["strength 1"], "improvements": ["improvement 1"], "expectation": "description"}}'
+            for c in competencies
+        ])
 
-        user_prompt = f"""Review this conversation and provide a detailed performance assessment.
+    user_prompt = f"""Review this conversation and provide a detailed performance assessment.
 
 Conversation:
 {chr(10).join([f'{"Advisor" if m.get("role") == "user" else "Client"}: {m.get("content", "")}' for m in messages])}
@@ -327,71 +376,73 @@ Generate a performance review with the following structure:
 
 IMPORTANT: Respond with ONLY the raw JSON object. Do NOT wrap it in markdown code blocks."""
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://api.openai.com/v1/chat/completions",
+    review_messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
+
+    async with httpx.AsyncClient() as client:
+        response = await llm_scheduler.run(
+            lambda: client.post(
+                get_openai_url("chat/completions"),
                 headers={
                     "Content-Type": "application/json",
                     "Authorization": f"Bearer {api_key}",
                 },
                 json={
                     "model": "gpt-4o",
-                    "messages": [
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt},
-                    ],
+                    "messages": review_messages,
                     "temperature": 0.7,
                     "max_tokens": 2000,
                 },
                 timeout=60.0,
+            ),
+            api_key=api_key,
+            model="gpt-4o",
+            estimated_tokens=count_message_tokens(review_messages) + 2000,
+        )
+
+        if response.status_code != 200:
+            logger.error(f"OpenAI API error: {response.text}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to generate review from AI",
             )
 
-            if response.status_code != 200:
-                logger.error(f"OpenAI API error: {response.text}")
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Failed to generate review from AI",
-                )
-
-            data = response.json()
-            review_text = data.get("choices", [{}])[0].get("message", {}).get("content", "")
-
-            if not review_text:
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="No review generated",
-                )
-
-            # Parse the JSON response
-            cleaned_text = review_text.strip()
-            if cleaned_text.startswith("```json"):
-                cleaned_text = cleaned_text.replace("```json", "").replace("```", "").strip()
-            elif cleaned_text.startswith("```"):
-                cleaned_text = cleaned_text.replace("```", "").strip()
-
-            try:
-                review_data = json.loads(cleaned_text)
-
-                # Ensure competencyScores is properly formatted
-                if "competencyScores" not in review_data or not isinstance(review_data["competencyScores"], list):
-                    review_data["competencyScores"] = []
-
-                # Ensure other arrays have defaults
-                review_data.setdefault("generalStrengths", [])
-                review_data.setdefault("generalImprovements", [])
-                review_data.setdefault("overallScore", 5)
-                review_data.setdefault("summary", "")
-                review_data["source"] = "openai"
-
-                return {"success": True, "data": review_data}
-            except json.JSONDecodeError:
-                logger.error(f"Failed to parse review JSON: {review_text}")
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Failed to parse review data",
-                )
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Generate review error: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+        data = response.json()
+        review_text = data.get("choices", [{}])[0].get("message", {}).get("content", "")
+
+        if not review_text:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="No review generated",
+            )
+
+        # Parse the JSON response
+        cleaned_text = review_text.strip()
+        if cleaned_text.startswith("```json"):
+            cleaned_text = cleaned_text.replace("```json", "").replace("```", "").strip()
+        elif cleaned_text.startswith("```"):
+            cleaned_text = cleaned_text.replace("```", "").strip()
+
+        try:
+            review_data = json.loads(cleaned_text)
+
+            # Ensure competencyScores is properly formatted
+            if "competencyScores" not in review_data or not isinstance(review_data["competencyScores"], list):
+                review_data["competencyScores"] = []
+
+            # Ensure other arrays have defaults
+            review_data.setdefault("generalStrengths", [])
+            review_data.setdefault("generalImprovements", [])
+            review_data.setdefault("overallScore", 5)
+            review_data.setdefault("summary", "")
+            review_data["source"] = "openai"
+
+            return review_data
+        except json.JSONDecodeError:
+            logger.error(f"Failed to parse review JSON: {review_text}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to parse review data",
+            )
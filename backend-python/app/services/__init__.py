@@ -13,6 +13,10 @@ from app.services.parameter_service import parameter_service
 from app.services.engagement_service import engagement_service
 from app.services.ai_service import ai_service
 from app.services.industry_service import industry_service
+from app.services.objective_service import objective_service
+from app.services.response_cache import response_cache, ResponseCache
+from app.services.profile_pool_service import profile_pool_service
+from app.services.tts_audio_cache import tts_audio_cache, TTSAudioCache
 from app.services.websocket_tts_service import (
     WebSocketTTSService,
     get_tts_service,
@@ -30,6 +34,12 @@ __all__ = [
     "engagement_service",
     "ai_service",
     "industry_service",
+    "objective_service",
+    "response_cache",
+    "ResponseCache",
+    "profile_pool_service",
+    "tts_audio_cache",
+    "TTSAudioCache",
     "WebSocketTTSService",
     "get_tts_service",
     "init_tts_service",
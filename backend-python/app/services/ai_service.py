@@ -11,14 +11,59 @@ from typing import Any
 import httpx
 from openai import AsyncOpenAI
 
-from app.config import get_settings, is_openai_configured, is_azure_configured
-from app.repositories.parameter_repository import parameter_repository
+from app.config import get_openai_url, get_settings, is_openai_configured, is_azure_configured
 from app.models.chat import ChatMessage, AIResponse, ObjectiveProgress
 from app.agents.agent_manager import agent_manager
+from app.agents.provider_router import AZURE_AGENT, OPENAI, provider_router
+from app.services.parameter_service import parameter_service
+from app.services.response_cache import response_cache
+from app.utils.context_window import context_window
+from app.utils.llm_metrics import llm_call_context
+from app.utils.llm_scheduler import LLMPriority, llm_priority, llm_scheduler
+from app.utils.tokens import count_message_tokens
 
 logger = logging.getLogger(__name__)
 
 
+OBJECTIVE_EVALUATION_PROMPT = """You are an objective evaluator for a financial advisor training simulation.
+Evaluate the advisor's performance based on the conversation history below.
+The advisor is the user, and the client is the assistant.
+Assess progress on these objectives:
+1. Building Rapport: Establishing a connection with the client
+2. Needs Assessment: Discovering the client's financial situation and goals
+3. Handling Objections: Addressing concerns professionally
+4. Providing Recommendations: Suggesting appropriate options based on needs
+
+IMPORTANT SCORING INSTRUCTIONS:
+- Scores generally should not decrease unless there is a significant mistake or misstep
+- Base your evaluation on the ENTIRE conversation, not just the last message
+- Even brief exchanges that show warmth/professionalism should contribute to rapport (10-30%)
+- Any questions about client's situation should contribute to needs assessment (15-40%)
+
+Use the trackObjectiveProgress function to report progress percentages (0-100) on each objective."""
+
+INCREMENTAL_OBJECTIVE_EVALUATION_PROMPT = """You are an objective evaluator for a financial advisor training simulation.
+You are updating an earlier assessment. The next system message summarizes the scores for the conversation so far,
+followed by only the new turns since that assessment.
+The advisor is the user, and the client is the assistant.
+Assess progress on these objectives:
+1. Building Rapport: Establishing a connection with the client
+2. Needs Assessment: Discovering the client's financial situation and goals
+3. Handling Objections: Addressing concerns professionally
+4. Providing Recommendations: Suggesting appropriate options based on needs
+
+IMPORTANT SCORING INSTRUCTIONS:
+- Start from the previous scores and adjust them for what happens in the new turns
+- Scores generally should not decrease unless there is a significant mistake or misstep
+- Even brief exchanges that show warmth/professionalism should contribute to rapport (10-30%)
+- Any questions about client's situation should contribute to needs assessment (15-40%)
+
+Use the trackObjectiveProgress function to report progress percentages (0-100) on each objective."""
+
+# Explanation length carried forward between incremental objective evaluations
+OBJECTIVE_STATE_EXPLANATION_CHARS = 300
+
+
 class AIService:
     """Service for AI interactions with Azure Agents and OpenAI fallback."""
 
@@ -30,13 +75,39 @@ class AIService:
         elif not is_openai_configured():
             logger.warning("OPENAI_API_KEY not set. Fallback to OpenAI will not work.")
 
-        self.openai = AsyncOpenAI(api_key=settings.openai_api_key) if settings.openai_api_key else None
+        # Retries are left to the LLM scheduler so they re-enter its queue
+        self.openai = (
+            AsyncOpenAI(api_key=settings.openai_api_key, base_url=settings.openai_base_url, max_retries=0)
+            if settings.openai_api_key
+            else None
+        )
         self.settings = settings
 
     def _should_use_azure(self) -> bool:
         """Check if Azure agents should be used."""
         return agent_manager.is_azure_available
 
+    def _azure_agent(self, agent: Any) -> Any:
+        """Return the agent if Azure is in use and the agent is ready."""
+        if self._should_use_azure() and agent and agent.is_initialized:
+            return agent
+        return None
+
+    async def _create_chat_completion(self, **kwargs: Any) -> Any:
+        """Create an OpenAI chat completion once the LLM scheduler admits it."""
+        return await llm_scheduler.run(
+            lambda: self.openai.chat.completions.create(**kwargs),
+            api_key=self.settings.openai_api_key,
+            model=kwargs["model"],
+            estimated_tokens=count_message_tokens(kwargs["messages"]) + kwargs.get("max_tokens", 0),
+        )
+
+    def _cache_model(self, openai_model: str) -> str:
+        """Model identifier for response cache keys, covering the Azure agent path."""
+        if self._should_use_azure():
+            return f"azure-agent:{self.settings.azure_ai_model_deployment_name}"
+        return openai_model
+
     async def generate_client_response(
         self,
         conversation_history: list[ChatMessage | dict[str, Any]],
@@ -45,42 +116,46 @@ class AIService:
     ) -> AIResponse:
         """
         Generate AI client response for simulation.
-        Uses Azure agents with OpenAI fallback.
+        Uses Azure agents with OpenAI fallback, hedged when Azure is slow.
         """
-        # Try Azure agent first
-        if self._should_use_azure():
-            try:
-                agent = agent_manager.get_simulation_client_agent()
-                if agent and agent.is_initialized:
-                    # Convert messages to dict format
-                    messages = []
-                    for msg in conversation_history:
-                        if isinstance(msg, ChatMessage):
-                            messages.append({"role": msg.role, "content": msg.content})
-                        else:
-                            messages.append(msg)
-
-                    result = await agent.generate_response(
-                        messages=messages,
-                        client_profile=client_profile,
-                        personality_settings=context_parameters.get("personality_settings") if context_parameters else None,
-                        simulation_settings=context_parameters.get("simulation_settings") if context_parameters else None,
-                    )
-
-                    return AIResponse(
-                        message=result.get("message", ""),
-                        token_usage=None,
-                        source="azure-agent",
-                    )
-            except Exception as e:
-                logger.warning(f"Azure agent failed, falling back to OpenAI: {e}")
-
-        # Fallback to OpenAI
-        return await self._generate_client_response_openai(
-            conversation_history,
-            client_profile,
-            context_parameters,
-        )
+        agent = self._azure_agent(agent_manager.get_simulation_client_agent())
+
+        async def generate_azure() -> AIResponse:
+            # Convert messages to dict format
+            messages = []
+            for msg in conversation_history:
+                if isinstance(msg, ChatMessage):
+                    messages.append({"role": msg.role, "content": msg.content})
+                else:
+                    messages.append(msg)
+
+            result = await agent.generate_response(
+                messages=messages,
+                client_profile=client_profile,
+                personality_settings=context_parameters.get("personality_settings") if context_parameters else None,
+                simulation_settings=context_parameters.get("simulation_settings") if context_parameters else None,
+            )
+
+            return AIResponse(
+                message=result.get("message", ""),
+                token_usage=None,
+                source="azure-agent",
+            )
+
+        async def generate_openai() -> AIResponse:
+            return await self._generate_client_response_openai(
+                conversation_history,
+                client_profile,
+                context_parameters,
+            )
+
+        providers = [(AZURE_AGENT, generate_azure)] if agent else []
+        if self.openai or not providers:
+            providers.append((OPENAI, generate_openai))
+        simulation_settings = (context_parameters or {}).get("simulation_settings") or {}
+        with llm_call_context(simulation_id=simulation_settings.get("simulationId")):
+            response, _ = await provider_router.call("client-response", providers, hedge=True)
+        return response
 
     async def _generate_client_response_openai(
         self,
@@ -93,17 +168,25 @@ class AIService:
             parameters = await self._get_ai_parameters()
             system_prompt = self._build_system_prompt(client_profile, parameters)
 
-            messages = [{"role": "system", "content": system_prompt}]
+            history = []
             for msg in conversation_history:
                 if isinstance(msg, ChatMessage):
-                    messages.append({"role": msg.role, "content": msg.content})
+                    history.append({"role": msg.role, "content": msg.content})
                 else:
-                    messages.append(msg)
+                    history.append(msg)
+
+            simulation_settings = (context_parameters or {}).get("simulation_settings") or {}
+            simulation_id = simulation_settings.get("simulationId")
+            messages = context_window.build_messages(
+                system_prompt,
+                history,
+                f"client:{simulation_id}" if simulation_id else None,
+            )
 
             if not self.openai:
                 raise ValueError("OpenAI client not configured")
 
-            response = await self.openai.chat.completions.create(
+            response = await self._create_chat_completion(
                 model=parameters.get("model", self.settings.openai_default_model),
                 messages=messages,
                 temperature=parameters.get("temperature", self.settings.openai_default_temperature),
@@ -142,34 +225,35 @@ class AIService:
         Generate evaluation/feedback.
         Uses Azure agents with OpenAI fallback.
         """
-        # Try Azure agent first
-        if self._should_use_azure():
-            try:
-                agent = agent_manager.get_evaluation_agent()
-                if agent and agent.is_initialized:
-                    messages = []
-                    for msg in conversation_history:
-                        if isinstance(msg, ChatMessage):
-                            messages.append({"role": msg.role, "content": msg.content})
-                        else:
-                            messages.append(msg)
-
-                    result = await agent.generate_review(
-                        messages=messages,
-                        competencies=competencies,
-                        difficulty=difficulty,
-                    )
-                    return result
-            except Exception as e:
-                logger.warning(f"Azure agent failed, falling back to OpenAI: {e}")
-
-        # Fallback to OpenAI
-        return await self._generate_evaluation_openai(
-            conversation_history,
-            competencies,
-            rubrics,
-            difficulty,
-        )
+        agent = self._azure_agent(agent_manager.get_evaluation_agent())
+
+        async def generate_azure() -> dict[str, Any]:
+            messages = []
+            for msg in conversation_history:
+                if isinstance(msg, ChatMessage):
+                    messages.append({"role": msg.role, "content": msg.content})
+                else:
+                    messages.append(msg)
+
+            return await agent.generate_review(
+                messages=messages,
+                competencies=competencies,
+                difficulty=difficulty,
+            )
+
+        async def generate_openai() -> dict[str, Any]:
+            return await self._generate_evaluation_openai(
+                conversation_history,
+                competencies,
+                rubrics,
+                difficulty,
+            )
+
+        providers = [(AZURE_AGENT, generate_azure)] if agent else []
+        providers.append((OPENAI, generate_openai))
+        with llm_priority(LLMPriority.REVIEW):
+            result, _ = await provider_router.call("evaluation", providers)
+        return result
 
     async def _generate_evaluation_openai(
         self,
@@ -190,7 +274,7 @@ class AIService:
             if not self.openai:
                 raise ValueError("OpenAI client not configured")
 
-            response = await self.openai.chat.completions.create(
+            response = await self._create_chat_completion(
                 model="gpt-4",
                 messages=messages,
                 temperature=0.3,
@@ -212,32 +296,44 @@ class AIService:
         industry: str,
         difficulty_level: int | str,
         parameters: dict[str, Any] | None = None,
+        use_cache: bool = False,
+        bypass_cache: bool = False,
     ) -> dict[str, Any]:
         """
         Generate client profile.
         Uses Azure agents with OpenAI fallback.
+
+        Profiles are sampled, so caching is opt-in: with ``use_cache`` the same
+        industry, difficulty and parameters return the same profile until the
+        entry expires. ``bypass_cache`` forces a fresh profile and stores it.
         """
         difficulty_string = (
             difficulty_level if isinstance(difficulty_level, str)
             else ("beginner" if difficulty_level <= 1 else "intermediate" if difficulty_level <= 2 else "advanced")
         )
 
-        # Try Azure agent first
-        if self._should_use_azure():
-            try:
-                agent = agent_manager.get_profile_generation_agent()
-                if agent and agent.is_initialized:
-                    result = await agent.generate_profile(
-                        industry=industry,
-                        difficulty=difficulty_string,
-                        parameters=parameters,
-                    )
-                    return result
-            except Exception as e:
-                logger.warning(f"Azure agent failed, falling back to OpenAI: {e}")
-
-        # Fallback to OpenAI
-        return await self._generate_client_profile_openai(industry, difficulty_string, parameters)
+        async def generate() -> dict[str, Any]:
+            agent = self._azure_agent(agent_manager.get_profile_generation_agent())
+            providers = []
+            if agent:
+                providers.append((AZURE_AGENT, lambda: agent.generate_profile(
+                    industry=industry,
+                    difficulty=difficulty_string,
+                    parameters=parameters,
+                )))
+            providers.append((OPENAI, lambda: self._generate_client_profile_openai(industry, difficulty_string, parameters)))
+            result, _ = await provider_router.call("client-profile", providers)
+            return result
+
+        key = response_cache.make_key(
+            "client-profile",
+            self._cache_model("gpt-4"),
+            {"industry": industry, "difficulty": difficulty_string},
+            parameters,
+        )
+        return await response_cache.get_or_compute(
+            "client-profile", key, generate, enabled=use_cache, bypass=bypass_cache
+        )
 
     async def _generate_client_profile_openai(
         self,
@@ -257,12 +353,24 @@ class AIService:
 - Communication style
 - Specific challenges or concerns
 
-Return as JSON."""
+Return ONLY a valid JSON object with these lowercase keys, where "name", "age", "occupation" and "goals" are required:
+{{
+  "name": "Full Name",
+  "age": 45,
+  "occupation": "Job Title",
+  "income": "$X - $Y annually",
+  "family": "Married with 2 children",
+  "goals": ["goal1", "goal2"],
+  "concerns": ["concern1", "concern2"],
+  "background": "Brief background...",
+  "personality_traits": ["trait1", "trait2"],
+  "communication_style": "direct/analytical/emotional/etc."
+}}"""
 
             if not self.openai:
                 raise ValueError("OpenAI client not configured")
 
-            response = await self.openai.chat.completions.create(
+            response = await self._create_chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "You are a profile generator for financial advisory simulations."},
@@ -274,9 +382,14 @@ Return as JSON."""
 
             profile_text = response.choices[0].message.content or "{}"
 
+            # Clean potential markdown wrapping
+            cleaned = profile_text.strip()
+            if cleaned.startswith("```"):
+                cleaned = cleaned.removeprefix("```json").removeprefix("```").removesuffix("```").strip()
+
             try:
                 return {
-                    **json.loads(profile_text),
+                    **json.loads(cleaned),
                     "source": "openai",
                 }
             except json.JSONDecodeError:
@@ -289,23 +402,33 @@ Return as JSON."""
             logger.error(f"Error generating client profile: {e}")
             raise
 
-    async def generate_conversation_starter(self, client_profile: dict[str, Any]) -> str:
+    async def generate_conversation_starter(
+        self,
+        client_profile: dict[str, Any],
+        use_cache: bool = False,
+        bypass_cache: bool = False,
+    ) -> str:
         """
         Generate conversation starter.
         Uses Azure agents with OpenAI fallback.
+
+        With ``use_cache`` the same profile returns the same opening message;
+        ``bypass_cache`` forces a fresh one and stores it.
         """
-        # Try Azure agent first
-        if self._should_use_azure():
-            try:
-                agent = agent_manager.get_profile_generation_agent()
-                if agent and agent.is_initialized:
-                    result = await agent.generate_conversation_starter(client_profile)
-                    return result
-            except Exception as e:
-                logger.warning(f"Azure agent failed, falling back to OpenAI: {e}")
 
-        # Fallback to OpenAI
-        return await self._generate_conversation_starter_openai(client_profile)
+        async def generate() -> str:
+            agent = self._azure_agent(agent_manager.get_profile_generation_agent())
+            providers = []
+            if agent:
+                providers.append((AZURE_AGENT, lambda: agent.generate_conversation_starter(client_profile)))
+            providers.append((OPENAI, lambda: self._generate_conversation_starter_openai(client_profile)))
+            result, _ = await provider_router.call("conversation-starter", providers)
+            return result
+
+        key = response_cache.make_key("conversation-starter", self._cache_model("gpt-4"), client_profile)
+        return await response_cache.get_or_compute(
+            "conversation-starter", key, generate, enabled=use_cache, bypass=bypass_cache
+        )
 
     async def _generate_conversation_starter_openai(self, client_profile: dict[str, Any]) -> str:
         """Generate conversation starter using OpenAI."""
@@ -319,7 +442,7 @@ The message should be natural and reflect the client's personality and concerns.
             if not self.openai:
                 raise ValueError("OpenAI client not configured")
 
-            response = await self.openai.chat.completions.create(
+            response = await self._create_chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "You are roleplaying as a financial advisory client."},
@@ -362,35 +485,56 @@ The message should be natural and reflect the client's personality and concerns.
         self,
         messages: list[dict[str, Any]],
         api_key: str | None = None,
+        previous: ObjectiveProgress | None = None,
+        evaluated_count: int = 0,
+        simulation_id: str | None = None,
     ) -> ObjectiveProgress | None:
         """
         Evaluate objective progress.
         Uses Azure agents with OpenAI fallback.
+
+        When ``previous`` is given, only ``messages[evaluated_count:]`` are sent
+        together with a compact summary of the previous assessment instead of
+        the whole conversation.
+
+        Args:
+            messages: Full conversation history
+            api_key: Optional OpenAI API key for the fallback path
+            previous: Progress from the last evaluation to carry forward
+            evaluated_count: Number of messages ``previous`` already covers
+            simulation_id: Simulation whose Azure evaluation thread to reuse
+
+        Returns:
+            Objective progress or None
         """
-        # Try Azure agent first
-        if self._should_use_azure():
-            try:
-                agent = agent_manager.get_evaluation_agent()
-                if agent and agent.is_initialized:
-                    result = await agent.evaluate_objectives(messages)
-                    if result:
-                        return ObjectiveProgress(
-                            rapport=result.get("rapport", 0),
-                            needs=result.get("needs", 0),
-                            objections=result.get("objections", 0),
-                            recommendations=result.get("recommendations", 0),
-                            explanation=result.get("explanation", ""),
-                        )
-            except Exception as e:
-                logger.warning(f"Azure agent failed, falling back to OpenAI: {e}")
-
-        # Fallback to OpenAI
-        return await self._evaluate_objectives_openai(messages, api_key)
+        state_summary = self._summarize_objective_state(previous) if previous else None
+        new_messages = messages[evaluated_count:] if previous else messages
+
+        agent = self._azure_agent(agent_manager.get_evaluation_agent())
+
+        async def evaluate_azure() -> ObjectiveProgress:
+            result = await agent.evaluate_objectives(new_messages, state_summary, session_id=simulation_id)
+            if not result:
+                raise ValueError("Evaluation agent returned no objective progress")
+            return ObjectiveProgress(
+                rapport=result.get("rapport", 0),
+                needs=result.get("needs", 0),
+                objections=result.get("objections", 0),
+                recommendations=result.get("recommendations", 0),
+                explanation=result.get("explanation", ""),
+            )
+
+        providers = [(AZURE_AGENT, evaluate_azure)] if agent else []
+        providers.append((OPENAI, lambda: self._evaluate_objectives_openai(new_messages, api_key, state_summary)))
+        with llm_priority(LLMPriority.OBJECTIVE):
+            result, _ = await provider_router.call("objective-evaluation", providers)
+        return result
 
     async def _evaluate_objectives_openai(
         self,
         messages: list[dict[str, Any]],
         api_key: str | None = None,
+        state_summary: str | None = None,
     ) -> ObjectiveProgress | None:
         """Evaluate objectives using OpenAI function calling."""
         try:
@@ -399,79 +543,63 @@ The message should be natural and reflect the client's personality and concerns.
                 logger.warning("No API key for objective evaluation")
                 return None
 
-            objective_tracking_messages = [
-                {
-                    "role": "system",
-                    "content": """You are an objective evaluator for a financial advisor training simulation.
-Evaluate the advisor's performance based on the conversation history below.
-The advisor is the user, and the client is the assistant.
-Assess progress on these objectives:
-1. Building Rapport: Establishing a connection with the client
-2. Needs Assessment: Discovering the client's financial situation and goals
-3. Handling Objections: Addressing concerns professionally
-4. Providing Recommendations: Suggesting appropriate options based on needs
-
-IMPORTANT SCORING INSTRUCTIONS:
-- Scores generally should not decrease unless there is a significant mistake or misstep
-- Base your evaluation on the ENTIRE conversation, not just the last message
-- Even brief exchanges that show warmth/professionalism should contribute to rapport (10-30%)
-- Any questions about client's situation should contribute to needs assessment (15-40%)
-
-Use the trackObjectiveProgress function to report progress percentages (0-100) on each objective.""",
-                },
-                *[m for m in messages if m.get("role") != "system"],
-            ]
+            objective_tracking_messages = self._build_objective_messages(messages, state_summary)
 
             async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://api.openai.com/v1/chat/completions",
-                    headers={
-                        "Content-Type": "application/json",
-                        "Authorization": f"Bearer {effective_api_key}",
-                    },
-                    json={
-                        "model": "gpt-4o",
-                        "messages": objective_tracking_messages,
-                        "temperature": 0.3,
-                        "max_tokens": 500,
-                        "tools": [
-                            {
-                                "type": "function",
-                                "function": {
-                                    "name": "trackObjectiveProgress",
-                                    "description": "Track progress on simulation objectives based on the conversation",
-                                    "parameters": {
-                                        "type": "object",
-                                        "properties": {
-                                            "rapport": {
-                                                "type": "number",
-                                                "description": "Progress percentage (0-100) on building rapport with the client",
-                                            },
-                                            "needs": {
-                                                "type": "number",
-                                                "description": "Progress percentage (0-100) on needs assessment",
-                                            },
-                                            "objections": {
-                                                "type": "number",
-                                                "description": "Progress percentage (0-100) on handling objections",
-                                            },
-                                            "recommendations": {
-                                                "type": "number",
-                                                "description": "Progress percentage (0-100) on providing recommendations",
-                                            },
-                                            "explanation": {
-                                                "type": "string",
-                                                "description": "Brief explanation of why these progress values were assigned",
+                response = await llm_scheduler.run(
+                    lambda: client.post(
+                        get_openai_url("chat/completions"),
+                        headers={
+                            "Content-Type": "application/json",
+                            "Authorization": f"Bearer {effective_api_key}",
+                        },
+                        json={
+                            "model": "gpt-4o",
+                            "messages": objective_tracking_messages,
+                            "temperature": 0.3,
+                            "max_tokens": 500,
+                            "tools": [
+                                {
+                                    "type": "function",
+                                    "function": {
+                                        "name": "trackObjectiveProgress",
+                                        "description": "Track progress on simulation objectives based on the conversation",
+                                        "parameters": {
+                                            "type": "object",
+                                            "properties": {
+                                                "rapport": {
+                                                    "type": "number",
+                                                    "description": "Progress percentage (0-100) on building rapport with the client",
+                                                },
+                                                "needs": {
+                                                    "type": "number",
+                                                    "description": "Progress percentage (0-100) on needs assessment",
+                                                },
+                                                "objections": {
+                                                    "type": "number",
+                                                    "description": "Progress percentage (0-100) on handling objections",
+                                                },
+                                                "recommendations": {
+                                                    "type": "number",
+                                                    "description": "Progress percentage (0-100) on providing recommendations",
+                                                },
+                                                "explanation": {
+                                                    "type": "string",
+                                                    "description": "Brief explanation of why these progress values were assigned",
+                                                },
                                             },
+                                            "required": ["rapport", "needs", "objections", "recommendations", "explanation"],
                                         },
-                                        "required": ["rapport", "needs", "objections", "recommendations", "explanation"],
                                     },
                                 },
-                            },
-                        ],
-                        "tool_choice": {"type": "function", "function": {"name": "trackObjectiveProgress"}},
-                    },
-                    timeout=30.0,
+                            ],
+                            "tool_choice": {"type": "function", "function": {"name": "trackObjectiveProgress"}},
+                        },
+                        timeout=30.0,
+                    ),
+                    api_key=effective_api_key,
+                    model="gpt-4o",
+                    estimated_tokens=count_message_tokens(objective_tracking_messages) + 500,
                 )
 
                 if response.status_code == 200:
@@ -488,13 +616,57 @@ Use the trackObjectiveProgress function to report progress percentages (0-100) o
             logger.error(f"Error evaluating objectives: {e}")
             return None
 
+    @staticmethod
+    def _build_objective_messages(
+        messages: list[dict[str, Any]],
+        state_summary: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Build the chat messages for an objective evaluation request.
+
+        Args:
+            messages: Conversation to evaluate, or only the new turns when
+                ``state_summary`` is given
+            state_summary: Compact summary of the previous assessment
+
+        Returns:
+            Messages for the chat completions API
+        """
+        conversation = [m for m in messages if m.get("role") != "system"]
+        if not state_summary:
+            return [{"role": "system", "content": OBJECTIVE_EVALUATION_PROMPT}, *conversation]
+
+        return [
+            {"role": "system", "content": INCREMENTAL_OBJECTIVE_EVALUATION_PROMPT},
+            {"role": "system", "content": state_summary},
+            *conversation,
+        ]
+
+    @staticmethod
+    def _summarize_objective_state(progress: ObjectiveProgress) -> str:
+        """Condense previous objective progress into a short state summary."""
+        explanation = (progress.explanation or "").strip()
+        if len(explanation) > OBJECTIVE_STATE_EXPLANATION_CHARS:
+            explanation = explanation[:OBJECTIVE_STATE_EXPLANATION_CHARS].rstrip() + "..."
+
+        summary = (
+            "Previous assessment of the earlier conversation: "
+            f"Building Rapport {progress.rapport:.0f}%, "
+            f"Needs Assessment {progress.needs:.0f}%, "
+            f"Handling Objections {progress.objections:.0f}%, "
+            f"Providing Recommendations {progress.recommendations:.0f}%."
+        )
+        if explanation:
+            summary += f"\nNotes: {explanation}"
+        return summary
+
     async def test_connection(self) -> bool:
         """Test OpenAI connection."""
         try:
             if not self.openai:
                 return False
 
-            response = await self.openai.chat.completions.create(
+            response = await self._create_chat_completion(
                 model="gpt-3.5-turbo",
                 messages=[{"role": "user", "content": "test"}],
                 max_tokens=5,
@@ -554,21 +726,9 @@ Return as structured text."""
         }
 
     async def _get_ai_parameters(self) -> dict[str, Any]:
-        """Get AI parameters from database."""
+        """Get AI parameters from the cached parameter snapshot."""
         try:
-            params = await parameter_repository.find_by_type("structured")
-
-            param_obj = {}
-            for p in params:
-                try:
-                    if isinstance(p.value, str):
-                        param_obj[p.name] = json.loads(p.value)
-                    else:
-                        param_obj[p.name] = p.value
-                except (json.JSONDecodeError, TypeError):
-                    param_obj[p.name] = p.value
-
-            return param_obj
+            return await parameter_service.get_parameter_snapshot("structured")
         except Exception as e:
             logger.error(f"Error getting AI parameters: {e}")
             return {
@@ -0,0 +1,187 @@
+"""
+Objective Service
+Runs objective evaluation off the client-response critical path and keeps
+short-lived per-simulation results for the browser to pick up
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.config import get_settings
+from app.models.chat import ObjectiveProgress
+from app.services.ai_service import ai_service
+from app.services.websocket_tts_service import get_tts_service
+from app.utils.llm_metrics import llm_call_context
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ObjectiveResult:
+    """Latest objective progress for a simulation."""
+    progress: dict[str, Any]
+    message_count: int
+    incremental_runs: int = 0
+    updated_at: float = field(default_factory=time.monotonic)
+
+
+class ObjectiveService:
+    """
+    Background objective evaluation with a short-lived result store.
+
+    Evaluation scores the advisor's turns, which are all present before the
+    client reply is generated, so it can run concurrently with the reply.
+    Results are pushed to the simulation's Socket.io room and kept for
+    ``objective_result_ttl_seconds`` so they can also be fetched.
+
+    The stored result doubles as carried-forward state: later evaluations send
+    only the turns added since it plus a short summary of its scores, with a
+    full re-evaluation every ``objective_full_evaluation_interval`` runs.
+    """
+
+    def __init__(self):
+        self.settings = get_settings()
+        self._results: dict[str, ObjectiveResult] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        # Evaluations without a simulation, held only so they are not garbage collected
+        self._background: set[asyncio.Task] = set()
+
+    def schedule_evaluation(
+        self,
+        simulation_id: str | None,
+        messages: list[dict[str, Any]],
+        api_key: str | None = None,
+    ) -> asyncio.Task | None:
+        """
+        Start evaluating objectives in the background.
+
+        Args:
+            simulation_id: Simulation the conversation belongs to
+            messages: Conversation history up to the advisor's latest message
+            api_key: Optional OpenAI API key for the fallback path
+
+        Returns:
+            The evaluation task, or None if there is not enough conversation yet
+        """
+        if len(messages) <= 2:
+            return None
+
+        # A newer turn supersedes any evaluation still running for this simulation
+        if simulation_id:
+            previous = self._tasks.get(simulation_id)
+            if previous and not previous.done():
+                previous.cancel()
+
+        task = asyncio.create_task(self._evaluate(simulation_id, list(messages), api_key))
+        if simulation_id:
+            self._tasks[simulation_id] = task
+            task.add_done_callback(lambda t: self._forget_task(simulation_id, t))
+        else:
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+        return task
+
+    def get_result(self, simulation_id: str) -> dict[str, Any] | None:
+        """Get the latest unexpired objective progress for a simulation."""
+        self._purge_expired()
+        result = self._results.get(simulation_id)
+        return result.progress if result else None
+
+    def is_pending(self, simulation_id: str) -> bool:
+        """Check if an evaluation is still running for a simulation."""
+        task = self._tasks.get(simulation_id)
+        return bool(task and not task.done())
+
+    @staticmethod
+    def completed_result(task: asyncio.Task | None) -> dict[str, Any] | None:
+        """Return a task's progress if it already finished, without waiting."""
+        if not task or not task.done() or task.cancelled() or task.exception():
+            return None
+        return task.result()
+
+    async def _evaluate(
+        self,
+        simulation_id: str | None,
+        messages: list[dict[str, Any]],
+        api_key: str | None,
+    ) -> dict[str, Any] | None:
+        """Evaluate objectives, store the result and push it to subscribers."""
+        previous = self._carried_state(simulation_id, messages)
+        try:
+            with llm_call_context(simulation_id=simulation_id):
+                if previous:
+                    progress = await ai_service.evaluate_objectives(
+                        messages,
+                        api_key,
+                        previous=ObjectiveProgress(**previous.progress),
+                        evaluated_count=previous.message_count,
+                        simulation_id=simulation_id,
+                    )
+                else:
+                    progress = await ai_service.evaluate_objectives(messages, api_key, simulation_id=simulation_id)
+        except Exception as e:
+            logger.error(f"[OBJECTIVES] Error evaluating objectives: {e}")
+            return None
+
+        if not progress:
+            return None
+
+        data = progress.model_dump()
+        if simulation_id:
+            self._results[simulation_id] = ObjectiveResult(
+                progress=data,
+                message_count=len(messages),
+                incremental_runs=previous.incremental_runs + 1 if previous else 0,
+            )
+
+            tts_service = get_tts_service()
+            if tts_service:
+                await tts_service.emit_to_simulation(
+                    simulation_id,
+                    "objective-progress",
+                    {"simulationId": simulation_id, "objectiveProgress": data, "messageCount": len(messages)},
+                )
+
+        return data
+
+    def _carried_state(
+        self,
+        simulation_id: str | None,
+        messages: list[dict[str, Any]],
+    ) -> ObjectiveResult | None:
+        """
+        Get the previous result to evaluate incrementally from.
+
+        Returns None when a full evaluation is due: there is no earlier result,
+        the conversation has not grown past it, or the interval was reached.
+        """
+        if not simulation_id:
+            return None
+
+        self._purge_expired()
+        previous = self._results.get(simulation_id)
+        if not previous or previous.message_count >= len(messages):
+            return None
+
+        interval = self.settings.objective_full_evaluation_interval
+        if interval <= 0 or previous.incremental_runs + 1 >= interval:
+            return None
+        return previous
+
+    def _forget_task(self, simulation_id: str, task: asyncio.Task) -> None:
+        """Drop a finished task unless a newer one replaced it."""
+        if self._tasks.get(simulation_id) is task:
+            self._tasks.pop(simulation_id, None)
+
+    def _purge_expired(self) -> None:
+        """Remove results older than the configured TTL."""
+        cutoff = time.monotonic() - self.settings.objective_result_ttl_seconds
+        for simulation_id in [k for k, v in self._results.items() if v.updated_at < cutoff]:
+            self._results.pop(simulation_id, None)
+
+
+# Singleton instance
+objective_service = ObjectiveService()
@@ -3,17 +3,39 @@ Parameter Service
 Business logic for parameter catalog operations
 """
 
+import asyncio
+import json
 import logging
+import time
 from typing import Any
 
+from app.config import get_settings
+from app.database import DatabasePool, notify
 from app.repositories.parameter_repository import parameter_repository
 from app.models.parameter import ParameterData, CreateParameterRequest, UpdateParameterRequest
 
 logger = logging.getLogger(__name__)
 
+# Postgres NOTIFY channel used to invalidate parameter snapshots in every worker
+PARAMETER_CHANGE_CHANNEL = "parameters_changed"
+
 
 class ParameterService:
-    """Service for parameter catalog operations."""
+    """
+    Service for parameter catalog operations.
+
+    Keeps a pre-decoded ``name -> value`` snapshot per parameter type for hot
+    paths such as AI generation. Mutations drop the local snapshots and notify
+    other workers over ``PARAMETER_CHANGE_CHANNEL``; snapshots also expire
+    after ``parameter_cache_ttl_seconds`` in case a notification is missed.
+    """
+
+    def __init__(self):
+        self.settings = get_settings()
+        self._snapshots: dict[str, tuple[dict[str, Any], float]] = {}
+        self._snapshot_version = 0
+        self._snapshot_lock = asyncio.Lock()
+        self._listening = False
 
     async def get_parameter_by_id(self, parameter_id: str) -> ParameterData | None:
         """Get parameter by ID."""
@@ -66,7 +88,9 @@ class ParameterService:
     async def create_parameter(self, param_data: CreateParameterRequest | dict[str, Any]) -> ParameterData:
         """Create new parameter."""
         try:
-            return await parameter_repository.create(param_data)
+            parameter = await parameter_repository.create(param_data)
+            await self._publish_change()
+            return parameter
         except Exception as e:
             logger.error(f"Error creating parameter: {e}")
             raise
@@ -78,15 +102,19 @@ class ParameterService:
     ) -> ParameterData:
         """Update parameter."""
         try:
-            return await parameter_repository.update(parameter_id, param_data)
+            parameter = await parameter_repository.update(parameter_id, param_data)
+            await self._publish_change()
+            return parameter
         except Exception as e:
             logger.error(f"Error updating parameter: {e}")
             raise
 
-    async def delete_parameter(self, parameter_id: str) -> None:
+    async def delete_parameter(self, parameter_id: str) -> bool:
         """Delete parameter."""
         try:
-            await parameter_repository.delete(parameter_id)
+            deleted = await parameter_repository.delete(parameter_id)
+            await self._publish_change()
+            return deleted
         except Exception as e:
             logger.error(f"Error deleting parameter: {e}")
             raise
@@ -128,10 +156,78 @@ class ParameterService:
                 # Delete all parameters
                 for ptype in ["structured", "narrative", "guardrail"]:
                     await parameter_repository.delete_by_type(ptype)
+            await self._publish_change()
         except Exception as e:
             logger.error(f"Error resetting parameters: {e}")
             raise
 
+    async def reset_to_defaults(self) -> None:
+        """Reset all parameters to defaults."""
+        await self.reset_parameters()
+
+    async def get_parameter_snapshot(self, param_type: str) -> dict[str, Any]:
+        """
+        Get decoded parameter values of a type, cached in memory.
+
+        Args:
+            param_type: Parameter type (structured, narrative, guardrail)
+
+        Returns:
+            Mapping of parameter name to its decoded value
+        """
+        cached = self._snapshots.get(param_type)
+        if cached and cached[1] > time.monotonic():
+            return dict(cached[0])
+
+        async with self._snapshot_lock:
+            cached = self._snapshots.get(param_type)
+            if cached and cached[1] > time.monotonic():
+                return dict(cached[0])
+
+            version = self._snapshot_version
+            params = await parameter_repository.find_by_type(param_type)
+
+            snapshot = {}
+            for p in params:
+                try:
+                    if isinstance(p.value, str):
+                        snapshot[p.name] = json.loads(p.value)
+                    else:
+                        snapshot[p.name] = p.value
+                except (json.JSONDecodeError, TypeError):
+                    snapshot[p.name] = p.value
+
+            # Don't cache a snapshot read while a change was being applied
+            if version == self._snapshot_version:
+                expires_at = time.monotonic() + self.settings.parameter_cache_ttl_seconds
+                self._snapshots[param_type] = (snapshot, expires_at)
+            return dict(snapshot)
+
+    def invalidate_snapshots(self) -> None:
+        """Drop cached parameter snapshots in this process."""
+        self._snapshot_version += 1
+        self._snapshots.clear()
+
+    async def start_change_listener(self) -> None:
+        """Invalidate snapshots when any worker changes parameters."""
+        if self._listening:
+            return
+        await DatabasePool.listen(PARAMETER_CHANGE_CHANNEL, self._on_change)
+        self._listening = True
+
+    def _on_change(self, payload: str) -> None:
+        """Handle a parameter change notification."""
+        logger.debug(f"[PARAMETERS] Change notification received: {payload or 'resync'}")
+        self.invalidate_snapshots()
+
+    async def _publish_change(self) -> None:
+        """Invalidate local snapshots and notify other workers."""
+        self.invalidate_snapshots()
+        try:
+            await notify(PARAMETER_CHANGE_CHANNEL, str(self._snapshot_version))
+        except Exception as e:
+            logger.warning(f"[PARAMETERS] Could not notify other workers of parameter change: {e}")
+
 
 # Singleton instance
 parameter_service = ParameterService()
@@ -0,0 +1,230 @@
+"""
+Profile Pool Service
+Keeps a warm pool of pre-generated client profiles per industry and difficulty
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any
+
+from app.config import get_settings, is_openai_configured
+from app.agents.agent_manager import agent_manager
+from app.agents.profile_generation_agent import validate_profile
+from app.repositories.profile_pool_repository import profile_pool_repository
+from app.services.ai_service import ai_service
+from app.utils.llm_scheduler import LLMPriority, llm_priority
+
+logger = logging.getLogger(__name__)
+
+
+class ProfilePoolService:
+    """
+    Warm pool of validated client profiles stored in the database.
+
+    A background task tops each (industry, difficulty) bucket up to
+    ``profile_pool_target_size`` in batches of ``profile_pool_batch_size``
+    concurrent generations. Starting a simulation pops a profile instead of
+    waiting on an LLM call and wakes the task to replace it.
+
+    Only one worker refills at a time, holding the repository's refill lock.
+    A bucket whose batch yields no valid profile, because generation failed
+    or every profile was rejected, is skipped for ``profile_pool_backoff_seconds``,
+    doubling per consecutive failure up to ``profile_pool_backoff_max_seconds``.
+    """
+
+    def __init__(self):
+        self.settings = get_settings()
+        self._task: asyncio.Task | None = None
+        self._wake = asyncio.Event()
+        self._hits = 0
+        self._misses = 0
+        self._generated = 0
+        self._rejected = 0
+        self._last_counts: dict[tuple[str, str], int] = {}
+        # Bucket -> consecutive failed batches and when it may be refilled again
+        self._failures: dict[tuple[str, str], int] = {}
+        self._retry_at: dict[tuple[str, str], float] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the pool is kept filled and served from."""
+        return self.settings.profile_pool_enabled
+
+    def start(self) -> None:
+        """Start the background refill task."""
+        if not self.settings.profile_pool_enabled or self._task:
+            return
+        self._task = asyncio.create_task(self._run())
+        logger.info("[PROFILE POOL] Refill task started")
+
+    async def stop(self) -> None:
+        """Stop the background refill task."""
+        if not self._task:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("[PROFILE POOL] Refill task stopped")
+
+    async def pop(self, industry: str, difficulty: str) -> dict[str, Any] | None:
+        """
+        Take a pre-generated profile from the pool.
+
+        Args:
+            industry: Simulation industry
+            difficulty: Difficulty level (beginner, intermediate, advanced)
+
+        Returns:
+            A validated profile, or None if the bucket is empty
+        """
+        if not self.settings.profile_pool_enabled:
+            return None
+
+        try:
+            profile = await profile_pool_repository.pop(industry, difficulty)
+        except Exception as e:
+            logger.warning(f"[PROFILE POOL] Could not pop profile: {e}")
+            return None
+
+        # Wake the refill task to replace what was taken, or to fill an empty bucket
+        self._wake.set()
+
+        if not profile or not validate_profile(profile)["valid"]:
+            self._misses += 1
+            logger.info(f"[PROFILE POOL] No pooled profile for {industry}/{difficulty}")
+            return None
+
+        self._hits += 1
+        return profile
+
+    async def top_up(self) -> int:
+        """
+        Refill every bucket below its target size by one batch.
+
+        Returns:
+            Number of profiles added
+        """
+        if not is_openai_configured() and not agent_manager.is_azure_available:
+            logger.debug("[PROFILE POOL] No AI backend configured, skipping refill")
+            return 0
+
+        async with profile_pool_repository.refill_lock() as locked:
+            if not locked:
+                logger.debug("[PROFILE POOL] Another worker is refilling, skipping")
+                return 0
+            return await self._fill_buckets()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get pool hit rate, bucket sizes from the last refill check and buckets backing off."""
+        lookups = self._hits + self._misses
+        now = time.monotonic()
+        return {
+            "enabled": self.settings.profile_pool_enabled,
+            "running": bool(self._task and not self._task.done()),
+            "hits": self._hits,
+            "misses": self._misses,
+            "hitRate": round(self._hits / lookups, 4) if lookups else 0.0,
+            "generated": self._generated,
+            "rejected": self._rejected,
+            "targetSize": self.settings.profile_pool_target_size,
+            "buckets": {f"{industry}/{difficulty}": count for (industry, difficulty), count in self._last_counts.items()},
+            "backedOff": {
+                f"{industry}/{difficulty}": round(retry_at - now, 1)
+                for (industry, difficulty), retry_at in self._retry_at.items()
+                if retry_at > now
+            },
+        }
+
+    def _back_off(self, bucket: tuple[str, str]) -> None:
+        """Pause refills of a bucket after a batch without a valid profile."""
+        failures = self._failures.get(bucket, 0) + 1
+        self._failures[bucket] = failures
+        delay = min(
+            self.settings.profile_pool_backoff_seconds * 2 ** (failures - 1),
+            self.settings.profile_pool_backoff_max_seconds,
+        )
+        self._retry_at[bucket] = time.monotonic() + delay
+        logger.warning(
+            f"[PROFILE POOL] No valid profile for {bucket[0]}/{bucket[1]} "
+            f"after {failures} batch(es), retrying in {delay:.0f}s"
+        )
+
+    async def _fill_buckets(self) -> int:
+        """Generate one batch for every bucket below its target size, skipping those backing off."""
+        counts = await profile_pool_repository.count_by_bucket()
+        self._last_counts = counts
+
+        added = 0
+        for industry in self.settings.profile_pool_industries:
+            for difficulty in self.settings.profile_pool_difficulties:
+                bucket = (industry, difficulty)
+                missing = self.settings.profile_pool_target_size - counts.get(bucket, 0)
+                if missing <= 0 or time.monotonic() < self._retry_at.get(bucket, 0.0):
+                    continue
+
+                batch = min(missing, self.settings.profile_pool_batch_size)
+                results = await asyncio.gather(
+                    *[self._generate(industry, difficulty) for _ in range(batch)],
+                    return_exceptions=True,
+                )
+                profiles = [r for r in results if isinstance(r, dict)]
+                if not profiles:
+                    self._back_off(bucket)
+                    continue
+
+                self._failures.pop(bucket, None)
+                self._retry_at.pop(bucket, None)
+                await profile_pool_repository.add_many(industry, difficulty, profiles, source="pool")
+                self._last_counts[bucket] = counts.get(bucket, 0) + len(profiles)
+                added += len(profiles)
+
+        if added:
+            logger.info(f"[PROFILE POOL] Added {added} profiles")
+        return added
+
+    async def _run(self) -> None:
+        """Refill periodically, or sooner when a profile is taken."""
+        while True:
+            self._wake.clear()
+            try:
+                # Keep filling in batches until every bucket is at target
+                while await self.top_up():
+                    pass
+            except Exception as e:
+                logger.error(f"[PROFILE POOL] Refill failed: {e}")
+
+            try:
+                async with asyncio.timeout(self.settings.profile_pool_refill_interval_seconds):
+                    await self._wake.wait()
+            except TimeoutError:
+                pass
+
+    async def _generate(self, industry: str, difficulty: str) -> dict[str, Any] | None:
+        """Generate one profile, discarding it if it fails validation."""
+        try:
+            # Pool refills yield to every live request
+            with llm_priority(LLMPriority.PROFILE_POOL):
+                profile = await ai_service.generate_client_profile(industry, difficulty)
+        except Exception as e:
+            logger.warning(f"[PROFILE POOL] Profile generation failed for {industry}/{difficulty}: {e}")
+            return None
+
+        validation = validate_profile(profile)
+        if not validation["valid"]:
+            self._rejected += 1
+            logger.warning(
+                f"[PROFILE POOL] Discarding profile for {industry}/{difficulty}, "
+                f"missing fields: {validation['missing_fields']}"
+            )
+            return None
+
+        self._generated += 1
+        return profile
+
+
+# Singleton instance
+profile_pool_service = ProfilePoolService()
@@ -0,0 +1,292 @@
+"""
+Response Cache Service
+Content-addressed cache for AI calls that are pure functions of their inputs
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, TypeVar
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Disk entries are pruned back under the limit once per this many writes
+DISK_PRUNE_INTERVAL = 100
+
+
+@dataclass
+class CacheStats:
+    """Hit and miss counters for one cache namespace."""
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    bypasses: int = 0
+    coalesced: int = 0
+    evictions: int = 0
+
+
+@dataclass
+class _CacheEntry:
+    """Cached value with its absolute expiry time."""
+    value: Any
+    expires_at: float
+
+
+class ResponseCache:
+    """
+    Two-tier response cache keyed by a hash of model, prompt and parameters.
+
+    The in-memory tier is an LRU bounded by ``response_cache_max_entries``. If
+    ``response_cache_dir`` is set, entries are also written there as JSON so
+    they survive restarts and are shared between workers. Identical calls that
+    arrive while the first is still running wait for its result instead of
+    making their own request.
+    """
+
+    def __init__(self):
+        self.settings = get_settings()
+        self._memory: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._stats: dict[str, CacheStats] = defaultdict(CacheStats)
+        self._disk_writes = 0
+
+        cache_dir = self.settings.response_cache_dir
+        self._disk_dir = Path(cache_dir) if cache_dir else None
+        if self._disk_dir:
+            self._disk_dir.mkdir(parents=True, exist_ok=True)
+            logger.info(f"[CACHE] On-disk response cache at {self._disk_dir}")
+
+    @staticmethod
+    def make_key(namespace: str, model: str, prompt: Any, params: dict[str, Any] | None = None) -> str:
+        """
+        Build a content-addressed cache key.
+
+        Args:
+            namespace: Kind of call being cached
+            model: Model or agent producing the response
+            prompt: Prompt or inputs the response is derived from
+            params: Generation parameters that affect the response
+
+        Returns:
+            Hex SHA-256 of the canonical JSON of all inputs
+        """
+        payload = json.dumps(
+            {"namespace": namespace, "model": model, "prompt": prompt, "params": params or {}},
+            sort_keys=True,
+            default=str,
+            separators=(",", ":"),
+        )
+        return f"{namespace}:{hashlib.sha256(payload.encode()).hexdigest()}"
+
+    async def get_or_compute(
+        self,
+        namespace: str,
+        key: str,
+        compute: Callable[[], Awaitable[T]],
+        ttl_seconds: int | None = None,
+        enabled: bool = True,
+        bypass: bool = False,
+        should_cache: Callable[[T], bool] | None = None,
+    ) -> T:
+        """
+        Return a cached response or compute and store it.
+
+        Args:
+            namespace: Kind of call, used for metrics
+            key: Key from ``make_key``
+            compute: Coroutine factory producing the response on a miss
+            ttl_seconds: Entry lifetime, defaults to ``response_cache_ttl_seconds``
+            enabled: Per-call opt-in; False skips the cache entirely
+            bypass: Skip the lookup but store the fresh response
+            should_cache: Optional predicate deciding whether a response is stored
+
+        Returns:
+            The cached or freshly computed response
+        """
+        if not enabled or not self.settings.response_cache_enabled:
+            return await compute()
+
+        stats = self._stats[namespace]
+
+        if bypass:
+            stats.bypasses += 1
+        else:
+            entry = self._get_memory(key)
+            if entry:
+                stats.memory_hits += 1
+                return copy.deepcopy(entry.value)
+
+            entry = await self._get_disk(key)
+            if entry:
+                stats.disk_hits += 1
+                self._set_memory(key, entry, stats)
+                return copy.deepcopy(entry.value)
+
+            inflight = self._inflight.get(key)
+            if inflight:
+                try:
+                    value = await asyncio.shield(inflight)
+                    stats.coalesced += 1
+                    return copy.deepcopy(value)
+                except asyncio.CancelledError:
+                    # Only recompute if the first caller was cancelled, not this one
+                    if not inflight.cancelled():
+                        raise
+
+            stats.misses += 1
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters re-raise it; mark it retrieved so an unwatched failure isn't logged
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+        finally:
+            if self._inflight.get(key) is future:
+                self._inflight.pop(key, None)
+
+        if should_cache is None or should_cache(value):
+            entry = _CacheEntry(
+                value=copy.deepcopy(value),
+                expires_at=time.time() + (ttl_seconds or self.settings.response_cache_ttl_seconds),
+            )
+            self._set_memory(key, entry, stats)
+            await self._set_disk(key, entry)
+
+        return value
+
+    async def invalidate(self, key: str) -> None:
+        """Remove an entry from both tiers."""
+        self._memory.pop(key, None)
+        if self._disk_dir:
+            await asyncio.to_thread(self._disk_path(key).unlink, missing_ok=True)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get hit-rate metrics per namespace and overall."""
+        totals = CacheStats()
+        for stats in self._stats.values():
+            for name, value in asdict(stats).items():
+                setattr(totals, name, getattr(totals, name) + value)
+
+        return {
+            "enabled": self.settings.response_cache_enabled,
+            "memoryEntries": len(self._memory),
+            "memoryMaxEntries": self.settings.response_cache_max_entries,
+            "diskEnabled": self._disk_dir is not None,
+            "inflight": len(self._inflight),
+            "totals": self._format_stats(totals),
+            "namespaces": {namespace: self._format_stats(stats) for namespace, stats in self._stats.items()},
+        }
+
+    @staticmethod
+    def _format_stats(stats: CacheStats) -> dict[str, Any]:
+        """Format counters with the share of lookups answered without a new AI call."""
+        hits = stats.memory_hits + stats.disk_hits + stats.coalesced
+        lookups = hits + stats.misses
+        return {
+            "memoryHits": stats.memory_hits,
+            "diskHits": stats.disk_hits,
+            "coalesced": stats.coalesced,
+            "misses": stats.misses,
+            "bypasses": stats.bypasses,
+            "evictions": stats.evictions,
+            "hitRate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _get_memory(self, key: str) -> _CacheEntry | None:
+        """Get an unexpired in-memory entry and mark it recently used."""
+        entry = self._memory.get(key)
+        if not entry:
+            return None
+        if entry.expires_at <= time.time():
+            self._memory.pop(key, None)
+            return None
+        self._memory.move_to_end(key)
+        return entry
+
+    def _set_memory(self, key: str, entry: _CacheEntry, stats: CacheStats) -> None:
+        """Store an in-memory entry, evicting the least recently used ones."""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.settings.response_cache_max_entries:
+            self._memory.popitem(last=False)
+            stats.evictions += 1
+
+    def _disk_path(self, key: str) -> Path:
+        """Path of the on-disk entry for a key."""
+        return self._disk_dir / f"{key.replace(':', '_')}.json"
+
+    async def _get_disk(self, key: str) -> _CacheEntry | None:
+        """Get an unexpired on-disk entry."""
+        if not self._disk_dir:
+            return None
+        try:
+            return await asyncio.to_thread(self._read_disk_entry, self._disk_path(key))
+        except Exception as e:
+            logger.warning(f"[CACHE] Failed to read disk entry {key}: {e}")
+            return None
+
+    async def _set_disk(self, key: str, entry: _CacheEntry) -> None:
+        """Write an on-disk entry, pruning old entries periodically."""
+        if not self._disk_dir:
+            return
+        try:
+            await asyncio.to_thread(self._write_disk_entry, self._disk_path(key), entry)
+            self._disk_writes += 1
+            if self._disk_writes % DISK_PRUNE_INTERVAL == 0:
+                await asyncio.to_thread(self._prune_disk)
+        except (TypeError, ValueError) as e:
+            logger.debug(f"[CACHE] Response for {key} is not JSON serializable, kept in memory only: {e}")
+        except Exception as e:
+            logger.warning(f"[CACHE] Failed to write disk entry {key}: {e}")
+
+    @staticmethod
+    def _read_disk_entry(path: Path) -> _CacheEntry | None:
+        """Read a disk entry, deleting it if expired. Runs in a worker thread."""
+        if not path.exists():
+            return None
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("expires_at", 0) <= time.time():
+            path.unlink(missing_ok=True)
+            return None
+        # Touch so pruning removes the least recently used entries first
+        os.utime(path)
+        return _CacheEntry(value=data["value"], expires_at=data["expires_at"])
+
+    @staticmethod
+    def _write_disk_entry(path: Path, entry: _CacheEntry) -> None:
+        """Atomically write a disk entry. Runs in a worker thread."""
+        payload = json.dumps({"value": entry.value, "expires_at": entry.expires_at})
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(payload, encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def _prune_disk(self) -> None:
+        """Delete the least recently used disk entries over the limit. Runs in a worker thread."""
+        files = sorted(self._disk_dir.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        excess = len(files) - self.settings.response_cache_disk_max_entries
+        for path in files[: max(excess, 0)]:
+            path.unlink(missing_ok=True)
+
+
+# Singleton instance
+response_cache = ResponseCache()
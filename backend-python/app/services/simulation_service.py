@@ -12,6 +12,9 @@ from app.repositories.competency_repository import competency_repository
 from app.repositories.file_rubric_repository import file_rubric_repository as rubric_repository
 from app.repositories.feedback_repository import feedback_repository
 from app.repositories.engagement_repository import engagement_repository
+from app.services.ai_service import ai_service
+from app.services.profile_pool_service import profile_pool_service
+from app.agents.profile_generation_agent import validate_profile
 from app.models.simulation import (
     SimulationData,
     SimulationWithDetails,
@@ -131,6 +134,11 @@ class SimulationService:
                 self.DIFFICULTY_MAP.get(difficulty, 1),
             ) if competencies else []
 
+            # Use the caller's profile, else a pooled one if the pool is enabled
+            client_profile = data.get("client_profile") or data.get("clientProfile") or {}
+            if not client_profile and profile_pool_service.enabled:
+                client_profile = await self.get_client_profile(industry, difficulty)
+
             # Create simulation session
             simulation = await simulation_repository.create({
                 "simulation_id": data.get("simulation_id") or data.get("simulationId"),
@@ -138,7 +146,7 @@ class SimulationService:
                 "industry": industry,
                 "subcategory": data.get("subcategory"),
                 "difficulty": difficulty,
-                "client_profile": data.get("client_profile") or data.get("clientProfile") or {},
+                "client_profile": client_profile,
                 "objectives_completed": [],
             })
 
@@ -301,6 +309,27 @@ class SimulationService:
             logger.error(f"Error getting user stats: {e}")
             raise
 
+    async def get_client_profile(self, industry: str, difficulty: str) -> dict[str, Any]:
+        """
+        Get a client profile from the warm pool, generating one live if it is empty or disabled.
+
+        Returns:
+            A validated profile, or an empty dict if generation failed
+        """
+        profile = await profile_pool_service.pop(industry, difficulty)
+        if profile:
+            logger.info(f"[CLIENT PROFILE] Using pooled client profile for {industry}/{difficulty}")
+            return profile
+
+        try:
+            profile = await ai_service.generate_client_profile(industry, difficulty)
+            if validate_profile(profile)["valid"]:
+                return profile
+            logger.warning("[CLIENT PROFILE] Generated client profile failed validation")
+        except Exception as e:
+            logger.warning(f"[CLIENT PROFILE] Could not generate client profile: {e}")
+        return {}
+
     def _is_valid_industry(self, industry: str) -> bool:
         """Validate industry."""
         return industry in self.VALID_INDUSTRIES
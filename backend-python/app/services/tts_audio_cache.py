@@ -0,0 +1,219 @@
+"""
+TTS Audio Cache Service
+Content-addressed cache of generated speech audio, in memory and on disk
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AudioCacheStats:
+    """Hit, miss and byte counters of the audio cache."""
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    memory_evictions: int = 0
+    disk_evictions: int = 0
+    bytes_served: int = 0
+
+
+class TTSAudioCache:
+    """
+    Two-tier cache of speech audio keyed by a hash of text, voice, speed,
+    model and format.
+
+    The in-memory tier is an LRU bounded by ``tts_cache_memory_max_bytes``. If
+    ``tts_cache_dir`` is set, audio is also written there so it survives
+    restarts and is shared between workers; the least recently used files
+    are deleted once the directory exceeds ``tts_cache_disk_max_bytes``.
+    """
+
+    def __init__(self):
+        self.settings = get_settings()
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = 0
+        self._stats = AudioCacheStats()
+
+        cache_dir = self.settings.tts_cache_dir
+        self._disk_dir = Path(cache_dir) if cache_dir else None
+        if self._disk_dir:
+            self._disk_dir.mkdir(parents=True, exist_ok=True)
+            self._disk_bytes = self._disk_usage()
+            logger.info(f"[TTS CACHE] On-disk audio cache at {self._disk_dir}")
+
+    @staticmethod
+    def make_key(text: str, voice: str, speed: float, model: str, response_format: str) -> str:
+        """
+        Build a content-addressed cache key.
+
+        Returns:
+            Hex SHA-256 of the canonical JSON of the speech parameters
+        """
+        payload = json.dumps(
+            {"text": text, "voice": voice, "speed": float(speed), "model": model, "format": response_format},
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def get(self, key: str) -> bytes | None:
+        """
+        Get cached audio, promoting disk hits to memory.
+
+        Returns:
+            The audio, or None on a miss or if the cache is disabled
+        """
+        if not self.settings.tts_cache_enabled:
+            return None
+
+        audio = self._memory.get(key)
+        if audio is not None:
+            self._memory.move_to_end(key)
+            self._stats.memory_hits += 1
+            self._stats.bytes_served += len(audio)
+            return audio
+
+        audio = await self._get_disk(key)
+        if audio is not None:
+            self._set_memory(key, audio)
+            self._stats.disk_hits += 1
+            self._stats.bytes_served += len(audio)
+            return audio
+
+        self._stats.misses += 1
+        return None
+
+    async def put(self, key: str, audio: bytes) -> None:
+        """Store generated audio in both tiers."""
+        if not self.settings.tts_cache_enabled or not audio:
+            return
+        self._set_memory(key, audio)
+        await self._set_disk(key, audio)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get hit rate, tier sizes and the bytes served without calling the TTS API."""
+        stats = self._stats
+        hits = stats.memory_hits + stats.disk_hits
+        lookups = hits + stats.misses
+        return {
+            "enabled": self.settings.tts_cache_enabled,
+            "memoryEntries": len(self._memory),
+            "memoryBytes": self._memory_bytes,
+            "memoryMaxBytes": self.settings.tts_cache_memory_max_bytes,
+            "diskEnabled": self._disk_dir is not None,
+            "diskBytes": self._disk_bytes,
+            "diskMaxBytes": self.settings.tts_cache_disk_max_bytes,
+            "memoryHits": stats.memory_hits,
+            "diskHits": stats.disk_hits,
+            "misses": stats.misses,
+            "memoryEvictions": stats.memory_evictions,
+            "diskEvictions": stats.disk_evictions,
+            "bytesSaved": stats.bytes_served,
+            "hitRate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _set_memory(self, key: str, audio: bytes) -> None:
+        """Store audio in memory, evicting the least recently used entries over the byte limit."""
+        if len(audio) > self.settings.tts_cache_memory_max_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        self._memory[key] = audio
+        self._memory_bytes += len(audio)
+        while self._memory_bytes > self.settings.tts_cache_memory_max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self._stats.memory_evictions += 1
+
+    def _disk_path(self, key: str) -> Path:
+        """Path of the on-disk entry for a key."""
+        return self._disk_dir / f"{key}.audio"
+
+    async def _get_disk(self, key: str) -> bytes | None:
+        """Get audio from disk."""
+        if not self._disk_dir:
+            return None
+        try:
+            return await asyncio.to_thread(self._read_disk_entry, self._disk_path(key))
+        except Exception as e:
+            logger.warning(f"[TTS CACHE] Failed to read disk entry {key}: {e}")
+            return None
+
+    async def _set_disk(self, key: str, audio: bytes) -> None:
+        """Write audio to disk, pruning old entries once over the byte limit."""
+        if not self._disk_dir:
+            return
+        try:
+            self._disk_bytes += await asyncio.to_thread(self._write_disk_entry, self._disk_path(key), audio)
+            if self._disk_bytes > self.settings.tts_cache_disk_max_bytes:
+                self._disk_bytes, evicted = await asyncio.to_thread(self._prune_disk)
+                self._stats.disk_evictions += evicted
+        except Exception as e:
+            logger.warning(f"[TTS CACHE] Failed to write disk entry {key}: {e}")
+
+    @staticmethod
+    def _read_disk_entry(path: Path) -> bytes | None:
+        """Read a disk entry. Runs in a worker thread."""
+        if not path.exists():
+            return None
+        audio = path.read_bytes()
+        # Touch so pruning removes the least recently used entries first
+        os.utime(path)
+        return audio
+
+    @staticmethod
+    def _write_disk_entry(path: Path, audio: bytes) -> int:
+        """
+        Atomically write a disk entry. Runs in a worker thread.
+
+        Returns:
+            Bytes added to the directory
+        """
+        existing = path.stat().st_size if path.exists() else 0
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(audio)
+        os.replace(tmp_path, path)
+        return len(audio) - existing
+
+    def _disk_usage(self) -> int:
+        """Total size of the disk entries."""
+        return sum(path.stat().st_size for path in self._disk_dir.glob("*.audio"))
+
+    def _prune_disk(self) -> tuple[int, int]:
+        """
+        Delete the least recently used disk entries over the byte limit. Runs in a worker thread.
+
+        The directory is rescanned, so entries written by other workers are counted too.
+
+        Returns:
+            Remaining bytes and the number of entries deleted
+        """
+        files = [(path, path.stat()) for path in self._disk_dir.glob("*.audio")]
+        files.sort(key=lambda item: item[1].st_mtime)
+        total = sum(stat.st_size for _, stat in files)
+        evicted = 0
+        for path, stat in files:
+            if total <= self.settings.tts_cache_disk_max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
+            evicted += 1
+        return total, evicted
+
+
+# Singleton instance
+tts_audio_cache = TTSAudioCache()
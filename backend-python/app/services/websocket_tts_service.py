@@ -6,6 +6,7 @@ Handles real-time text-to-speech streaming using Socket.io and OpenAI TTS API
 import asyncio
 import base64
 import logging
+import struct
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any
@@ -13,16 +14,42 @@ from typing import Any
 import httpx
 import socketio
 
-from app.config import get_settings
+from app.config import get_openai_url, get_settings
+from app.repositories.simulation_repository import simulation_repository
+from app.services.auth_service import auth_service
+from app.services.tts_audio_cache import tts_audio_cache
+from app.utils.credit_window import CreditWindow
+from app.utils.validation import validate_uuid
 
 logger = logging.getLogger(__name__)
 
+# Use tts-1 for lower latency, tts-1-hd for higher quality
+TTS_MODEL = "tts-1"
+TTS_RESPONSE_FORMAT = "mp3"
+
+# 16KB chunks for optimal streaming, until a client's throughput is measured
+AUDIO_CHUNK_SIZE = 16384
+
+# Audio chunk encodings; clients that don't ask for binary get base64 JSON
+AUDIO_TRANSPORT_BINARY = "binary"
+AUDIO_TRANSPORT_BASE64 = "base64"
+
+# Binary audio chunks start with the chunk's sequence number on the connection
+AUDIO_FRAME_HEADER = struct.Struct(">I")
+
+# Clients that acknowledge audio chunks ask for this flow control; others are paced by a fixed delay
+FLOW_CONTROL_CREDITS = "credits"
+
 
 @dataclass
 class ConnectionInfo:
     """Connection information for a client."""
     sid: str
     is_streaming: bool = False
+    audio_transport: str = AUDIO_TRANSPORT_BASE64
+    credit_window: CreditWindow | None = None
+    next_sequence: int = 0
+    session_token: str | None = None
     connected_at: datetime = field(default_factory=datetime.utcnow)
 
 
@@ -50,15 +77,27 @@ class WebSocketTTSService:
         logger.info("[TTS Service] Setting up event handlers")
 
         @self.sio.event
-        async def connect(sid: str, environ: dict[str, Any]) -> None:
+        async def connect(sid: str, environ: dict[str, Any], auth: dict[str, Any] | None = None) -> None:
             logger.info(f"[TTS Service] Client connected: {sid}")
-            self.connections[sid] = ConnectionInfo(sid=sid)
+            conn = ConnectionInfo(
+                sid=sid,
+                audio_transport=self._negotiate_audio_transport(auth),
+                credit_window=self._negotiate_flow_control(auth),
+                session_token=auth.get("token") if isinstance(auth, dict) else None,
+            )
+            self.connections[sid] = conn
 
-            # Send connection confirmation
+            # Send connection confirmation, with the audio transport and flow control the client should expect
             logger.info(f"[TTS Service] Sending tts-connected event to {sid}")
             await self.sio.emit(
                 "tts-connected",
-                {"message": "TTS service ready", "socketId": sid},
+                {
+                    "message": "TTS service ready",
+                    "socketId": sid,
+                    "audioTransport": conn.audio_transport,
+                    "flowControl": FLOW_CONTROL_CREDITS if conn.credit_window else None,
+                    "credits": conn.credit_window.window if conn.credit_window else None,
+                },
                 to=sid,
             )
             logger.info(f"[TTS Service] tts-connected event sent to {sid}")
@@ -66,7 +105,10 @@ class WebSocketTTSService:
         @self.sio.event
         async def disconnect(sid: str) -> None:
             logger.info(f"[TTS Service] Client disconnected: {sid}")
-            self.connections.pop(sid, None)
+            conn = self.connections.pop(sid, None)
+            if conn and conn.credit_window:
+                conn.is_streaming = False
+                conn.credit_window.wake()
 
         @self.sio.on("generate-speech")
         async def on_generate_speech(sid: str, data: dict[str, Any]) -> dict[str, Any]:
@@ -82,11 +124,43 @@ class WebSocketTTSService:
                 )
                 return {"success": False, "error": "Failed to generate speech"}
 
+        @self.sio.on("subscribe-simulation")
+        async def on_subscribe_simulation(sid: str, data: dict[str, Any]) -> dict[str, Any]:
+            simulation_id = (data or {}).get("simulationId")
+            if not simulation_id:
+                return {"success": False, "error": "simulationId is required"}
+            if not await self._can_subscribe(sid, simulation_id):
+                logger.warning(f"[TTS Service] Client {sid} not authorized for simulation {simulation_id}")
+                return {"success": False, "error": "Not authorized to access this simulation"}
+            await self.sio.enter_room(sid, self._simulation_room(simulation_id))
+            logger.info(f"[TTS Service] Client {sid} subscribed to simulation {simulation_id}")
+            return {"success": True}
+
+        @self.sio.on("unsubscribe-simulation")
+        async def on_unsubscribe_simulation(sid: str, data: dict[str, Any]) -> dict[str, Any]:
+            simulation_id = (data or {}).get("simulationId")
+            if simulation_id:
+                await self.sio.leave_room(sid, self._simulation_room(simulation_id))
+            return {"success": True}
+
+        @self.sio.on("audio-ack")
+        async def on_audio_ack(sid: str, data: dict[str, Any]) -> None:
+            conn = self.connections.get(sid)
+            if not conn or not conn.credit_window:
+                return
+            sequence = (data or {}).get("sequence")
+            credits = (data or {}).get("credits")
+            if not isinstance(sequence, int):
+                return
+            conn.credit_window.ack(sequence, credits if isinstance(credits, int) else None)
+
         @self.sio.on("stop-speech")
         async def on_stop_speech(sid: str) -> None:
             conn = self.connections.get(sid)
             if conn:
                 conn.is_streaming = False
+                if conn.credit_window:
+                    conn.credit_window.wake()
                 logger.info(f"[TTS Service] Speech stopped for client: {sid}")
 
     async def _handle_speech_generation(self, sid: str, data: dict[str, Any]) -> None:
@@ -123,67 +197,73 @@ class WebSocketTTSService:
                 to=sid,
             )
 
-            # Call OpenAI TTS API
-            api_key = self.settings.openai_api_key
-            if not api_key:
-                raise ValueError("OpenAI API key not configured")
-
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://api.openai.com/v1/audio/speech",
-                    headers={
-                        "Authorization": f"Bearer {api_key}",
-                        "Content-Type": "application/json",
-                    },
-                    json={
-                        "model": "tts-1",  # Use tts-1 for lower latency, tts-1-hd for higher quality
-                        "input": text,
-                        "voice": voice,
-                        "speed": speed,
-                        "response_format": "mp3",
-                    },
-                    timeout=60.0,
-                )
-
-                if response.status_code != 200:
-                    raise ValueError(f"OpenAI TTS API error: {response.status_code} - {response.text}")
-
-                # Stream the audio data
-                total_bytes = 0
-                chunk_size = 16384  # 16KB chunks for optimal streaming
-
-                async for chunk in response.aiter_bytes(chunk_size):
-                    # Check if client stopped or disconnected
-                    if not conn.is_streaming or sid not in self.connections:
-                        logger.info(f"[TTS Service] Streaming interrupted for client {sid}")
-                        break
-
-                    total_bytes += len(chunk)
-
-                    # Emit audio chunk
-                    await self.sio.emit(
-                        "audio-chunk",
-                        {
-                            "data": base64.b64encode(chunk).decode("utf-8"),
-                            "index": total_bytes // chunk_size,
-                        },
-                        to=sid,
-                    )
-
-                    # Small delay to prevent overwhelming the client
-                    await asyncio.sleep(0.005)
-
-                # Emit end event
-                await self.sio.emit(
-                    "speech-end",
-                    {
-                        "totalBytes": total_bytes,
-                        "duration": total_bytes / 16000,  # Approximate duration
-                    },
-                    to=sid,
-                )
+            # Identical requests (greetings, repeated lines) reuse earlier audio
+            cache_key = tts_audio_cache.make_key(text, voice, speed, TTS_MODEL, TTS_RESPONSE_FORMAT)
+            audio = await tts_audio_cache.get(cache_key)
+            cached = audio is not None
+            if not cached:
+                audio = await self._fetch_speech(text, voice, speed)
+                await tts_audio_cache.put(cache_key, audio)
+
+            # Stream the audio data
+            total_bytes = 0
+            window = conn.credit_window
+
+            while total_bytes < len(audio):
+                chunk_size = window.next_chunk_size(AUDIO_CHUNK_SIZE) if window else AUDIO_CHUNK_SIZE
+                chunk = audio[total_bytes:total_bytes + chunk_size]
+
+                # Wait until the client has acknowledged enough earlier chunks
+                if window:
+                    try:
+                        await window.acquire(
+                            len(chunk),
+                            self.settings.tts_stream_ack_timeout_seconds,
+                            lambda: conn.is_streaming and sid in self.connections,
+                        )
+                    except TimeoutError:
+                        raise ValueError("Client stopped acknowledging audio") from None
+
+                # Check if client stopped or disconnected
+                if not conn.is_streaming or sid not in self.connections:
+                    logger.info(f"[TTS Service] Streaming interrupted for client {sid}")
+                    break
+
+                total_bytes += len(chunk)
+                sequence = conn.next_sequence
+                conn.next_sequence += 1
+
+                # Emit audio chunk, counting it against the window before its ack can arrive
+                if window:
+                    window.sent(sequence, len(chunk))
+                if conn.audio_transport == AUDIO_TRANSPORT_BINARY:
+                    payload = AUDIO_FRAME_HEADER.pack(sequence) + chunk
+                else:
+                    payload = {
+                        "data": base64.b64encode(chunk).decode("utf-8"),
+                        "index": total_bytes // AUDIO_CHUNK_SIZE,
+                        "sequence": sequence,
+                    }
+                await self.sio.emit("audio-chunk", payload, to=sid)
+
+                if not window:
+                    # Small delay to prevent overwhelming clients without flow control
+                    await asyncio.sleep(self.settings.tts_stream_legacy_chunk_delay_ms / 1000)
+
+            # Emit end event
+            await self.sio.emit(
+                "speech-end",
+                {
+                    "totalBytes": total_bytes,
+                    "duration": total_bytes / 16000,  # Approximate duration
+                },
+                to=sid,
+            )
 
-                logger.info(f"[TTS Service] Speech generation completed for client {sid} ({total_bytes} bytes)")
+            logger.info(
+                f"[TTS Service] Speech generation completed for client {sid} "
+                f"({total_bytes} bytes{', cached' if cached else ''})"
+            )
 
         except Exception as e:
             logger.error(f"[TTS Service] Error in speech generation: {e}")
@@ -195,20 +275,120 @@ class WebSocketTTSService:
         finally:
             conn.is_streaming = False
 
+    def _negotiate_audio_transport(self, auth: dict[str, Any] | None) -> str:
+        """Pick binary audio frames if the client asked for them in its handshake, base64 otherwise."""
+        requested = auth.get("audioTransport") if isinstance(auth, dict) else None
+        if requested == AUDIO_TRANSPORT_BINARY and self.settings.tts_binary_audio_enabled:
+            return AUDIO_TRANSPORT_BINARY
+        return AUDIO_TRANSPORT_BASE64
+
+    def _negotiate_flow_control(self, auth: dict[str, Any] | None) -> CreditWindow | None:
+        """Give clients that asked for credit-based flow control in their handshake a send window."""
+        requested = auth.get("flowControl") if isinstance(auth, dict) else None
+        if requested != FLOW_CONTROL_CREDITS or not self.settings.tts_flow_control_enabled:
+            return None
+        return CreditWindow(
+            credits=self.settings.tts_stream_initial_credits,
+            max_credits=self.settings.tts_stream_max_credits,
+            max_buffered_bytes=self.settings.tts_stream_max_buffered_bytes,
+            min_chunk_bytes=self.settings.tts_stream_min_chunk_bytes,
+            max_chunk_bytes=self.settings.tts_stream_max_chunk_bytes,
+            target_chunk_ms=self.settings.tts_stream_target_chunk_ms,
+        )
+
+    async def _fetch_speech(self, text: str, voice: str, speed: float) -> bytes:
+        """Generate speech audio with the OpenAI TTS API."""
+        api_key = self.settings.openai_api_key
+        if not api_key:
+            raise ValueError("OpenAI API key not configured")
+
+        async with httpx.AsyncClient() as client:
+            response = await client.post(
+                get_openai_url("audio/speech"),
+                headers={
+                    "Authorization": f"Bearer {api_key}",
+                    "Content-Type": "application/json",
+                },
+                json={
+                    "model": TTS_MODEL,
+                    "input": text,
+                    "voice": voice,
+                    "speed": speed,
+                    "response_format": TTS_RESPONSE_FORMAT,
+                },
+                timeout=60.0,
+            )
+
+        if response.status_code != 200:
+            raise ValueError(f"OpenAI TTS API error: {response.status_code} - {response.text}")
+
+        return response.content
+
+    @staticmethod
+    def _simulation_room(simulation_id: str) -> str:
+        """Socket.io room name for a simulation's subscribers."""
+        return f"simulation:{simulation_id}"
+
+    async def _can_subscribe(self, sid: str, simulation_id: str) -> bool:
+        """Check that the client's session belongs to the simulation's owner or an admin."""
+        # The auth middleware imports the services package, which imports this module
+        from app.middleware.auth import verify_resource_ownership
+
+        conn = self.connections.get(sid)
+        if not conn or not conn.session_token:
+            return False
+        try:
+            user = await auth_service.verify_session(conn.session_token)
+            if not user:
+                return False
+            if validate_uuid(simulation_id):
+                simulation = await simulation_repository.find_by_id(simulation_id)
+            else:
+                simulation = await simulation_repository.find_by_simulation_id(simulation_id)
+        except Exception as e:
+            logger.error(f"[TTS Service] Error authorizing {sid} for simulation {simulation_id}: {e}")
+            return False
+        return simulation is not None and verify_resource_ownership(user, simulation.user_id)
+
+    async def emit_to_simulation(self, simulation_id: str, event: str, data: dict[str, Any]) -> None:
+        """Emit an event to every client subscribed to a simulation."""
+        try:
+            await self.sio.emit(event, data, room=self._simulation_room(simulation_id))
+        except Exception as e:
+            logger.error(f"[TTS Service] Error emitting {event} for simulation {simulation_id}: {e}")
+
     def get_stats(self) -> dict[str, Any]:
         """Get service statistics."""
         return {
             "activeConnections": len(self.connections),
+            "cache": tts_audio_cache.get_stats(),
             "connections": [
                 {
                     "socketId": sid,
                     "isStreaming": conn.is_streaming,
+                    "audioTransport": conn.audio_transport,
+                    "flowControl": self._flow_control_stats(conn.credit_window),
                     "connectedAt": conn.connected_at.isoformat(),
                 }
                 for sid, conn in self.connections.items()
             ],
         }
 
+    @staticmethod
+    def _flow_control_stats(window: CreditWindow | None) -> dict[str, Any] | None:
+        """Credit window state of a connection, or None if it is paced by a fixed delay."""
+        if not window:
+            return None
+        return {
+            "window": window.window,
+            "credits": window.credits,
+            "bufferedBytes": window.buffered_bytes,
+            "chunkBytes": window.next_chunk_size(AUDIO_CHUNK_SIZE),
+            "throughputBps": round(window.throughput_bps),
+            "stalls": window.stalls,
+            "stallMs": round(window.stall_ms, 1),
+        }
+
     def get_asgi_app(self) -> socketio.ASGIApp:
         """Get the ASGI app for mounting in FastAPI."""
         return socketio.ASGIApp(self.sio)
@@ -5,6 +5,10 @@ Common utility functions
 
 from app.utils.file_storage import read_json_file, write_json_file, file_exists, get_data_dir
 from app.utils.validation import validate_email, validate_uuid, validate_password
+from app.utils.tokens import count_tokens, count_message_tokens
+from app.utils.context_window import context_window, ContextWindow, ContextWindowManager
+from app.utils.llm_scheduler import llm_scheduler, llm_priority, LLMPriority, LLMScheduler, LoadShedError
+from app.utils.llm_metrics import llm_metrics, llm_call_context, LLMCallRecord, LLMMetrics
 
 __all__ = [
     "read_json_file",
@@ -14,4 +18,18 @@ __all__ = [
     "validate_email",
     "validate_uuid",
     "validate_password",
+    "count_tokens",
+    "count_message_tokens",
+    "context_window",
+    "ContextWindow",
+    "ContextWindowManager",
+    "llm_scheduler",
+    "llm_priority",
+    "LLMPriority",
+    "LLMScheduler",
+    "LoadShedError",
+    "llm_metrics",
+    "llm_call_context",
+    "LLMCallRecord",
+    "LLMMetrics",
 ]
@@ -0,0 +1,202 @@
+"""
+Agent Run Timings Utility
+Per-run phase timelines of Azure AI agent runs, aggregated into histograms with sampled traces
+"""
+
+import asyncio
+import json
+import logging
+import random
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Iterator
+
+from app.config import get_settings
+from app.utils.event_loop_monitor import histogram_percentile
+from app.utils.llm_metrics import current_simulation_id
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the phase duration histogram buckets; a final bucket holds anything slower
+PHASE_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+# Phases of a run, in the order they usually happen
+SLOT_WAIT = "slot_wait"
+MESSAGE_CREATE = "message_create"
+RUN_CREATE = "run_create"
+QUEUED = "queued"
+IN_PROGRESS = "in_progress"
+TOOL_CALLS = "tool_calls"
+MESSAGE_FETCH = "message_fetch"
+TOTAL = "total"
+
+
+@dataclass
+class RunTimeline:
+    """
+    Phases of one agent run.
+
+    ``mark`` ends the current phase and starts the next, so a timeline is a
+    gapless sequence from creation to ``end``. A phase can occur more than
+    once, e.g. ``tool_calls`` for each round of tool calls.
+    """
+    agent: str
+    simulation_id: str | None
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    phases: list[tuple[str, float, float]] = field(default_factory=list)
+    _started: float = field(default_factory=time.monotonic, repr=False)
+    _current: str | None = field(default=None, repr=False)
+    _current_started: float = field(default=0.0, repr=False)
+
+    def mark(self, phase: str) -> None:
+        """Start a phase, ending the current one; repeating the current phase does nothing."""
+        if phase == self._current:
+            return
+        now = time.monotonic()
+        self._close(now)
+        self._current = phase
+        self._current_started = now
+
+    def end(self) -> float:
+        """
+        End the current phase.
+
+        Returns:
+            Total duration of the run in milliseconds
+        """
+        now = time.monotonic()
+        self._close(now)
+        self._current = None
+        return (now - self._started) * 1000
+
+    def to_dict(self, success: bool, total_ms: float) -> dict[str, Any]:
+        return {
+            "agent": self.agent,
+            "simulationId": self.simulation_id,
+            "startedAt": self.started_at.isoformat(),
+            "success": success,
+            "totalMs": round(total_ms, 1),
+            "phases": [
+                {"phase": phase, "startMs": round(start_ms, 1), "durationMs": round(duration_ms, 1)}
+                for phase, start_ms, duration_ms in self.phases
+            ],
+        }
+
+    def _close(self, now: float) -> None:
+        if self._current is None:
+            return
+        self.phases.append((
+            self._current,
+            (self._current_started - self._started) * 1000,
+            (now - self._current_started) * 1000,
+        ))
+
+
+@dataclass
+class _PhaseHistogram:
+    """Duration histogram of one phase of one agent's runs."""
+    count: int = 0
+    total_ms: float = 0.0
+    counts: list[int] = field(default_factory=lambda: [0] * (len(PHASE_BUCKETS_MS) + 1))
+
+    def add(self, duration_ms: float) -> None:
+        self.count += 1
+        self.total_ms += duration_ms
+        for index, bound in enumerate(PHASE_BUCKETS_MS):
+            if duration_ms <= bound:
+                self.counts[index] += 1
+                return
+        self.counts[-1] += 1
+
+
+class AgentRunTimings:
+    """
+    Collects agent run timelines.
+
+    Every phase duration is added to a histogram per agent and phase, with
+    the whole run under ``total``. A sample of ``agent_run_trace_sample_rate``
+    of runs, and every failed run, is also logged as a full timeline and
+    kept in a buffer of ``agent_run_trace_buffer`` recent traces.
+    """
+
+    def __init__(self):
+        self.settings = get_settings()
+        self._histograms: dict[str, dict[str, _PhaseHistogram]] = {}
+        self._runs: dict[str, int] = {}
+        self._errors: dict[str, int] = {}
+        self._traces: deque[dict[str, Any]] = deque(maxlen=self.settings.agent_run_trace_buffer)
+
+    @contextmanager
+    def track(self, agent: str) -> Iterator[RunTimeline]:
+        """
+        Time an agent run and record its timeline when the block exits.
+
+        The timeline is labelled with the enclosing ``llm_call_context``
+        simulation. Abandoned runs (cancelled or closed early) aren't recorded.
+
+        Args:
+            agent: Agent name
+
+        Yields:
+            The timeline to mark phases on
+        """
+        timeline = RunTimeline(agent=agent, simulation_id=current_simulation_id())
+        try:
+            yield timeline
+        except (asyncio.CancelledError, GeneratorExit):
+            raise
+        except Exception:
+            self.record(timeline, success=False)
+            raise
+        self.record(timeline, success=True)
+
+    def record(self, timeline: RunTimeline, success: bool) -> None:
+        """End a timeline and add it to the histograms, tracing it if sampled."""
+        total_ms = timeline.end()
+        histograms = self._histograms.setdefault(timeline.agent, {})
+        for phase, _, duration_ms in timeline.phases:
+            histograms.setdefault(phase, _PhaseHistogram()).add(duration_ms)
+        histograms.setdefault(TOTAL, _PhaseHistogram()).add(total_ms)
+
+        self._runs[timeline.agent] = self._runs.get(timeline.agent, 0) + 1
+        if not success:
+            self._errors[timeline.agent] = self._errors.get(timeline.agent, 0) + 1
+
+        if not success or random.random() < self.settings.agent_run_trace_sample_rate:
+            trace = timeline.to_dict(success, total_ms)
+            self._traces.append(trace)
+            logger.info(f"[AGENT TIMINGS] {json.dumps(trace)}")
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get phase duration histograms and percentiles per agent, and the sampled traces."""
+        return {
+            "sampleRate": self.settings.agent_run_trace_sample_rate,
+            "bucketsMs": list(PHASE_BUCKETS_MS),
+            "agents": {
+                agent: {
+                    "runs": self._runs.get(agent, 0),
+                    "errors": self._errors.get(agent, 0),
+                    "phases": {
+                        phase: {
+                            "count": histogram.count,
+                            "avgMs": round(histogram.total_ms / histogram.count, 1) if histogram.count else 0.0,
+                            **{
+                                f"p{q}Ms": histogram_percentile(histogram.counts, q / 100, PHASE_BUCKETS_MS)
+                                for q in (50, 95, 99)
+                            },
+                            "counts": list(histogram.counts),
+                        }
+                        for phase, histogram in phases.items()
+                    },
+                }
+                for agent, phases in self._histograms.items()
+            },
+            "traces": list(self._traces),
+        }
+
+
+# Singleton instance
+agent_run_timings = AgentRunTimings()
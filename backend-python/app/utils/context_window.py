@@ -0,0 +1,201 @@
+"""
+Context Window Utility
+Keeps chat prompts within a token budget with a rolling summary of older turns
+"""
+
+import hashlib
+import logging
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from app.config import get_settings
+from app.utils.tokens import count_message_tokens, count_tokens
+
+logger = logging.getLogger(__name__)
+
+# Longest excerpt kept from a single message in the rolling summary
+SUMMARY_LINE_CHARS = 160
+
+ROLE_LABELS = {"user": "Advisor", "assistant": "Client"}
+
+
+@dataclass
+class ContextWindow:
+    """Conversation trimmed to fit a prompt."""
+    messages: list[dict[str, Any]]
+    summary: str | None
+    collapsed_count: int
+    token_count: int
+
+
+@dataclass
+class _RollingSummary:
+    """Cached summary lines for the oldest messages of a conversation."""
+    lines: list[str]
+    line_tokens: list[int]
+    collapsed_count: int
+    fingerprint: str
+
+
+class ContextWindowManager:
+    """
+    Fits conversation history into a token budget.
+
+    The most recent messages are kept verbatim, up to ``max_conversation_length``
+    messages and ``context_token_budget`` tokens including the caller's own
+    prompt. Older messages are collapsed into a short extractive summary that is
+    cached per session and extended as turns roll out of the window, so each turn
+    only summarizes the messages that just dropped out.
+    """
+
+    def __init__(self):
+        self.settings = get_settings()
+        self._summaries: OrderedDict[str, _RollingSummary] = OrderedDict()
+
+    def fit(
+        self,
+        messages: list[dict[str, Any]],
+        reserved_tokens: int = 0,
+        session_key: str | None = None,
+    ) -> ContextWindow:
+        """
+        Select the recent messages that fit the budget and summarize the rest.
+
+        Args:
+            messages: Full conversation history
+            reserved_tokens: Tokens already used by the system prompt or instructions
+            session_key: Key for caching the rolling summary between turns
+
+        Returns:
+            The verbatim recent messages and a summary of the older ones
+        """
+        conversation = [m for m in messages if m.get("role") != "system"]
+        budget = (
+            self.settings.context_token_budget
+            - reserved_tokens
+            - self.settings.context_summary_max_tokens
+        )
+
+        recent: list[dict[str, Any]] = []
+        used = 0
+        for message in reversed(conversation):
+            if len(recent) >= self.settings.max_conversation_length:
+                break
+            tokens = count_message_tokens([message])
+            if used + tokens > budget and len(recent) >= self.settings.context_min_recent_messages:
+                break
+            recent.append(message)
+            used += tokens
+        recent.reverse()
+
+        collapsed = conversation[: len(conversation) - len(recent)]
+        summary = self._summarize(collapsed, session_key) if collapsed else None
+        if summary:
+            used += count_tokens(summary)
+
+        if collapsed:
+            logger.debug(
+                f"[CONTEXT] Collapsed {len(collapsed)} of {len(conversation)} messages "
+                f"({used + reserved_tokens} tokens)"
+            )
+
+        return ContextWindow(
+            messages=recent,
+            summary=summary,
+            collapsed_count=len(collapsed),
+            token_count=used + reserved_tokens,
+        )
+
+    def build_messages(
+        self,
+        system_prompt: str,
+        messages: list[dict[str, Any]],
+        session_key: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Build chat completion messages within the token budget.
+
+        Args:
+            system_prompt: System prompt for the request
+            messages: Full conversation history
+            session_key: Key for caching the rolling summary between turns
+
+        Returns:
+            System prompt, optional summary of older turns and the recent turns
+        """
+        window = self.fit(messages, count_message_tokens([{"role": "system", "content": system_prompt}]), session_key)
+
+        formatted = [{"role": "system", "content": system_prompt}]
+        if window.summary:
+            formatted.append({"role": "system", "content": f"Summary of the earlier conversation:\n{window.summary}"})
+        formatted.extend(window.messages)
+        return formatted
+
+    def _summarize(self, collapsed: list[dict[str, Any]], session_key: str | None) -> str:
+        """Get the rolling summary for the collapsed messages, extending the cached one."""
+        cached = self._summaries.get(session_key) if session_key else None
+
+        # Reuse the cached lines only if they cover a prefix of this conversation
+        if (
+            cached
+            and cached.collapsed_count <= len(collapsed)
+            and cached.fingerprint == self._fingerprint(collapsed[: cached.collapsed_count])
+        ):
+            new_lines = [self._summarize_message(m) for m in collapsed[cached.collapsed_count:]]
+            lines = cached.lines + new_lines
+            line_tokens = cached.line_tokens + [count_tokens(line) for line in new_lines]
+        else:
+            lines = [self._summarize_message(m) for m in collapsed]
+            line_tokens = [count_tokens(line) for line in lines]
+
+        # Keep the summary itself bounded by dropping the oldest lines, counting
+        # each line once with a token for the newline that joins it
+        max_tokens = self.settings.context_summary_max_tokens
+        total = sum(line_tokens) + len(lines) - 1
+        drop = 0
+        while len(lines) - drop > 1 and total > max_tokens:
+            total -= line_tokens[drop] + 1
+            drop += 1
+        lines, line_tokens = lines[drop:], line_tokens[drop:]
+
+        if session_key:
+            self._summaries[session_key] = _RollingSummary(
+                lines=lines,
+                line_tokens=line_tokens,
+                collapsed_count=len(collapsed),
+                fingerprint=self._fingerprint(collapsed),
+            )
+            self._summaries.move_to_end(session_key)
+            while len(self._summaries) > self.settings.context_summary_cache_size:
+                self._summaries.popitem(last=False)
+
+        return "\n".join(lines)
+
+    def forget(self, session_key: str) -> None:
+        """Drop the cached summary for a session."""
+        self._summaries.pop(session_key, None)
+
+    @staticmethod
+    def _summarize_message(message: dict[str, Any]) -> str:
+        """Condense a message to its first sentence."""
+        label = ROLE_LABELS.get(message.get("role", ""), "Unknown")
+        content = " ".join(str(message.get("content") or "").split())
+        first_sentence = re.split(r"(?<=[.!?])\s", content, maxsplit=1)[0]
+        if len(first_sentence) > SUMMARY_LINE_CHARS:
+            first_sentence = first_sentence[:SUMMARY_LINE_CHARS].rstrip() + "..."
+        return f"- {label}: {first_sentence}"
+
+    @staticmethod
+    def _fingerprint(messages: list[dict[str, Any]]) -> str:
+        """Identify a conversation prefix by its length and last message."""
+        if not messages:
+            return ""
+        last = messages[-1]
+        digest = hashlib.sha256(f"{last.get('role')}:{last.get('content')}".encode()).hexdigest()
+        return f"{len(messages)}:{digest[:16]}"
+
+
+# Singleton instance
+context_window = ContextWindowManager()
@@ -0,0 +1,153 @@
+"""
+Credit Window Utility
+Credit-based flow control for streams a receiver acknowledges chunk by chunk
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Callable
+
+# Smoothing factor for the measured delivery rate
+THROUGHPUT_SMOOTHING = 0.3
+
+
+class CreditWindow:
+    """
+    Send window of one stream, opened by the receiver's acknowledgements.
+
+    Every chunk sent uses a credit and stays buffered until the receiver
+    acknowledges it. Sending pauses while the receiver has no credits left
+    or ``max_buffered_bytes`` are unacknowledged, so a slow receiver holds
+    back at most that much. Acknowledgements are cumulative and may grant a
+    new window size of up to ``max_credits`` chunks. The delivery rate they
+    reveal sizes the next chunks: large for fast receivers, small for slow
+    ones so audio starts sooner and stalls less.
+    """
+
+    def __init__(
+        self,
+        credits: int,
+        max_credits: int,
+        max_buffered_bytes: int,
+        min_chunk_bytes: int,
+        max_chunk_bytes: int,
+        target_chunk_ms: float,
+    ):
+        self.max_credits = max(1, max_credits)
+        self.max_buffered_bytes = max_buffered_bytes
+        self.min_chunk_bytes = min_chunk_bytes
+        self.max_chunk_bytes = max(min_chunk_bytes, max_chunk_bytes)
+        self.target_chunk_ms = target_chunk_ms
+        self.window = min(max(1, credits), self.max_credits)
+        self.throughput_bps = 0.0
+        self.stalls = 0
+        self.stall_ms = 0.0
+        self._unacked: OrderedDict[int, int] = OrderedDict()
+        self._buffered_bytes = 0
+        self._last_ack_at = 0.0
+        self._changed = asyncio.Event()
+
+    @property
+    def credits(self) -> int:
+        """Chunks that may be sent before the next acknowledgement."""
+        return max(0, self.window - len(self._unacked))
+
+    @property
+    def buffered_bytes(self) -> int:
+        """Bytes sent but not yet acknowledged."""
+        return self._buffered_bytes
+
+    def next_chunk_size(self, default: int) -> int:
+        """
+        Size the next chunk from the measured delivery rate.
+
+        Args:
+            default: Size to use until an acknowledgement has been measured
+
+        Returns:
+            Chunk size in bytes
+        """
+        if not self.throughput_bps:
+            return min(max(default, self.min_chunk_bytes), self.max_chunk_bytes)
+        size = int(self.throughput_bps * self.target_chunk_ms / 1000)
+        # Whole KiB keep chunk sizes stable between nearby measurements
+        size = size // 1024 * 1024
+        return min(max(size, self.min_chunk_bytes), self.max_chunk_bytes)
+
+    async def acquire(self, size: int, timeout: float, is_active: Callable[[], bool]) -> bool:
+        """
+        Wait until a chunk of ``size`` bytes may be sent.
+
+        A chunk is always allowed when nothing is buffered, so one larger
+        than ``max_buffered_bytes`` can't stall the stream.
+
+        Args:
+            size: Chunk size in bytes
+            timeout: Seconds to wait for each acknowledgement
+            is_active: Checked whenever the window changes or ``wake`` is called
+
+        Returns:
+            True to send, False if the stream stopped while waiting
+
+        Raises:
+            TimeoutError: If the receiver sent no acknowledgement within ``timeout`` seconds
+        """
+        started = None
+        try:
+            while is_active():
+                if self.credits and (
+                    not self._buffered_bytes or self._buffered_bytes + size <= self.max_buffered_bytes
+                ):
+                    return True
+                if started is None:
+                    started = time.monotonic()
+                    self.stalls += 1
+                self._changed.clear()
+                async with asyncio.timeout(timeout):
+                    await self._changed.wait()
+            return False
+        finally:
+            if started is not None:
+                self.stall_ms += (time.monotonic() - started) * 1000
+
+    def sent(self, sequence: int, size: int) -> None:
+        """Record a chunk as sent and awaiting acknowledgement."""
+        if not self._unacked:
+            # Delivery is timed from here, so idle time isn't counted
+            self._last_ack_at = time.monotonic()
+        self._unacked[sequence] = size
+        self._buffered_bytes += size
+
+    def ack(self, sequence: int, credits: int | None = None) -> None:
+        """
+        Acknowledge every chunk up to and including ``sequence``.
+
+        Args:
+            sequence: Highest sequence number the receiver has
+            credits: New window size granted by the receiver, if any
+        """
+        acked_bytes = 0
+        while self._unacked and next(iter(self._unacked)) <= sequence:
+            _, size = self._unacked.popitem(last=False)
+            acked_bytes += size
+        self._buffered_bytes -= acked_bytes
+
+        if acked_bytes:
+            now = time.monotonic()
+            elapsed = now - self._last_ack_at
+            if elapsed > 0:
+                sample = acked_bytes / elapsed
+                self.throughput_bps = (
+                    sample if not self.throughput_bps
+                    else THROUGHPUT_SMOOTHING * sample + (1 - THROUGHPUT_SMOOTHING) * self.throughput_bps
+                )
+            self._last_ack_at = now
+
+        if credits is not None:
+            self.window = min(max(1, credits), self.max_credits)
+        self._changed.set()
+
+    def wake(self) -> None:
+        """Wake a sender waiting for credits, e.g. after the stream was stopped."""
+        self._changed.set()
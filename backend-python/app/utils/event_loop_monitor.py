@@ -0,0 +1,126 @@
+"""
+Event Loop Monitor Utility
+Measures how late the event loop runs a periodic timer, as a sign of blocking work
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the lag histogram buckets; a final bucket holds anything slower
+LAG_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+def histogram_percentile(
+    counts: list[int],
+    quantile: float,
+    buckets_ms: tuple[float, ...] = LAG_BUCKETS_MS,
+) -> float:
+    """
+    Estimate a percentile from histogram counts.
+
+    Args:
+        counts: Samples per bucket of ``buckets_ms`` plus the overflow bucket
+        quantile: Quantile between 0 and 1
+        buckets_ms: Bucket upper bounds, the lag buckets by default
+
+    Returns:
+        Upper bound of the bucket holding the quantile, in milliseconds
+    """
+    total = sum(counts)
+    if not total:
+        return 0.0
+    target = quantile * total
+    seen = 0
+    for bound, count in zip((*buckets_ms, float("inf")), counts):
+        seen += count
+        if seen >= target:
+            return float(bound) if bound != float("inf") else float(buckets_ms[-1])
+    return float(buckets_ms[-1])
+
+
+class EventLoopMonitor:
+    """
+    Samples event loop lag by sleeping for ``event_loop_monitor_interval_ms``
+    and measuring how much later than asked the loop woke up.
+
+    Keeps recent samples for percentiles and a cumulative histogram, so a
+    caller can diff two snapshots to get the lag over a period of its own.
+    """
+
+    def __init__(self):
+        self.settings = get_settings()
+        self._task: asyncio.Task | None = None
+        self._recent: deque[float] = deque(maxlen=self.settings.event_loop_monitor_window)
+        self._counts = [0] * (len(LAG_BUCKETS_MS) + 1)
+        self._max_ms = 0.0
+
+    def start(self) -> None:
+        """Start sampling, if enabled."""
+        if not self.settings.event_loop_monitor_enabled or self._task:
+            return
+        self._task = asyncio.create_task(self._run())
+        logger.info("[EVENT LOOP] Lag monitor started")
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        if not self._task:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def record(self, lag_ms: float) -> None:
+        """Add a lag sample."""
+        self._recent.append(lag_ms)
+        self._max_ms = max(self._max_ms, lag_ms)
+        for index, bound in enumerate(LAG_BUCKETS_MS):
+            if lag_ms <= bound:
+                self._counts[index] += 1
+                return
+        self._counts[-1] += 1
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get recent lag percentiles and the cumulative lag histogram."""
+        ordered = sorted(self._recent)
+        return {
+            "enabled": self.settings.event_loop_monitor_enabled,
+            "running": bool(self._task and not self._task.done()),
+            "intervalMs": self.settings.event_loop_monitor_interval_ms,
+            "samples": sum(self._counts),
+            "maxLagMs": round(self._max_ms, 1),
+            "lagMs": {
+                f"p{round(quantile * 100)}": (
+                    round(ordered[min(len(ordered) - 1, int(quantile * len(ordered)))], 1) if ordered else 0.0
+                )
+                for quantile in (0.5, 0.95, 0.99)
+            },
+            "histogram": {
+                "bucketsMs": list(LAG_BUCKETS_MS),
+                "counts": list(self._counts),
+            },
+        }
+
+    async def _run(self) -> None:
+        """Sleep for the interval and record how late each wake-up is."""
+        interval = self.settings.event_loop_monitor_interval_ms / 1000
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(interval)
+            lag_ms = max(0.0, (time.monotonic() - started - interval) * 1000)
+            self.record(lag_ms)
+            if lag_ms >= self.settings.event_loop_monitor_warn_ms:
+                logger.warning(f"[EVENT LOOP] Loop blocked for {lag_ms:.0f}ms")
+
+
+# Singleton instance
+event_loop_monitor = EventLoopMonitor()
@@ -0,0 +1,194 @@
+"""
+Fake LLM Utility
+Deterministic replies, latencies and failures standing in for an AI provider during load tests
+"""
+
+import hashlib
+import json
+import math
+import random
+import re
+from dataclasses import dataclass
+from typing import Any
+
+from app.config import Settings, get_settings
+from app.utils.tokens import count_tokens
+
+# z-score of the 95th percentile of a normal distribution
+Z_95 = 1.645
+
+# Silent MPEG-1 Layer III frame: 128 kbps, 44.1 kHz, mono, 417 bytes
+SILENT_MP3_FRAME = b"\xff\xfb\x90\xc4" + bytes(413)
+MP3_FRAME_SECONDS = 1152 / 44100
+
+# Speech is spoken at about this many words per second
+SPEECH_WORDS_PER_SECOND = 2.5
+
+CLIENT_SENTENCES = [
+    "Honestly, I'm not sure where to start with all of this.",
+    "We have some savings, but I never know if we're doing enough.",
+    "The market drop last year really worried me.",
+    "I'd rather earn a little less than lose sleep over it.",
+    "Our daughter starts college in a few years, so that's on my mind.",
+    "Can you explain what the fees would actually look like?",
+    "My brother-in-law keeps telling me to buy individual stocks.",
+    "I want to retire before sixty-five if that's realistic.",
+    "That makes sense, but how is that different from what my bank offers?",
+    "I've been burned by an advisor before, so forgive me if I'm cautious.",
+]
+
+
+@dataclass
+class FakeCall:
+    """Outcome of one fake call, drawn up front so it replays identically."""
+    status_code: int
+    ttfb_seconds: float
+    seconds_per_token: float
+    rng: random.Random
+
+    @property
+    def failed(self) -> bool:
+        return self.status_code != 200
+
+    def duration(self, tokens: int) -> float:
+        """Seconds until a reply of ``tokens`` tokens is complete."""
+        return self.ttfb_seconds + tokens * self.seconds_per_token
+
+
+class FakeLLM:
+    """
+    Deterministic stand-in for an LLM provider.
+
+    Each call is seeded with ``fake_llm_seed``, a hash of the request and the
+    number of times that request has been seen, so a run replays identically
+    however its calls interleave. Time to first token is log-normal with the
+    configured median and p95, output then arrives at
+    ``fake_llm_tokens_per_second``, and ``fake_llm_rate_limit_rate`` and
+    ``fake_llm_error_rate`` of calls fail with a 429 or 500.
+    """
+
+    def __init__(self, settings: Settings | None = None):
+        self.settings = settings or get_settings()
+        self._seen: dict[str, int] = {}
+
+    def call(self, request: Any) -> FakeCall:
+        """
+        Draw the outcome of a call.
+
+        Args:
+            request: JSON-serializable request, identifying the call
+
+        Returns:
+            Status, latency and the random generator for the reply
+        """
+        fingerprint = hashlib.sha256(json.dumps(request, sort_keys=True, default=str).encode()).hexdigest()
+        occurrence = self._seen.get(fingerprint, 0)
+        self._seen[fingerprint] = occurrence + 1
+        rng = random.Random(f"{self.settings.fake_llm_seed}:{fingerprint}:{occurrence}")
+
+        roll = rng.random()
+        if roll < self.settings.fake_llm_rate_limit_rate:
+            status_code = 429
+        elif roll < self.settings.fake_llm_rate_limit_rate + self.settings.fake_llm_error_rate:
+            status_code = 500
+        else:
+            status_code = 200
+
+        median = self.settings.fake_llm_latency_median_ms / 1000
+        p95 = self.settings.fake_llm_latency_p95_ms / 1000
+        sigma = math.log(p95 / median) / Z_95 if median > 0 and p95 > median else 0.0
+        ttfb = median * math.exp(sigma * rng.gauss(0, 1))
+
+        tokens_per_second = self.settings.fake_llm_tokens_per_second
+        return FakeCall(
+            status_code=status_code,
+            ttfb_seconds=ttfb,
+            seconds_per_token=1 / tokens_per_second if tokens_per_second > 0 else 0.0,
+            rng=rng,
+        )
+
+    def reply(self, prompt: str, rng: random.Random) -> str:
+        """
+        Build a reply shaped like what the prompt asks for.
+
+        Reviews, objective progress and profiles are answered with JSON the
+        callers can parse; anything else gets a few sentences of client dialogue.
+        """
+        lowered = prompt.lower()
+        if "overallscore" in lowered:
+            return json.dumps({
+                "overallScore": rng.randint(4, 9),
+                "competencyScores": [],
+                "generalStrengths": ["Built rapport early", "Asked open questions"],
+                "generalImprovements": ["Summarize the client's goals", "Explain fees sooner"],
+                "summary": "A solid conversation with room to dig deeper into the client's priorities.",
+            })
+        if "rapport" in lowered and ("json" in lowered or "progress" in lowered):
+            return json.dumps({
+                "rapport": rng.randint(10, 90),
+                "needs": rng.randint(10, 90),
+                "objections": rng.randint(0, 80),
+                "recommendations": rng.randint(0, 80),
+                "explanation": "Progress estimated by the fake backend.",
+            })
+        if "profile" in lowered and "json" in lowered:
+            return json.dumps({
+                "name": rng.choice(["Alex Morgan", "Sam Rivera", "Jordan Lee", "Taylor Brooks"]),
+                "age": rng.randint(28, 67),
+                "occupation": rng.choice(["Teacher", "Nurse", "Engineer", "Small business owner"]),
+                "income": f"${rng.randint(45, 180)},000 per year",
+                "family": rng.choice(["Married with two children", "Single", "Divorced, one child"]),
+                "goals": ["Save for retirement", "Pay for college"],
+                "concerns": ["Market volatility", "Fees"],
+                "background": "Has a workplace retirement plan and some savings.",
+                "personality": rng.choice(["cautious", "analytical", "friendly", "skeptical"]),
+            })
+        return " ".join(rng.sample(CLIENT_SENTENCES, rng.randint(1, 3)))
+
+    def wants_tool_call(self, rng: random.Random) -> bool:
+        """Whether a call with optional tools should call one."""
+        return rng.random() < self.settings.fake_llm_tool_call_rate
+
+    def tool_arguments(self, parameters: dict[str, Any], rng: random.Random) -> dict[str, Any]:
+        """Fill a tool's JSON Schema parameters with plausible values."""
+        return {
+            name: self._fake_value(name, schema, rng)
+            for name, schema in (parameters.get("properties") or {}).items()
+        }
+
+    def usage(self, prompt: str, reply: str) -> dict[str, int]:
+        """Token usage as the provider would report it."""
+        prompt_tokens = count_tokens(prompt)
+        completion_tokens = count_tokens(reply)
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+    @staticmethod
+    def split_tokens(text: str) -> list[str]:
+        """Split a reply into word-sized stream deltas."""
+        return re.findall(r"\S+\s*", text) or [text]
+
+    @staticmethod
+    def speech(text: str) -> bytes:
+        """Silent MP3 audio lasting about as long as the text takes to say."""
+        seconds = max(len(text.split()) / SPEECH_WORDS_PER_SECOND, 0.5)
+        return SILENT_MP3_FRAME * math.ceil(seconds / MP3_FRAME_SECONDS)
+
+    def _fake_value(self, name: str, schema: dict[str, Any], rng: random.Random) -> Any:
+        kind = schema.get("type")
+        if schema.get("enum"):
+            return rng.choice(schema["enum"])
+        if kind == "number":
+            return round(rng.uniform(0, 100), 1)
+        if kind == "integer":
+            return rng.randint(0, 100)
+        if kind == "boolean":
+            return rng.random() < 0.5
+        if kind == "array":
+            return [self._fake_value(name, schema.get("items") or {}, rng) for _ in range(rng.randint(1, 3))]
+        if kind == "object":
+            return self.tool_arguments(schema, rng)
+        return f"Fake {name.replace('_', ' ')}"
@@ -0,0 +1,277 @@
+"""
+LLM Metrics Utility
+Latency and token accounting for every LLM call, aggregated per endpoint and model
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Iterator
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Records kept in memory while waiting to be persisted; older ones are dropped
+MAX_PENDING_RECORDS = 10000
+
+_call_context: ContextVar[dict[str, str | None]] = ContextVar("llm_call_context", default={})
+
+
+@contextmanager
+def llm_call_context(endpoint: str | None = None, simulation_id: str | None = None) -> Iterator[None]:
+    """Label the enclosed LLM calls, and tasks started from them, with an endpoint and simulation."""
+    context = dict(_call_context.get())
+    if endpoint:
+        context["endpoint"] = endpoint
+    if simulation_id:
+        context["simulation_id"] = simulation_id
+    token = _call_context.set(context)
+    try:
+        yield
+    finally:
+        _call_context.reset(token)
+
+
+def current_simulation_id() -> str | None:
+    """Simulation labelled by the enclosing ``llm_call_context``, if any."""
+    return _call_context.get().get("simulation_id")
+
+
+@dataclass
+class LLMCallRecord:
+    """Timing and token usage of one LLM call."""
+    endpoint: str
+    provider: str
+    model: str
+    simulation_id: str | None
+    started_at: datetime
+    prompt_tokens: int | None = None
+    completion_tokens: int | None = None
+    ttfb_ms: float | None = None
+    latency_ms: float = 0.0
+    success: bool = True
+    _started: float = field(default_factory=time.monotonic, repr=False)
+
+    def first_byte(self) -> None:
+        """Mark the first byte of the response, if not already marked."""
+        if self.ttfb_ms is None:
+            self.ttfb_ms = (time.monotonic() - self._started) * 1000
+
+    def set_usage(self, prompt_tokens: int | None, completion_tokens: int | None) -> None:
+        """Record token usage reported by the provider."""
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+
+    def set_usage_from(self, usage: Any) -> None:
+        """Record token usage from an SDK usage object or a raw ``usage`` dict."""
+        if not usage:
+            return
+        if isinstance(usage, dict):
+            self.set_usage(usage.get("prompt_tokens"), usage.get("completion_tokens"))
+        else:
+            self.set_usage(getattr(usage, "prompt_tokens", None), getattr(usage, "completion_tokens", None))
+
+    def set_result(self, result: Any) -> None:
+        """Record the outcome and usage of an SDK completion or a raw HTTP response."""
+        if hasattr(result, "status_code") and hasattr(result, "json"):
+            self.success = result.status_code == 200
+            if self.success:
+                try:
+                    self.set_usage_from(result.json().get("usage"))
+                except ValueError:
+                    pass
+        else:
+            self.set_usage_from(getattr(result, "usage", None))
+
+
+@dataclass
+class _Aggregate:
+    """Running totals for one endpoint, provider and model."""
+    calls: int = 0
+    errors: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    unreported_usage: int = 0
+    latencies_ms: deque = field(default_factory=deque)
+    ttfbs_ms: deque = field(default_factory=deque)
+
+
+class LLMMetrics:
+    """
+    Records model, endpoint, simulation, token usage, time to first byte and
+    total latency for each LLM call.
+
+    Calls are wrapped with ``track``, which yields a record the caller fills
+    with usage and the first-byte time. Endpoint and simulation labels come from
+    ``llm_call_context``. Aggregates keep percentiles over the last
+    ``llm_metrics_window`` calls; if ``llm_metrics_persist_enabled`` is set,
+    every record is also written to the ``llm_call_metrics`` table in batches.
+    """
+
+    def __init__(self):
+        self.settings = get_settings()
+        self._aggregates: dict[tuple[str, str, str], _Aggregate] = {}
+        self._pending: deque[LLMCallRecord] = deque(maxlen=MAX_PENDING_RECORDS)
+        self._task: asyncio.Task | None = None
+        self._persisted = 0
+
+    @asynccontextmanager
+    async def track(self, model: str, provider: str) -> AsyncIterator[LLMCallRecord]:
+        """
+        Time an LLM call and record it when the block exits.
+
+        Args:
+            model: Model or deployment name
+            provider: Backend serving the call (openai, azure-agent)
+
+        Yields:
+            The record to fill with token usage and first-byte time
+        """
+        context = _call_context.get()
+        record = LLMCallRecord(
+            endpoint=context.get("endpoint") or "other",
+            provider=provider,
+            model=model,
+            simulation_id=context.get("simulation_id"),
+            started_at=datetime.now(timezone.utc),
+        )
+        try:
+            yield record
+        except asyncio.CancelledError:
+            # An abandoned call says nothing about the provider
+            raise
+        except Exception:
+            record.success = False
+            self._add(record)
+            raise
+        self._add(record)
+
+    def start(self) -> None:
+        """Start persisting records, if enabled."""
+        if not self.settings.llm_metrics_persist_enabled or self._task:
+            return
+        self._task = asyncio.create_task(self._run())
+        logger.info("[LLM METRICS] Persistence started")
+
+    async def stop(self) -> None:
+        """Stop persisting records, flushing what is pending."""
+        if not self._task:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await self.flush()
+
+    async def flush(self) -> int:
+        """
+        Write pending records to the database.
+
+        Returns:
+            Number of records written
+        """
+        if not self._pending:
+            return 0
+
+        # Imported here to avoid circular imports (repositories use app.utils)
+        from app.repositories.llm_metrics_repository import llm_metrics_repository
+
+        records = list(self._pending)
+        self._pending.clear()
+        try:
+            await llm_metrics_repository.add_many(records)
+        except Exception as e:
+            logger.error(f"[LLM METRICS] Failed to persist {len(records)} records: {e}")
+            # Put them back for the next flush, keeping the newest if over the limit
+            self._pending = deque([*records, *self._pending], maxlen=MAX_PENDING_RECORDS)
+            return 0
+
+        self._persisted += len(records)
+        return len(records)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get call counts, token totals and latency percentiles per endpoint, provider and model."""
+        endpoints = []
+        totals = {"calls": 0, "errors": 0, "promptTokens": 0, "completionTokens": 0}
+        for (endpoint, provider, model), aggregate in sorted(self._aggregates.items()):
+            endpoints.append({
+                "endpoint": endpoint,
+                "provider": provider,
+                "model": model,
+                "calls": aggregate.calls,
+                "errors": aggregate.errors,
+                "promptTokens": aggregate.prompt_tokens,
+                "completionTokens": aggregate.completion_tokens,
+                "callsWithoutUsage": aggregate.unreported_usage,
+                "ttfbMs": self._percentiles(aggregate.ttfbs_ms),
+                "latencyMs": self._percentiles(aggregate.latencies_ms),
+            })
+            totals["calls"] += aggregate.calls
+            totals["errors"] += aggregate.errors
+            totals["promptTokens"] += aggregate.prompt_tokens
+            totals["completionTokens"] += aggregate.completion_tokens
+
+        return {
+            "totals": totals,
+            "endpoints": endpoints,
+            "persistence": {
+                "enabled": self.settings.llm_metrics_persist_enabled,
+                "pending": len(self._pending),
+                "persisted": self._persisted,
+            },
+        }
+
+    def _add(self, record: LLMCallRecord) -> None:
+        """Fold a finished call into the aggregates and the persistence buffer."""
+        record.latency_ms = (time.monotonic() - record._started) * 1000
+        if record.ttfb_ms is None:
+            record.ttfb_ms = record.latency_ms
+
+        key = (record.endpoint, record.provider, record.model)
+        aggregate = self._aggregates.get(key)
+        if aggregate is None:
+            window = self.settings.llm_metrics_window
+            aggregate = _Aggregate(latencies_ms=deque(maxlen=window), ttfbs_ms=deque(maxlen=window))
+            self._aggregates[key] = aggregate
+
+        aggregate.calls += 1
+        if not record.success:
+            aggregate.errors += 1
+        if record.prompt_tokens is None and record.completion_tokens is None:
+            aggregate.unreported_usage += 1
+        aggregate.prompt_tokens += record.prompt_tokens or 0
+        aggregate.completion_tokens += record.completion_tokens or 0
+        aggregate.latencies_ms.append(record.latency_ms)
+        aggregate.ttfbs_ms.append(record.ttfb_ms)
+
+        if self.settings.llm_metrics_persist_enabled:
+            self._pending.append(record)
+
+    async def _run(self) -> None:
+        """Flush pending records periodically."""
+        while True:
+            await asyncio.sleep(self.settings.llm_metrics_flush_interval_seconds)
+            await self.flush()
+
+    @staticmethod
+    def _percentiles(samples: deque) -> dict[str, float]:
+        """p50, p95 and p99 of recent samples, in milliseconds."""
+        if not samples:
+            return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+        ordered = sorted(samples)
+        return {
+            f"p{round(quantile * 100)}": round(ordered[min(len(ordered) - 1, int(quantile * len(ordered)))], 1)
+            for quantile in (0.5, 0.95, 0.99)
+        }
+
+
+# Singleton instance
+llm_metrics = LLMMetrics()
@@ -0,0 +1,380 @@
+"""
+LLM Scheduler Utility
+Rate-limited, prioritized admission for LLM calls with retries and load shedding
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import random
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, TypeVar
+
+from fastapi import HTTPException, status
+
+from app.config import get_settings
+from app.utils.llm_metrics import llm_metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Smoothing factor for the average time a call holds a slot
+HOLD_TIME_SMOOTHING = 0.2
+
+
+class LLMPriority(IntEnum):
+    """Priority classes, most urgent first."""
+    INTERACTIVE = 0
+    EXPERT = 1
+    OBJECTIVE = 2
+    REVIEW = 3
+    PROFILE_POOL = 4
+
+
+_current_priority: ContextVar[LLMPriority] = ContextVar("llm_priority", default=LLMPriority.INTERACTIVE)
+
+
+@contextmanager
+def llm_priority(priority: LLMPriority) -> Iterator[None]:
+    """Run the enclosed LLM calls, and tasks started from them, at a priority."""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+class LoadShedError(HTTPException):
+    """Raised when the LLM queue is too deep to accept more work."""
+
+    def __init__(self, retry_after: int):
+        self.retry_after = retry_after
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="The AI service is busy right now. Please try again shortly.",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+@dataclass
+class _TokenBucket:
+    """Continuously refilling bucket of capacity units."""
+    capacity: float
+    refill_per_second: float
+    level: float = 0.0
+    updated_at: float = field(default_factory=time.monotonic)
+
+    def __post_init__(self):
+        self.level = self.capacity
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` is available."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.refill_per_second
+
+    def take(self, amount: float) -> None:
+        """Consume ``amount``, which must be available."""
+        self._refill()
+        self.level -= min(amount, self.capacity)
+
+    def drain(self) -> None:
+        """Empty the bucket after the provider reported a rate limit."""
+        self._refill()
+        self.level = 0.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated_at) * self.refill_per_second)
+        self.updated_at = now
+
+
+@dataclass
+class _RateLimit:
+    """Request and token buckets for one API key and model."""
+    requests: _TokenBucket
+    tokens: _TokenBucket
+
+    def wait_time(self, tokens: int) -> float:
+        return max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+
+    def take(self, tokens: int) -> None:
+        self.requests.take(1)
+        self.tokens.take(tokens)
+
+
+@dataclass
+class _Waiter:
+    """Queued request for an LLM slot."""
+    priority: LLMPriority
+    sequence: int
+    key: tuple[str, str]
+    tokens: int
+    future: asyncio.Future
+    enqueued_at: float
+
+
+class LLMScheduler:
+    """
+    Admits LLM calls under per-key, per-model rate limits.
+
+    Each API key and model pair gets a requests-per-minute and a
+    tokens-per-minute token bucket, and at most ``llm_max_concurrency`` calls
+    run at once. Waiting calls are admitted strictly by priority; a call is
+    only passed over while its own bucket is empty. Calls retried after a 429
+    or 5xx re-enter the queue after a jittered exponential backoff. Once the
+    queue holds ``llm_max_queue_depth`` calls new ones are rejected with a 503,
+    and background priorities are rejected at half that depth.
+    """
+
+    def __init__(self):
+        self.settings = get_settings()
+        self._limits: dict[tuple[str, str], _RateLimit] = {}
+        self._queue: list[_Waiter] = []
+        self._sequence = 0
+        self._active = 0
+        self._timer: asyncio.TimerHandle | None = None
+        self._avg_hold_seconds = 2.0
+        self._granted = 0
+        self._shed = 0
+        self._retries = 0
+        self._total_wait_seconds = 0.0
+
+    async def run(
+        self,
+        compute: Callable[[], Awaitable[T]],
+        api_key: str | None = None,
+        model: str = "gpt-4o",
+        estimated_tokens: int = 0,
+        priority: LLMPriority | None = None,
+        provider: str = "openai",
+    ) -> T:
+        """
+        Run an LLM call once admitted, retrying rate limits and server errors.
+
+        Both raised errors and returned HTTP responses with a 429 or 5xx status
+        are retried; the last response is returned once retries run out. Each
+        attempt is recorded in ``llm_metrics``.
+
+        Args:
+            compute: Coroutine factory making the call
+            api_key: API key the call is billed to
+            model: Model or deployment name
+            estimated_tokens: Prompt plus maximum completion tokens
+            priority: Priority class, defaults to the one set with ``llm_priority``
+            provider: Backend serving the call, for metrics
+
+        Returns:
+            The call's result
+        """
+        limit = self._limit(self._key(api_key, model))
+        attempt = 0
+        while True:
+            async with self.slot(api_key, model, estimated_tokens, priority):
+                try:
+                    async with llm_metrics.track(model, provider) as record:
+                        result = await compute()
+                        record.set_result(result)
+                except Exception as e:
+                    delay = None if isinstance(e, HTTPException) else self._retry_delay(e, attempt, limit)
+                    if delay is None:
+                        raise
+                    logger.warning(f"[LLM] {model} call failed ({e}), retrying in {delay:.2f}s")
+                else:
+                    delay = self._retry_delay(result, attempt, limit)
+                    if delay is None:
+                        return result
+                    logger.warning(f"[LLM] {model} call returned {result.status_code}, retrying in {delay:.2f}s")
+
+            attempt += 1
+            self._retries += 1
+            await asyncio.sleep(delay)
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        api_key: str | None = None,
+        model: str = "gpt-4o",
+        estimated_tokens: int = 0,
+        priority: LLMPriority | None = None,
+    ) -> AsyncIterator[None]:
+        """Hold an admitted slot for a call that can't simply be retried, such as a stream."""
+        await self._acquire(self._key(api_key, model), estimated_tokens, priority)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(time.monotonic() - started)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get queue depth, admissions and shed counts."""
+        queued: dict[str, int] = {}
+        for waiter in self._queue:
+            queued[waiter.priority.name.lower()] = queued.get(waiter.priority.name.lower(), 0) + 1
+
+        return {
+            "active": self._active,
+            "maxConcurrency": self.settings.llm_max_concurrency,
+            "queued": len(self._queue),
+            "queuedByPriority": queued,
+            "maxQueueDepth": self.settings.llm_max_queue_depth,
+            "granted": self._granted,
+            "shed": self._shed,
+            "retries": self._retries,
+            "avgQueueWaitMs": round(self._total_wait_seconds / self._granted * 1000, 1) if self._granted else 0.0,
+            "rateLimits": {
+                f"{key_id}/{model}": {
+                    "requestsAvailable": round(limit.requests.level, 1),
+                    "tokensAvailable": round(limit.tokens.level),
+                }
+                for (key_id, model), limit in self._limits.items()
+            },
+        }
+
+    async def _acquire(self, key: tuple[str, str], tokens: int, priority: LLMPriority | None) -> None:
+        """Wait for a slot, or shed the call if the queue is too deep."""
+        priority = _current_priority.get() if priority is None else priority
+
+        depth_limit = self.settings.llm_max_queue_depth
+        if priority > LLMPriority.EXPERT:
+            depth_limit //= 2
+        if len(self._queue) >= depth_limit:
+            self._shed += 1
+            retry_after = self._retry_after()
+            logger.warning(
+                f"[LLM] Shedding {priority.name.lower()} call, {len(self._queue)} queued (retry after {retry_after}s)"
+            )
+            raise LoadShedError(retry_after)
+
+        self._sequence += 1
+        waiter = _Waiter(
+            priority=priority,
+            sequence=self._sequence,
+            key=key,
+            tokens=tokens,
+            future=asyncio.get_running_loop().create_future(),
+            enqueued_at=time.monotonic(),
+        )
+        self._queue.append(waiter)
+        self._queue.sort(key=lambda w: (w.priority, w.sequence))
+        self._dispatch()
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter in self._queue:
+                self._queue.remove(waiter)
+            elif waiter.future.done() and not waiter.future.cancelled():
+                # Admitted just as the caller was cancelled; give the slot back
+                self._release(0.0)
+            raise
+
+    def _release(self, held_seconds: float) -> None:
+        """Return a slot and admit whoever is next."""
+        self._active -= 1
+        if held_seconds:
+            self._avg_hold_seconds += HOLD_TIME_SMOOTHING * (held_seconds - self._avg_hold_seconds)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Admit queued calls in priority order while slots and rate limits allow."""
+        blocked: set[tuple[str, str]] = set()
+        next_wait: float | None = None
+
+        for waiter in list(self._queue):
+            if self._active >= self.settings.llm_max_concurrency:
+                break
+            if waiter.future.done():
+                self._queue.remove(waiter)
+                continue
+            # Don't let a lower priority call take tokens a higher one is waiting for
+            if waiter.key in blocked:
+                continue
+
+            limit = self._limit(waiter.key)
+            wait = limit.wait_time(waiter.tokens)
+            if wait > 0:
+                blocked.add(waiter.key)
+                next_wait = wait if next_wait is None else min(next_wait, wait)
+                continue
+
+            limit.take(waiter.tokens)
+            self._queue.remove(waiter)
+            self._active += 1
+            self._granted += 1
+            self._total_wait_seconds += time.monotonic() - waiter.enqueued_at
+            waiter.future.set_result(None)
+
+        if next_wait is not None and self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(next_wait, self._on_timer)
+
+    def _on_timer(self) -> None:
+        """Retry admission once a rate limit bucket has refilled."""
+        self._timer = None
+        self._dispatch()
+
+    def _retry_delay(self, outcome: Any, attempt: int, limit: _RateLimit) -> float | None:
+        """
+        Backoff before retrying a call, or None if it shouldn't be retried.
+
+        ``outcome`` is the raised error or the returned response; either may
+        carry a ``status_code`` directly or on its ``response``.
+        """
+        if attempt >= self.settings.llm_max_retries:
+            return None
+
+        response = getattr(outcome, "response", None) or outcome
+        status_code = getattr(outcome, "status_code", None) or getattr(response, "status_code", None)
+        if not isinstance(status_code, int) or not (status_code == 429 or status_code >= 500):
+            return None
+
+        if status_code == 429:
+            # Hold back everyone sharing this key until the bucket refills
+            limit.requests.drain()
+
+        ceiling = min(self.settings.llm_retry_max_delay_ms, self.settings.llm_retry_base_delay_ms * 2 ** attempt)
+        delay = random.uniform(ceiling / 2, ceiling) / 1000
+
+        headers = getattr(response, "headers", None) or {}
+        try:
+            delay = max(delay, float(headers.get("retry-after", 0)))
+        except (TypeError, ValueError):
+            pass
+        return delay
+
+    def _retry_after(self) -> int:
+        """Estimate how long until the queue has drained enough to accept work."""
+        concurrency = max(self.settings.llm_max_concurrency, 1)
+        estimate = len(self._queue) * self._avg_hold_seconds / concurrency
+        return min(max(math.ceil(estimate), 1), 60)
+
+    def _limit(self, key: tuple[str, str]) -> _RateLimit:
+        """Get or create the rate limit for an API key and model."""
+        limit = self._limits.get(key)
+        if limit is None:
+            rpm = self.settings.llm_requests_per_minute
+            tpm = self.settings.llm_tokens_per_minute
+            limit = _RateLimit(
+                requests=_TokenBucket(capacity=rpm, refill_per_second=rpm / 60),
+                tokens=_TokenBucket(capacity=tpm, refill_per_second=tpm / 60),
+            )
+            self._limits[key] = limit
+        return limit
+
+    @staticmethod
+    def _key(api_key: str | None, model: str) -> tuple[str, str]:
+        """Rate limit key, identifying the API key by a short hash."""
+        key_id = hashlib.sha256(api_key.encode()).hexdigest()[:12] if api_key else "default"
+        return key_id, model
+
+
+# Singleton instance
+llm_scheduler = LLMScheduler()
@@ -0,0 +1,77 @@
+"""
+Token Counting Utility
+Estimates prompt sizes for chat completion requests
+"""
+
+import logging
+from functools import lru_cache
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Rough characters-per-token ratio for English text when no tokenizer is available
+CHARS_PER_TOKEN = 4
+
+# Fixed overhead the chat format adds per message and per request
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_REQUEST = 3
+
+
+@lru_cache
+def _get_encoding(model: str):
+    """Load the tiktoken encoding for a model, or None if unavailable."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+
+    try:
+        encoding_name = tiktoken.encoding_name_for_model(model)
+    except KeyError:
+        encoding_name = "o200k_base"
+
+    try:
+        return tiktoken.get_encoding(encoding_name)
+    except Exception as e:
+        # Encodings are downloaded on first use and may be unreachable offline
+        logger.warning(f"[TOKENS] Tokenizer unavailable for {model}, estimating from length: {e}")
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-4o") -> int:
+    """
+    Count tokens in a piece of text.
+
+    Args:
+        text: Text to count
+        model: Model whose tokenizer to use
+
+    Returns:
+        Token count, estimated from length if tiktoken is not available
+    """
+    if not text:
+        return 0
+
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return max(1, round(len(text) / CHARS_PER_TOKEN))
+    return len(encoding.encode(text))
+
+
+def count_message_tokens(messages: list[dict[str, Any]], model: str = "gpt-4o") -> int:
+    """
+    Count prompt tokens for a list of chat messages.
+
+    Args:
+        messages: Chat messages with role and content
+        model: Model whose tokenizer to use
+
+    Returns:
+        Token count including chat formatting overhead
+    """
+    total = TOKENS_PER_REQUEST
+    for message in messages:
+        total += TOKENS_PER_MESSAGE
+        total += count_tokens(message.get("role", ""), model)
+        total += count_tokens(str(message.get("content") or ""), model)
+    return total
@@ -0,0 +1,124 @@
+"""
+Objective Evaluation Token Benchmark
+Compares prompt tokens sent per turn by full and incremental objective evaluation
+
+Runs the real ObjectiveService scheduling over a synthetic conversation with the
+OpenAI request replaced by a token count, so no API key or network is needed.
+
+Usage:
+    uv run python scripts/benchmark_objective_tokens.py [--turns 50] [--interval 8]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.models.chat import ObjectiveProgress  # noqa: E402
+from app.services.ai_service import AIService, ai_service  # noqa: E402
+from app.services.objective_service import objective_service  # noqa: E402
+from app.utils.tokens import count_message_tokens  # noqa: E402
+
+ADVISOR_LINES = [
+    "Thanks for coming in today. Before we look at any products, could you tell me a bit about what prompted the visit?",
+    "That makes sense. How would you describe your current savings, and roughly how much do you set aside each month?",
+    "I hear that the market swings last year worried you. What would a comfortable level of risk look like for you?",
+    "Let's talk about timelines. When do you expect to need this money, and are there any big expenses coming up?",
+    "Given what you've shared, a diversified mix with a larger bond allocation could smooth out some of that volatility.",
+    "I understand the fees concern. Let me walk you through exactly what you would pay and what you get in return.",
+]
+
+CLIENT_LINES = [
+    "Honestly, my sister keeps telling me I should be doing more with my money, and I'm not sure where to start.",
+    "We have about forty thousand in a savings account and I put maybe five hundred a month into my workplace plan.",
+    "I lost sleep when everything dropped. I'd rather earn a little less than watch it fall like that again.",
+    "Our daughter starts college in six years, and we'd like to retire around sixty-two if that's realistic.",
+    "Bonds sound safer, but I've read they don't keep up with inflation. Wouldn't I be falling behind?",
+    "Every advisor I've met seems to be pushing something. How do I know this isn't just about your commission?",
+]
+
+
+def build_conversation(turns: int) -> list[dict[str, Any]]:
+    """Build a synthetic advisor/client conversation with the given number of exchanges."""
+    messages: list[dict[str, Any]] = []
+    for turn in range(turns):
+        messages.append({"role": "user", "content": f"{ADVISOR_LINES[turn % len(ADVISOR_LINES)]} (turn {turn + 1})"})
+        messages.append({"role": "assistant", "content": CLIENT_LINES[turn % len(CLIENT_LINES)]})
+    return messages
+
+
+async def run(turns: int, interval: int) -> dict[str, Any]:
+    """Evaluate each advisor turn both ways and collect prompt token counts."""
+    objective_service.settings = objective_service.settings.model_copy(
+        update={"objective_full_evaluation_interval": interval}
+    )
+    sent_tokens: list[int] = []
+
+    async def count_request(
+        messages: list[dict[str, Any]],
+        api_key: str | None = None,
+        state_summary: str | None = None,
+    ) -> ObjectiveProgress:
+        sent_tokens.append(count_message_tokens(AIService._build_objective_messages(messages, state_summary)))
+        score = min(100, len(sent_tokens) * 2)
+        return ObjectiveProgress(
+            rapport=score,
+            needs=score,
+            objections=score / 2,
+            recommendations=score / 4,
+            explanation="Advisor is asking open questions about goals and acknowledging the client's concerns.",
+        )
+
+    ai_service._evaluate_objectives_openai = count_request
+
+    conversation = build_conversation(turns)
+    rows = []
+    for turn in range(1, turns + 1):
+        # Evaluation runs when the advisor sends their message, before the client replies
+        messages = conversation[: turn * 2 - 1]
+        if len(messages) <= 2:
+            continue
+
+        full_tokens = count_message_tokens(AIService._build_objective_messages(messages))
+        await objective_service._evaluate("benchmark", messages, "benchmark-key")
+        rows.append({"turn": turn, "full": full_tokens, "incremental": sent_tokens[-1]})
+
+    total_full = sum(r["full"] for r in rows)
+    total_incremental = sum(r["incremental"] for r in rows)
+    return {
+        "turns": turns,
+        "fullEvaluationInterval": interval,
+        "perTurn": rows,
+        "totalFull": total_full,
+        "totalIncremental": total_incremental,
+        "reduction": round(1 - total_incremental / total_full, 3) if total_full else 0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--turns", type=int, default=50, help="Advisor/client exchanges to simulate")
+    parser.add_argument("--interval", type=int, default=8, help="Full re-evaluation every N evaluations")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.turns, args.interval))
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(f"{'turn':>4}  {'full':>7}  {'incremental':>11}")
+    for row in result["perTurn"]:
+        print(f"{row['turn']:>4}  {row['full']:>7}  {row['incremental']:>11}")
+    print(f"\ntotal full:        {result['totalFull']}")
+    print(f"total incremental: {result['totalIncremental']}")
+    print(f"reduction:         {result['reduction']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+TTS Transport Benchmark
+Compares base64 JSON and binary audio chunk frames over Socket.IO at many concurrent streams
+
+Serves the real WebSocketTTSService on a local port with the speech audio already
+in the TTS audio cache, so no API key or network is needed, then connects
+--streams Socket.IO clients per transport. Each client asks for speech once,
+acknowledging every chunk like the frontend does (or not, with --no-flow-control,
+so the server falls back to fixed pacing), and the run reports bytes on the wire,
+throughput, stream latency and the CPU time of the process, which includes both
+the server and the clients.
+
+Usage:
+    uv run python scripts/benchmark_tts_transport.py [--streams 200] [--audio-kb 240] [--port 8765]
+        [--no-flow-control]
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+import socketio
+import uvicorn
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.tts_audio_cache import tts_audio_cache  # noqa: E402
+from app.services.websocket_tts_service import (  # noqa: E402
+    AUDIO_FRAME_HEADER,
+    AUDIO_TRANSPORT_BASE64,
+    AUDIO_TRANSPORT_BINARY,
+    FLOW_CONTROL_CREDITS,
+    TTS_MODEL,
+    TTS_RESPONSE_FORMAT,
+    WebSocketTTSService,
+)
+
+SPEECH_TEXT = "Thanks for coming in today. Could you tell me a bit about what prompted the visit?"
+SPEECH_VOICE = "alloy"
+SPEECH_SPEED = 1.0
+
+
+def _percentile(values: list[float], quantile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+
+async def _stream(url: str, transport: str, flow_control: bool, timeout: float) -> dict[str, Any]:
+    """Connect one client, request speech and count what arrives."""
+    sio = socketio.AsyncClient(reconnection=False)
+    ready = asyncio.Event()
+    done = asyncio.Event()
+    result = {"negotiated": None, "audioBytes": 0, "wireBytes": 0, "chunks": 0, "firstChunkMs": None}
+
+    @sio.on("tts-connected")
+    async def on_connected(data: dict[str, Any]) -> None:
+        result["negotiated"] = data.get("audioTransport", AUDIO_TRANSPORT_BASE64)
+        ready.set()
+
+    @sio.on("audio-chunk")
+    async def on_chunk(data: Any) -> None:
+        if result["firstChunkMs"] is None:
+            result["firstChunkMs"] = (time.monotonic() - started) * 1000
+        if isinstance(data, bytes):
+            (sequence,) = AUDIO_FRAME_HEADER.unpack_from(data)
+            result["wireBytes"] += len(data)
+            result["audioBytes"] += len(data) - AUDIO_FRAME_HEADER.size
+        else:
+            sequence = data["sequence"]
+            result["wireBytes"] += len(json.dumps(data))
+            result["audioBytes"] += len(base64.b64decode(data["data"]))
+        result["chunks"] += 1
+        if flow_control:
+            await sio.emit("audio-ack", {"sequence": sequence})
+
+    @sio.on("speech-end")
+    async def on_end(data: dict[str, Any]) -> None:
+        done.set()
+
+    try:
+        auth = {"audioTransport": transport}
+        if flow_control:
+            auth["flowControl"] = FLOW_CONTROL_CREDITS
+        await sio.connect(url, transports=["websocket"], auth=auth)
+        async with asyncio.timeout(timeout):
+            await ready.wait()
+            started = time.monotonic()
+            await sio.emit("generate-speech", {"text": SPEECH_TEXT, "voice": SPEECH_VOICE, "speed": SPEECH_SPEED})
+            await done.wait()
+        result["streamMs"] = (time.monotonic() - started) * 1000
+        return result
+    finally:
+        await sio.disconnect()
+
+
+async def run_transport(url: str, transport: str, streams: int, flow_control: bool, timeout: float) -> dict[str, Any]:
+    """Run every stream of one transport concurrently and summarize them."""
+    cpu_started = time.process_time()
+    started = time.monotonic()
+    results = await asyncio.gather(
+        *(_stream(url, transport, flow_control, timeout) for _ in range(streams)),
+        return_exceptions=True,
+    )
+    wall = time.monotonic() - started
+    cpu = time.process_time() - cpu_started
+
+    completed = [r for r in results if isinstance(r, dict)]
+    audio_bytes = sum(r["audioBytes"] for r in completed)
+    wire_bytes = sum(r["wireBytes"] for r in completed)
+    stream_ms = [r["streamMs"] for r in completed]
+    first_chunk_ms = [r["firstChunkMs"] for r in completed if r["firstChunkMs"] is not None]
+    return {
+        "transport": transport,
+        "negotiated": sorted({r["negotiated"] for r in completed}),
+        "streams": streams,
+        "flowControl": flow_control,
+        "chunks": sum(r["chunks"] for r in completed),
+        "completed": len(completed),
+        "errors": [repr(r) for r in results if isinstance(r, BaseException)][:5],
+        "wallSeconds": round(wall, 2),
+        "cpuSeconds": round(cpu, 2),
+        "audioMB": round(audio_bytes / 1e6, 2),
+        "wireMB": round(wire_bytes / 1e6, 2),
+        "wireOverhead": round(wire_bytes / audio_bytes - 1, 4) if audio_bytes else 0.0,
+        "throughputMBps": round(audio_bytes / 1e6 / wall, 2) if wall else 0.0,
+        "streamMs": {f"p{q}": round(_percentile(stream_ms, q / 100), 1) for q in (50, 95, 99)},
+        "firstChunkMs": {f"p{q}": round(_percentile(first_chunk_ms, q / 100), 1) for q in (50, 95, 99)},
+    }
+
+
+async def benchmark(args: argparse.Namespace) -> list[dict[str, Any]]:
+    service = WebSocketTTSService()
+    cache_key = tts_audio_cache.make_key(SPEECH_TEXT, SPEECH_VOICE, SPEECH_SPEED, TTS_MODEL, TTS_RESPONSE_FORMAT)
+    await tts_audio_cache.put(cache_key, os.urandom(args.audio_kb * 1024))
+
+    config = uvicorn.Config(service.get_asgi_app(), host="127.0.0.1", port=args.port, log_level="warning")
+    server = uvicorn.Server(config)
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    try:
+        url = f"http://127.0.0.1:{args.port}"
+        return [
+            await run_transport(url, transport, args.streams, not args.no_flow_control, args.timeout)
+            for transport in (AUDIO_TRANSPORT_BASE64, AUDIO_TRANSPORT_BINARY)
+        ]
+    finally:
+        server.should_exit = True
+        await serving
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--streams", type=int, default=200, help="Concurrent streams per transport")
+    parser.add_argument("--audio-kb", type=int, default=240, help="Audio size of each stream in KiB")
+    parser.add_argument("--port", type=int, default=8765, help="Local port for the Socket.IO server")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Seconds allowed per stream")
+    parser.add_argument("--no-flow-control", action="store_true", help="Don't acknowledge chunks, like older clients")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+    results = asyncio.run(benchmark(args))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'transport':<10} {'done':>9} {'chunks':>7} {'wall s':>7} {'cpu s':>6} {'wire MB':>8} {'overhead':>9} "
+          f"{'MB/s':>6} {'stream p50/p95 ms':>18} {'first p50/p95 ms':>17}")
+    for r in results:
+        print(
+            f"{r['transport']:<10} {r['completed']:>4}/{r['streams']:<4} {r['chunks']:>7} {r['wallSeconds']:>7} "
+            f"{r['cpuSeconds']:>6} {r['wireMB']:>8} {r['wireOverhead']:>9.1%} {r['throughputMBps']:>6} "
+            f"{r['streamMs']['p50']:>8}/{r['streamMs']['p95']:<9} {r['firstChunkMs']['p50']:>8}/{r['firstChunkMs']['p95']:<8}"
+        )
+        for error in r["errors"]:
+            print(f"  {error}")
+
+
+if __name__ == "__main__":
+    main()
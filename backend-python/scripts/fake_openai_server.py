@@ -0,0 +1,253 @@
+"""
+Fake OpenAI Server
+Deterministic stand-in for the OpenAI endpoints the backend calls, for load and latency testing
+
+Serves /v1/chat/completions (including tool calls and streaming), /v1/audio/speech
+and /v1/moderations with log-normal latency and injected 429 and 500 errors. Point
+the backend at it, and replace the Azure agents with the in-process fake client:
+
+    OPENAI_BASE_URL=http://127.0.0.1:8100/v1 OPENAI_API_KEY=fake FAKE_AGENTS_ENABLED=true uv run uvicorn app.main:app --port 3001
+
+Usage:
+    uv run python scripts/fake_openai_server.py [--port 8100] [--latency-median-ms 600]
+        [--latency-p95-ms 2000] [--error-rate 0.01] [--rate-limit-rate 0.02] [--seed 0]
+
+Unset options fall back to the FAKE_LLM_* settings, which the fake agents client also uses.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+import uvicorn
+from fastapi import Body, FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.config import get_settings  # noqa: E402
+from app.utils.fake_llm import FakeCall, FakeLLM  # noqa: E402
+
+# Audio is produced this many times faster than it plays
+SPEECH_REALTIME_FACTOR = 4
+SPEECH_CHUNK_BYTES = 16384
+SPEECH_BYTES_PER_SECOND = 16000
+
+MODERATION_CATEGORIES = [
+    "harassment",
+    "harassment/threatening",
+    "hate",
+    "hate/threatening",
+    "self-harm",
+    "self-harm/instructions",
+    "self-harm/intent",
+    "sexual",
+    "sexual/minors",
+    "violence",
+    "violence/graphic",
+]
+
+
+def _prompt_text(messages: list[dict[str, Any]]) -> str:
+    """Flatten chat messages into the text the reply is derived from."""
+    parts = []
+    for message in messages:
+        content = message.get("content")
+        parts.append(content if isinstance(content, str) else json.dumps(content))
+    return "\n".join(parts)
+
+
+def _error_response(call: FakeCall) -> JSONResponse:
+    if call.status_code == 429:
+        return JSONResponse(
+            {"error": {"message": "Fake rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}},
+            status_code=429,
+            headers={"Retry-After": "1"},
+        )
+    return JSONResponse(
+        {"error": {"message": "Fake server error", "type": "server_error", "code": None}},
+        status_code=call.status_code,
+    )
+
+
+def _tool_call(fake: FakeLLM, body: dict[str, Any], call: FakeCall) -> dict[str, Any] | None:
+    """Pick the tool call the request asks for or allows, if any."""
+    tools = [t["function"] for t in body.get("tools") or [] if t.get("type") == "function"]
+    messages = body.get("messages") or []
+    tool_choice = body.get("tool_choice", "auto")
+    # Answer in text once tool results are in, as models do
+    if not tools or tool_choice == "none" or (messages and messages[-1].get("role") == "tool"):
+        return None
+
+    if isinstance(tool_choice, dict):
+        name = tool_choice.get("function", {}).get("name")
+        function = next((t for t in tools if t["name"] == name), None)
+    elif tool_choice == "required" or fake.wants_tool_call(call.rng):
+        function = call.rng.choice(tools)
+    else:
+        function = None
+    if function is None:
+        return None
+
+    return {
+        "id": f"call_{uuid.uuid4().hex[:24]}",
+        "type": "function",
+        "function": {
+            "name": function["name"],
+            "arguments": json.dumps(fake.tool_arguments(function.get("parameters") or {}, call.rng)),
+        },
+    }
+
+
+def create_app(fake: FakeLLM) -> FastAPI:
+    """Create the fake OpenAI API app."""
+    app = FastAPI(title="Fake OpenAI")
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(body: dict[str, Any] = Body(...)):
+        call = fake.call(body)
+        if call.failed:
+            await asyncio.sleep(call.ttfb_seconds)
+            return _error_response(call)
+
+        model = body.get("model", "gpt-4o")
+        prompt = _prompt_text(body.get("messages") or [])
+        tool_call = _tool_call(fake, body, call)
+        reply = "" if tool_call else fake.reply(prompt, call.rng)
+        usage = fake.usage(prompt, tool_call["function"]["arguments"] if tool_call else reply)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+        finish_reason = "tool_calls" if tool_call else "stop"
+
+        if body.get("stream"):
+            include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+
+            def chunk(delta: dict[str, Any], finish: str | None = None) -> str:
+                payload = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+                }
+                return f"data: {json.dumps(payload)}\n\n"
+
+            async def events() -> AsyncIterator[str]:
+                await asyncio.sleep(call.ttfb_seconds)
+                yield chunk({"role": "assistant", "content": ""})
+                if tool_call:
+                    yield chunk({"tool_calls": [{"index": 0, **tool_call}]})
+                else:
+                    for index, token in enumerate(fake.split_tokens(reply)):
+                        if index:
+                            await asyncio.sleep(call.seconds_per_token)
+                        yield chunk({"content": token})
+                yield chunk({}, finish_reason)
+                if include_usage:
+                    usage_chunk = {
+                        "id": completion_id,
+                        "object": "chat.completion.chunk",
+                        "created": created,
+                        "model": model,
+                        "choices": [],
+                        "usage": usage,
+                    }
+                    yield f"data: {json.dumps(usage_chunk)}\n\n"
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(events(), media_type="text/event-stream")
+
+        await asyncio.sleep(call.duration(usage["completion_tokens"]))
+        message: dict[str, Any] = {"role": "assistant", "content": reply or None}
+        if tool_call:
+            message["tool_calls"] = [tool_call]
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+            "usage": usage,
+        }
+
+    @app.post("/v1/audio/speech")
+    async def audio_speech(body: dict[str, Any] = Body(...)):
+        call = fake.call(body)
+        await asyncio.sleep(call.ttfb_seconds)
+        if call.failed:
+            return _error_response(call)
+
+        audio = fake.speech(body.get("input", ""))
+        chunk_seconds = SPEECH_CHUNK_BYTES / SPEECH_BYTES_PER_SECOND / SPEECH_REALTIME_FACTOR
+
+        async def stream() -> AsyncIterator[bytes]:
+            for offset in range(0, len(audio), SPEECH_CHUNK_BYTES):
+                if offset:
+                    await asyncio.sleep(chunk_seconds)
+                yield audio[offset:offset + SPEECH_CHUNK_BYTES]
+
+        return StreamingResponse(stream(), media_type="audio/mpeg")
+
+    @app.post("/v1/moderations")
+    async def moderations(body: dict[str, Any] = Body(...)):
+        call = fake.call(body)
+        await asyncio.sleep(call.ttfb_seconds)
+        if call.failed:
+            return _error_response(call)
+
+        inputs = body.get("input", "")
+        return {
+            "id": f"modr-{uuid.uuid4().hex[:24]}",
+            "model": body.get("model") or "omni-moderation-latest",
+            "results": [
+                {
+                    "flagged": False,
+                    "categories": {category: False for category in MODERATION_CATEGORIES},
+                    "category_scores": {category: 0.0 for category in MODERATION_CATEGORIES},
+                }
+                for _ in (inputs if isinstance(inputs, list) else [inputs])
+            ],
+        }
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0], formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--seed", type=int, help="Seed for replies, latencies and failures")
+    parser.add_argument("--latency-median-ms", type=float, help="Median time to first token")
+    parser.add_argument("--latency-p95-ms", type=float, help="95th percentile time to first token")
+    parser.add_argument("--tokens-per-second", type=float, help="Output speed after the first token")
+    parser.add_argument("--error-rate", type=float, help="Share of calls failing with a 500")
+    parser.add_argument("--rate-limit-rate", type=float, help="Share of calls failing with a 429")
+    parser.add_argument("--tool-call-rate", type=float, help="Share of calls with optional tools that call one")
+    args = parser.parse_args()
+
+    overrides = {
+        f"fake_llm_{name}": value
+        for name, value in vars(args).items()
+        if name not in ("host", "port") and value is not None
+    }
+    settings = get_settings().model_copy(update=overrides)
+
+    print(
+        f"Fake OpenAI on http://{args.host}:{args.port}/v1 "
+        f"(median {settings.fake_llm_latency_median_ms:.0f}ms, p95 {settings.fake_llm_latency_p95_ms:.0f}ms, "
+        f"errors {settings.fake_llm_error_rate:.1%}, 429s {settings.fake_llm_rate_limit_rate:.1%}, seed {settings.fake_llm_seed})"
+    )
+    uvicorn.run(create_app(FakeLLM(settings)), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,404 @@
+"""
+Concurrent Learner Load Test
+Drives N simulated learners through the real API and reports per-step latency percentiles
+
+Each learner registers and logs in, starts a simulation, holds a multi-turn
+conversation (client-response every turn, expert-response every few turns, TTS
+over Socket.IO for each client reply), then generates a review and completes the
+simulation. Run it against the backend pointed at scripts/fake_openai_server.py
+(see README "Load Testing") to measure the backend without spending API quota.
+
+Usage:
+    uv run python scripts/load_test.py [--base-url http://127.0.0.1:3001] [--learners 20]
+        [--turns 6] [--expert-every 3] [--think-time 1.0] [--ramp-up 5] [--no-tts]
+        [--json] [--output results.json]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import httpx
+import socketio
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.simulation_service import SimulationService  # noqa: E402
+from app.utils.event_loop_monitor import EventLoopMonitor, histogram_percentile  # noqa: E402
+
+STEPS = [
+    "register",
+    "login",
+    "create-simulation",
+    "client-response",
+    "expert-response",
+    "tts-first-chunk",
+    "tts-complete",
+    "generate-review",
+    "complete",
+]
+
+ADVISOR_LINES = [
+    "Thanks for coming in today. What prompted the visit?",
+    "Could you tell me a bit about your current savings and how much you set aside each month?",
+    "What would a comfortable level of risk look like for you?",
+    "When do you expect to need this money, and are there any big expenses coming up?",
+    "Given what you've shared, a more diversified mix could smooth out some of that volatility.",
+    "Let me walk you through exactly what you would pay and what you get in return.",
+    "How does that sound as a starting point? What questions do you have?",
+]
+
+PASSWORD = "LoadTest-Passw0rd!"
+
+
+class StepError(Exception):
+    """A learner step failed; the learner stops there."""
+
+
+class Recorder:
+    """Latencies and errors per step."""
+
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def success(self, step: str, seconds: float) -> None:
+        self.latencies[step].append(seconds * 1000)
+
+    def failure(self, step: str, reason: str) -> None:
+        self.errors[step][reason] += 1
+
+    def summary(self) -> dict[str, Any]:
+        steps = {}
+        for step in STEPS:
+            samples = sorted(self.latencies.get(step, []))
+            errors = sum(self.errors.get(step, {}).values())
+            if not samples and not errors:
+                continue
+            steps[step] = {
+                "count": len(samples),
+                "errors": errors,
+                "errorRate": round(errors / (len(samples) + errors), 4),
+                "meanMs": round(sum(samples) / len(samples), 1) if samples else 0.0,
+                **{f"p{q}Ms": _percentile(samples, q / 100) for q in (50, 95, 99)},
+                "maxMs": round(samples[-1], 1) if samples else 0.0,
+            }
+        return steps
+
+
+def _percentile(ordered: list[float], quantile: float) -> float:
+    if not ordered:
+        return 0.0
+    return round(ordered[min(len(ordered) - 1, int(quantile * len(ordered)))], 1)
+
+
+def _reason(error: Exception) -> str:
+    """Short, groupable description of a failure."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return f"HTTP {error.response.status_code}"
+    if isinstance(error, StepError):
+        return str(error)
+    return type(error).__name__
+
+
+class Learner:
+    """One simulated learner working through a simulation."""
+
+    def __init__(self, index: int, run_id: str, args: argparse.Namespace, http: httpx.AsyncClient, recorder: Recorder):
+        self.index = index
+        self.args = args
+        self.http = http
+        self.recorder = recorder
+        self.rng = random.Random(f"{args.seed}:{index}")
+        self.email = f"loadtest-{run_id}-{index}@example.com"
+        self.headers: dict[str, str] = {}
+        self.sio: socketio.AsyncClient | None = None
+        self.speech_events: asyncio.Queue[tuple[str, float]] = asyncio.Queue()
+
+    async def run(self) -> bool:
+        """Run the whole journey, returning whether it completed."""
+        try:
+            await self._journey()
+            return True
+        except Exception:
+            return False
+        finally:
+            if self.sio and self.sio.connected:
+                await self.sio.disconnect()
+
+    async def _journey(self) -> None:
+        await self._step("register", self._post, "/api/auth/register", {
+            "name": f"Load Test Learner {self.index}",
+            "email": self.email,
+            "password": PASSWORD,
+        })
+        login = await self._step("login", self._post, "/api/auth/login", {"email": self.email, "password": PASSWORD})
+        self.headers = {"Authorization": f"Bearer {login['data']['token']}"}
+
+        created = await self._step("create-simulation", self._post, "/api/simulation", {
+            "industry": self.args.industry,
+            "difficulty": self.args.difficulty,
+        })
+        simulation = created["data"]
+        simulation_settings = {
+            "simulationId": simulation["id"],
+            "industry": self.args.industry,
+            "difficulty": self.args.difficulty,
+        }
+        client_profile = simulation.get("client_profile") or {"name": "Load Test Client"}
+
+        if self.args.tts:
+            await self._connect_tts()
+
+        started = time.monotonic()
+        messages: list[dict[str, Any]] = []
+        for turn in range(1, self.args.turns + 1):
+            await self._think()
+            messages.append({"role": "user", "content": f"{self.rng.choice(ADVISOR_LINES)} (learner {self.index}, turn {turn})"})
+            reply = await self._step("client-response", self._post, "/api/chat/client-response", {
+                "messages": messages,
+                "clientProfile": client_profile,
+                "simulationSettings": simulation_settings,
+            })
+            messages.append({"role": "assistant", "content": reply.get("message", "")})
+
+            if self.args.tts and reply.get("message"):
+                await self._speak(reply["message"])
+
+            if self.args.expert_every and turn % self.args.expert_every == 0:
+                await self._step("expert-response", self._post, "/api/chat/expert-response", {
+                    "messages": messages,
+                    "clientProfile": client_profile,
+                    "simulationSettings": simulation_settings,
+                })
+
+        review = await self._step("generate-review", self._post, "/api/simulation/generate-review", {
+            "messages": messages,
+            "difficultyLevel": self.args.difficulty,
+        })
+        await self._step("complete", self._post, f"/api/simulation/{simulation['id']}/complete", {
+            "total_xp": 100,
+            "performance_review": review.get("data"),
+            "duration_seconds": int(time.monotonic() - started),
+        })
+
+    async def _step(self, step: str, func: Any, *args: Any) -> Any:
+        """Time a step, recording its latency or failure."""
+        started = time.monotonic()
+        try:
+            result = await func(*args)
+        except Exception as e:
+            self.recorder.failure(step, _reason(e))
+            raise
+        self.recorder.success(step, time.monotonic() - started)
+        return result
+
+    async def _post(self, path: str, body: dict[str, Any]) -> dict[str, Any]:
+        response = await self.http.post(path, json=body, headers=self.headers)
+        response.raise_for_status()
+        return response.json()
+
+    async def _think(self) -> None:
+        if self.args.think_time > 0:
+            await asyncio.sleep(self.rng.uniform(0.5, 1.5) * self.args.think_time)
+
+    async def _connect_tts(self) -> None:
+        """Connect to the TTS Socket.IO service and wait until it is ready."""
+        self.sio = socketio.AsyncClient(reconnection=False)
+        ready = asyncio.Event()
+
+        @self.sio.on("tts-connected")
+        async def on_connected(data: dict[str, Any]) -> None:
+            ready.set()
+
+        for event in ("audio-chunk", "speech-end", "tts-error"):
+            self.sio.on(event, self._speech_handler(event))
+
+        try:
+            await self.sio.connect(self.args.base_url, transports=["websocket"], socketio_path="socket.io")
+            async with asyncio.timeout(self.args.timeout):
+                await ready.wait()
+        except Exception as e:
+            self.recorder.failure("tts-first-chunk", f"connect: {_reason(e)}")
+            raise
+
+    def _speech_handler(self, event: str) -> Any:
+        async def handler(data: Any = None) -> None:
+            self.speech_events.put_nowait((event, time.monotonic()))
+        return handler
+
+    async def _speak(self, text: str) -> None:
+        """Request speech for a reply and time the first chunk and the end of the stream."""
+        while not self.speech_events.empty():
+            self.speech_events.get_nowait()
+
+        started = time.monotonic()
+        first_chunk = None
+        await self.sio.emit("generate-speech", {"text": text})
+        try:
+            async with asyncio.timeout(self.args.timeout):
+                while True:
+                    event, at = await self.speech_events.get()
+                    if event == "tts-error":
+                        raise StepError("tts-error")
+                    if event == "audio-chunk" and first_chunk is None:
+                        first_chunk = at
+                        self.recorder.success("tts-first-chunk", at - started)
+                    if event == "speech-end":
+                        self.recorder.success("tts-complete", at - started)
+                        return
+        except Exception as e:
+            self.recorder.failure("tts-complete" if first_chunk else "tts-first-chunk", _reason(e))
+            raise
+
+
+async def _server_stats(http: httpx.AsyncClient, path: str) -> dict[str, Any] | None:
+    try:
+        response = await http.get(path)
+        response.raise_for_status()
+        return response.json()
+    except Exception:
+        return None
+
+
+def _server_lag(before: dict[str, Any] | None, after: dict[str, Any] | None) -> dict[str, Any] | None:
+    """Server event loop lag over the run, from the difference of two histogram snapshots."""
+    if not before or not after:
+        return None
+    counts = [end - start for start, end in zip(before["histogram"]["counts"], after["histogram"]["counts"])]
+    return {
+        "samples": sum(counts),
+        **{f"p{q}Ms": histogram_percentile(counts, q / 100) for q in (50, 95, 99)},
+        "maxMsSinceStart": after["maxLagMs"],
+    }
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Run all learners and collect the report."""
+    run_id = uuid.uuid4().hex[:8]
+    recorder = Recorder()
+    client_monitor = EventLoopMonitor()
+    client_monitor.start()
+
+    limits = httpx.Limits(max_connections=args.learners * 2, max_keepalive_connections=args.learners * 2)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as http:
+        loop_before = await _server_stats(http, "/api/event-loop/stats")
+        started_at = datetime.now(timezone.utc)
+        started = time.monotonic()
+
+        async def start_learner(index: int) -> bool:
+            if args.ramp_up > 0:
+                await asyncio.sleep(args.ramp_up * index / args.learners)
+            return await Learner(index, run_id, args, http, recorder).run()
+
+        completed = await asyncio.gather(*[start_learner(i) for i in range(args.learners)])
+        duration = time.monotonic() - started
+
+        loop_after = await _server_stats(http, "/api/event-loop/stats")
+        scheduler = await _server_stats(http, "/api/llm-scheduler/stats")
+
+    await client_monitor.stop()
+    client_lag = client_monitor.get_stats()
+    requests = sum(len(samples) for samples in recorder.latencies.values())
+    errors = sum(sum(reasons.values()) for reasons in recorder.errors.values())
+
+    return {
+        "runId": run_id,
+        "startedAt": started_at.isoformat(),
+        "durationSeconds": round(duration, 2),
+        "config": {
+            "baseUrl": args.base_url,
+            "learners": args.learners,
+            "turns": args.turns,
+            "expertEvery": args.expert_every,
+            "thinkTime": args.think_time,
+            "rampUp": args.ramp_up,
+            "tts": args.tts,
+            "industry": args.industry,
+            "difficulty": args.difficulty,
+            "seed": args.seed,
+        },
+        "learners": {
+            "completed": sum(completed),
+            "failed": len(completed) - sum(completed),
+        },
+        "requests": requests,
+        "errors": errors,
+        "throughputPerSecond": round(requests / duration, 2) if duration else 0.0,
+        "steps": recorder.summary(),
+        "errorReasons": {step: dict(reasons) for step, reasons in recorder.errors.items()},
+        "eventLoopLagMs": {
+            "server": _server_lag(loop_before, loop_after),
+            "client": {"samples": client_lag["samples"], **client_lag["lagMs"], "max": client_lag["maxLagMs"]},
+        },
+        "llmScheduler": {
+            "shed": scheduler["shed"],
+            "retries": scheduler["retries"],
+            "avgQueueWaitMs": scheduler["avgQueueWaitMs"],
+        } if scheduler else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:3001", help="Backend base URL")
+    parser.add_argument("--learners", type=int, default=20, help="Concurrent learners")
+    parser.add_argument("--turns", type=int, default=6, help="Advisor turns per simulation")
+    parser.add_argument("--expert-every", type=int, default=3, help="Ask the expert every N turns (0 to skip)")
+    parser.add_argument("--think-time", type=float, default=1.0, help="Average seconds between a reply and the next turn")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="Seconds over which learners start")
+    parser.add_argument("--no-tts", dest="tts", action="store_false", help="Skip speech over Socket.IO")
+    parser.add_argument(
+        "--industry",
+        default="wealth-management",
+        choices=SimulationService.VALID_INDUSTRIES,
+        help="Simulation industry",
+    )
+    parser.add_argument(
+        "--difficulty",
+        default="beginner",
+        choices=list(SimulationService.DIFFICULTY_MAP),
+        help="Simulation difficulty",
+    )
+    parser.add_argument("--timeout", type=float, default=120.0, help="Seconds before a request is given up")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for learner messages and think times")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--output", type=Path, help="Also write the JSON results to this file")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2), encoding="utf-8")
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(f"{result['learners']['completed']}/{args.learners} learners completed in {result['durationSeconds']}s "
+          f"({result['throughputPerSecond']} req/s, {result['errors']} errors)\n")
+    print(f"{'step':<18} {'count':>6} {'errors':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for step, stats in result["steps"].items():
+        print(f"{step:<18} {stats['count']:>6} {stats['errors']:>6} {stats['p50Ms']:>9} "
+              f"{stats['p95Ms']:>9} {stats['p99Ms']:>9} {stats['maxMs']:>9}")
+    for step, reasons in result["errorReasons"].items():
+        print(f"\nerrors in {step}: " + ", ".join(f"{reason} x{count}" for reason, count in reasons.items()))
+
+    server_lag = result["eventLoopLagMs"]["server"]
+    if server_lag:
+        print(f"\nserver event loop lag: p50 <={server_lag['p50Ms']}ms, p95 <={server_lag['p95Ms']}ms, "
+              f"p99 <={server_lag['p99Ms']}ms")
+    client_lag = result["eventLoopLagMs"]["client"]
+    print(f"client event loop lag: p99 {client_lag['p99']}ms, max {client_lag['max']}ms")
+
+
+if __name__ == "__main__":
+    main()
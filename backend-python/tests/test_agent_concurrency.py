@@ -0,0 +1,94 @@
+"""
+Agent Concurrency Tests
+Interleaved simulation client turns on one agent must each see their own run's tool context
+
+Every run uses a different client profile and is answered by the fake agents
+client, which asks for a tool call on every run. Tool handlers are slowed down
+at random so runs overlap mid tool call. Half the runs use the non-streaming
+path, half stream. No Azure or OpenAI access is needed.
+"""
+
+import asyncio
+import json
+import random
+from contextvars import ContextVar
+from typing import Any
+
+import pytest
+
+from app.agents.simulation_client_agent import SimulationClientAgent
+from app.config import get_settings
+
+RUNS = 100
+
+# Profile name the tool calls of the current run must see; copied into any
+# task the run starts, independently of how the agent passes its context
+expected_name: ContextVar[str] = ContextVar("expected_name")
+
+
+def profile_for(run: int) -> dict[str, Any]:
+    """Client profile unique to one run."""
+    return {"name": f"Client {run}", "age": 30 + run % 40, "occupation": "Teacher", "goals": [f"Goal {run}"]}
+
+
+@pytest.fixture
+async def agent(monkeypatch: pytest.MonkeyPatch):
+    """Simulation client agent on the fake agents client, asking for a tool call on every run."""
+    monkeypatch.setenv("FAKE_AGENTS_ENABLED", "true")
+    monkeypatch.setenv("FAKE_LLM_TOOL_CALL_RATE", "1")
+    monkeypatch.setenv("FAKE_LLM_ERROR_RATE", "0")
+    monkeypatch.setenv("FAKE_LLM_RATE_LIMIT_RATE", "0")
+    monkeypatch.setenv("FAKE_LLM_LATENCY_MEDIAN_MS", "20")
+    monkeypatch.setenv("FAKE_LLM_LATENCY_P95_MS", "80")
+    monkeypatch.setenv("FAKE_LLM_TOKENS_PER_SECOND", "2000")
+    get_settings.cache_clear()
+
+    agent = SimulationClientAgent()
+    assert await agent.initialize()
+    yield agent
+
+    await agent.cleanup()
+    get_settings.cache_clear()
+
+
+async def test_interleaved_runs_see_their_own_tool_context(agent: SimulationClientAgent):
+    rng = random.Random(1)
+    handle_tool_call = agent.handle_tool_call
+    tool_calls = 0
+    mismatches: list[dict[str, Any]] = []
+
+    async def slow_handle_tool_call(tool_name: str, arguments: dict[str, Any]) -> str:
+        nonlocal tool_calls
+        expected = expected_name.get()
+        await asyncio.sleep(rng.uniform(0, 0.02))
+        seen = agent.tool_context.get("client_profile", {}).get("name")
+        output = await handle_tool_call(tool_name, arguments)
+        await asyncio.sleep(rng.uniform(0, 0.02))
+        tool_calls += 1
+        if seen != expected:
+            mismatches.append({"tool": tool_name, "expected": expected, "seen": seen})
+        elif tool_name == "get_client_profile" and json.loads(output).get("name") != expected:
+            mismatches.append({"tool": tool_name, "expected": expected, "output": output})
+        return output
+
+    agent.handle_tool_call = slow_handle_tool_call
+
+    async def turn(run: int) -> None:
+        expected_name.set(profile_for(run)["name"])
+        kwargs = {
+            "messages": [{"role": "user", "content": f"Hello, what brings you in today? ({run})"}],
+            "client_profile": profile_for(run),
+            "simulation_settings": {"difficulty": "beginner"},
+            "session_id": f"concurrency-{run}",
+        }
+        if run % 2:
+            async for _ in agent.generate_response_stream(**kwargs):
+                pass
+        else:
+            await agent.generate_response(**kwargs)
+
+    results = await asyncio.gather(*(turn(run) for run in range(RUNS)), return_exceptions=True)
+
+    assert [r for r in results if isinstance(r, Exception)] == []
+    assert tool_calls >= RUNS
+    assert mismatches == []
@@ -0,0 +1,14 @@
+-- Pool of pre-generated client profiles, consumed when a simulation starts
+
+CREATE TABLE IF NOT EXISTS client_profile_pool (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  industry VARCHAR(100) NOT NULL,
+  difficulty VARCHAR(50) NOT NULL,
+  profile JSONB NOT NULL,
+  source VARCHAR(50),
+  created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Profiles are popped oldest first within an (industry, difficulty) bucket
+CREATE INDEX IF NOT EXISTS idx_client_profile_pool_bucket
+  ON client_profile_pool (industry, difficulty, created_at);
@@ -0,0 +1,22 @@
+-- Per-call LLM latency and token usage, for cost and latency dashboards
+
+CREATE TABLE IF NOT EXISTS llm_call_metrics (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  endpoint VARCHAR(100) NOT NULL,
+  provider VARCHAR(50) NOT NULL,
+  model VARCHAR(100) NOT NULL,
+  simulation_id VARCHAR(100),
+  prompt_tokens INTEGER,
+  completion_tokens INTEGER,
+  ttfb_ms INTEGER,
+  latency_ms INTEGER NOT NULL,
+  success BOOLEAN NOT NULL DEFAULT TRUE,
+  created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Dashboards aggregate by endpoint and model over time ranges
+CREATE INDEX IF NOT EXISTS idx_llm_call_metrics_endpoint_created
+  ON llm_call_metrics (endpoint, model, created_at);
+
+CREATE INDEX IF NOT EXISTS idx_llm_call_metrics_simulation
+  ON llm_call_metrics (simulation_id);
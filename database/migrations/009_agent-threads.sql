@@ -0,0 +1,14 @@
+-- Azure AI agent threads per simulation, shared by every worker and kept across restarts
+
+CREATE TABLE IF NOT EXISTS agent_threads (
+  session_id VARCHAR(100) NOT NULL,
+  agent_name VARCHAR(100) NOT NULL,
+  thread_id VARCHAR(100) NOT NULL,
+  created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+  last_used_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (session_id, agent_name)
+);
+
+-- Expired threads are swept by last use
+CREATE INDEX IF NOT EXISTS idx_agent_threads_last_used
+  ON agent_threads (last_used_at);
@@ -0,0 +1,4 @@
+-- What each agent thread holds and which turn is using it, so any worker can continue a session's thread
+
+ALTER TABLE agent_threads ADD COLUMN IF NOT EXISTS sync_state JSONB;
+ALTER TABLE agent_threads ADD COLUMN IF NOT EXISTS claimed_at TIMESTAMP WITH TIME ZONE;
@@ -1272,6 +1272,10 @@ export default function SimulationSessionPage() {
       fetchIndustrySettings();
     }, [industry, subcategory]);
 
+    // Keep the socket callback pointed at the latest render's handler
+    const objectiveProgressHandlerRef = useRef(handleObjectiveProgress)
+    objectiveProgressHandlerRef.current = handleObjectiveProgress
+
     // Initialize TTS connection
     useEffect(() => {
       const initTTS = async () => {
@@ -1289,6 +1293,12 @@ export default function SimulationSessionPage() {
             console.error('[TTS] Error:', error);
           });
 
+          // Objective progress is evaluated in the background and pushed over the socket
+          websocketTTS.onObjectiveProgress((progress) => {
+            objectiveProgressHandlerRef.current(progress);
+          });
+          websocketTTS.subscribeToSimulation(simulationId);
+
           // Connect to TTS service
           await websocketTTS.connect();
           console.log('[TTS] Connected successfully');
@@ -165,6 +165,35 @@ class ApiClient {
     });
   }
 
+  /**
+   * Make a POST request and return the raw response for streaming bodies
+   */
+  async postStream(
+    endpoint: string,
+    body?: any,
+    options: Omit<RequestOptions, "method" | "body"> = {}
+  ): Promise<Response> {
+    const { params, headers, ...fetchOptions } = options;
+
+    const response = await fetch(this.buildUrl(endpoint, params), {
+      ...fetchOptions,
+      method: "POST",
+      headers: this.buildHeaders(headers),
+      body: body ? JSON.stringify(body) : undefined,
+    });
+
+    if (!response.ok || !response.body) {
+      const data = await response.json().catch(() => ({}));
+      throw new ApiError(
+        response.status,
+        data.message || `HTTP ${response.status}: ${response.statusText}`,
+        data
+      );
+    }
+
+    return response;
+  }
+
   /**
    * Make a PUT request
    */
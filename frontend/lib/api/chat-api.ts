@@ -38,6 +38,13 @@ export interface ClientResponseResult {
   success: boolean;
   message: string;
   objectiveProgress?: any;
+  objectiveProgressPending?: boolean;
+}
+
+export interface ClientResponseStreamHandlers {
+  onToken?: (text: string) => void;
+  onMessage?: (message: string) => void;
+  onObjectiveProgress?: (objectiveProgress: any) => void;
 }
 
 export interface ExpertResponseResult {
@@ -88,6 +95,82 @@ export const chatApi = {
     }
   },
 
+  /**
+   * Stream AI client response over Server-Sent Events.
+   * Tokens are delivered through handlers as they arrive; the promise resolves
+   * once the trailing objective-progress event has been received.
+   */
+  async streamClientResponse(
+    messages: ChatMessage[],
+    clientProfile: ClientProfile,
+    personalitySettings: PersonalitySettings,
+    simulationSettings: SimulationSettings,
+    handlers: ClientResponseStreamHandlers = {},
+    apiKey?: string
+  ): Promise<ClientResponseResult> {
+    const result: ClientResponseResult = { success: false, message: "", objectiveProgress: null };
+
+    try {
+      const response = await apiClient.postStream("/api/chat/client-response/stream", {
+        messages,
+        clientProfile,
+        personalitySettings,
+        simulationSettings,
+        apiKey,
+      });
+
+      const reader = response.body!.getReader();
+      const decoder = new TextDecoder();
+      let buffer = "";
+
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary = buffer.indexOf("\n\n");
+        while (boundary !== -1) {
+          const frame = buffer.slice(0, boundary);
+          buffer = buffer.slice(boundary + 2);
+          boundary = buffer.indexOf("\n\n");
+
+          let event = "message";
+          let data = "";
+          for (const line of frame.split("\n")) {
+            if (line.startsWith("event:")) event = line.slice(6).trim();
+            else if (line.startsWith("data:")) data += line.slice(5).trim();
+          }
+          if (!data) continue;
+          const payload = JSON.parse(data);
+
+          if (event === "token") {
+            result.message += payload.text;
+            handlers.onToken?.(payload.text);
+          } else if (event === "message") {
+            result.success = payload.success;
+            result.message = payload.message;
+            handlers.onMessage?.(payload.message);
+          } else if (event === "objective-progress") {
+            result.objectiveProgress = payload.objectiveProgress;
+            handlers.onObjectiveProgress?.(payload.objectiveProgress);
+          } else if (event === "error") {
+            result.success = false;
+            result.message = payload.message;
+          }
+        }
+      }
+
+      return result;
+    } catch (error: any) {
+      console.error("[CHAT-API] Error streaming client response:", error);
+      return {
+        success: false,
+        message: "I'm sorry, I'm having trouble with that. Let's continue our conversation.",
+        objectiveProgress: null,
+      };
+    }
+  },
+
   /**
    * Generate expert guidance response
    */
@@ -4,6 +4,7 @@
  */
 
 import { io, Socket } from 'socket.io-client';
+import { apiClient } from '@/lib/api-client';
 
 export type TTSVoice = 'alloy' | 'echo' | 'fable' | 'onyx' | 'nova' | 'shimmer';
 
@@ -14,6 +15,12 @@ export interface TTSOptions {
 
 export type ConnectionState = 'disconnected' | 'connecting' | 'connected' | 'error';
 
+// Binary audio chunks start with the chunk's sequence number (uint32, big-endian)
+const AUDIO_FRAME_HEADER_BYTES = 4;
+
+// Audio chunks the server may send ahead of our acknowledgements
+const AUDIO_CREDIT_WINDOW = 8;
+
 interface AudioQueueItem {
   buffer: ArrayBuffer;
   index: number;
@@ -34,6 +41,9 @@ class WebSocketTTSClient {
   private onErrorCallbacks: ((error: string) => void)[] = [];
   private onSpeechStartCallbacks: (() => void)[] = [];
   private onSpeechEndCallbacks: (() => void)[] = [];
+  private onObjectiveProgressCallbacks: ((progress: any) => void)[] = [];
+  private subscribedSimulationId: string | null = null;
+  private flowControl: boolean = false;
 
   constructor(serverUrl?: string) {
     this.serverUrl = serverUrl || process.env.NEXT_PUBLIC_API_URL || 'http://localhost:3001';
@@ -84,6 +94,11 @@ class WebSocketTTSClient {
           reconnection: true,
           reconnectionAttempts: 5,
           reconnectionDelay: 1000,
+          // Ask for raw audio frames paced by our acks; servers that don't support
+          // them keep sending base64 at a fixed pace. The session token authorizes
+          // simulation subscriptions and is re-read on every reconnect.
+          auth: (cb) =>
+            cb({ audioTransport: 'binary', flowControl: 'credits', token: apiClient.getSessionToken() }),
         });
 
         // Setup persistent event handlers first
@@ -137,6 +152,11 @@ class WebSocketTTSClient {
       console.log('[TTS Client] Socket connected');
       // Update state to connected when socket connects
       this.setState('connected');
+
+      // Rooms do not survive reconnects, so re-join the simulation room
+      if (this.subscribedSimulationId) {
+        this.socket?.emit('subscribe-simulation', { simulationId: this.subscribedSimulationId });
+      }
     });
 
     this.socket.on('connect_error', (error) => {
@@ -154,6 +174,10 @@ class WebSocketTTSClient {
       this.setState('connected');
     });
 
+    this.socket.on('tts-connected', (data) => {
+      this.flowControl = data?.flowControl === 'credits';
+    });
+
     this.socket.on('speech-start', (data) => {
       console.log('[TTS Client] Speech started:', data.voice);
       this.triggerSpeechStartCallbacks();
@@ -161,18 +185,15 @@ class WebSocketTTSClient {
 
     this.socket.on('audio-chunk', async (data) => {
       try {
-        // Decode base64 audio data
-        const binaryString = atob(data.data);
-        const bytes = new Uint8Array(binaryString.length);
-        for (let i = 0; i < binaryString.length; i++) {
-          bytes[i] = binaryString.charCodeAt(i);
+        const item = this.decodeAudioChunk(data);
+
+        // Grant the server credit for the next chunk
+        if (this.flowControl) {
+          this.socket?.emit('audio-ack', { sequence: item.index, credits: AUDIO_CREDIT_WINDOW });
         }
 
         // Add to queue
-        this.audioQueue.push({
-          buffer: bytes.buffer,
-          index: data.index,
-        });
+        this.audioQueue.push(item);
 
         // Start playback if not already playing
         if (!this.isPlaying) {
@@ -187,6 +208,12 @@ class WebSocketTTSClient {
       console.log('[TTS Client] Speech ended:', data.totalBytes, 'bytes');
     });
 
+    this.socket.on('objective-progress', (data) => {
+      if (data.simulationId === this.subscribedSimulationId) {
+        this.onObjectiveProgressCallbacks.forEach(cb => cb(data.objectiveProgress));
+      }
+    });
+
     this.socket.on('tts-error', (data) => {
       console.error('[TTS Client] TTS error:', data.message);
       this.triggerErrorCallbacks(data.message);
@@ -203,6 +230,26 @@ class WebSocketTTSClient {
     });
   }
 
+  /**
+   * Decode an audio chunk, sent as a binary frame or as base64 JSON
+   */
+  private decodeAudioChunk(data: ArrayBuffer | { data: string; index: number; sequence?: number }): AudioQueueItem {
+    if (data instanceof ArrayBuffer) {
+      return {
+        buffer: data.slice(AUDIO_FRAME_HEADER_BYTES),
+        index: new DataView(data).getUint32(0),
+      };
+    }
+
+    // Decode base64 audio data
+    const binaryString = atob(data.data);
+    const bytes = new Uint8Array(binaryString.length);
+    for (let i = 0; i < binaryString.length; i++) {
+      bytes[i] = binaryString.charCodeAt(i);
+    }
+    return { buffer: bytes.buffer, index: data.sequence ?? data.index };
+  }
+
   /**
    * Play queued audio chunks
    */
@@ -313,6 +360,16 @@ class WebSocketTTSClient {
     });
   }
 
+  /**
+   * Receive server-pushed events (e.g. objective progress) for a simulation
+   */
+  public subscribeToSimulation(simulationId: string): void {
+    this.subscribedSimulationId = simulationId;
+    if (this.socket?.connected) {
+      this.socket.emit('subscribe-simulation', { simulationId });
+    }
+  }
+
   /**
    * Stop current playback
    */
@@ -396,6 +453,13 @@ class WebSocketTTSClient {
     this.onSpeechEndCallbacks.push(callback);
   }
 
+  /**
+   * Register objective progress callback
+   */
+  public onObjectiveProgress(callback: (progress: any) => void): void {
+    this.onObjectiveProgressCallbacks.push(callback);
+  }
+
   /**
    * Trigger error callbacks
    */